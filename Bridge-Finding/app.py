@@ -1,16 +1,29 @@
+import os
+import sys
 import tkinter as tk
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_core import Graph, SpatialIndex, bridges  # noqa: E402
+
+
 class GraphApp:
     def __init__(self, master):
         self.master = master
         self.canvas = tk.Canvas(master, bg='white', width=600, height=400)
         self.canvas.pack()
         self.Radius = 15
+        # Сетка по центрам вершин для поиска узла по точке и обратное отображение id текста -> id узла
+        self.node_index = SpatialIndex(2 * self.Radius)
+        self.text_nodes = {}
         # ключ – id овала, значение – кортеж ((x, y), id текста)
         self.nodes = {}
         self.number_node = 1
         # ключ – id линии, значение – кортеж (id узла1, id узла2)
         self.edges = {}
+        # Кэш graph_core.Graph вместе с его CSR; сбрасывается при любом изменении графа
+        self.graph = None
+        # ключ – id узла, значение – множество id инцидентных ему рёбер
+        self.incident = {}
         self.selected_node = None
         self.mode = 'N'    # 'N' – добавление узла, 'E' – добавление ребра
         self.start_coords = (None, None)
@@ -42,15 +55,14 @@ class GraphApp:
         Возвращает id узла (овала), если в точке (x, y) найден соответствующий элемент.
         Если клик произошёл по тексту, возвращается соответствующий овал.
         """
-        overlapping = self.canvas.find_overlapping(x - 1, y - 1, x + 1, y + 1)
-        for item in overlapping:
-            if item in self.nodes:
-                return item
-        # Если не найден овал, проверяем текстовые объекты
-        for item in overlapping:
-            for node, (center, text) in self.nodes.items():
-                if item == text:
-                    return node
+        node = self.node_index.find(x, y, self.Radius + 1)
+        if node is not None:
+            return node
+        # Подпись может выступать за пределы овала – ищем её через обратное отображение текстов
+        for item in self.canvas.find_overlapping(x - 1, y - 1, x + 1, y + 1):
+            node = self.text_nodes.get(item)
+            if node is not None:
+                return node
         return None
 
     def left_click(self, event):
@@ -80,6 +92,9 @@ class GraphApp:
                 target_center = self.nodes[target][0]
                 self.canvas.coords(self.line, self.start_coords[0], self.start_coords[1],
                                    target_center[0], target_center[1])
+                self.graph = None
+                self.incident[self.selected_node].add(self.line)
+                self.incident[target].add(self.line)
                 self.edges[self.line] = (self.selected_node, target)
             else:
                 if self.line is not None:
@@ -116,6 +131,10 @@ class GraphApp:
                 x, y, text=str(self.number_node), fill='white')
             self.number_node += 1
             self.nodes[node] = ((x, y), text)
+            self.node_index.insert(node, x, y)
+            self.text_nodes[text] = node
+            self.incident[node] = set()
+            self.graph = None
         else:
             self.selected_node = current_node
 
@@ -127,8 +146,10 @@ class GraphApp:
             # Обновляем координаты узла в словаре
             self.nodes[self.selected_node] = (
                 (x, y), self.nodes[self.selected_node][1])
-            # Обновляем координаты для всех ребер, связанных с этим узлом
-            for edge, (n1, n2) in self.edges.items():
+            self.node_index.move(self.selected_node, x, y)
+            # Обновляем координаты только для ребер, связанных с этим узлом
+            for edge in self.incident[self.selected_node]:
+                n1, n2 = self.edges[edge]
                 x1, y1 = self.nodes[n1][0]
                 x2, y2 = self.nodes[n2][0]
                 self.canvas.coords(edge, x1, y1, x2, y2)
@@ -137,16 +158,16 @@ class GraphApp:
         node = self.check_node(x, y)
         if node in self.nodes:
             # Удаляем ребра, связанные с узлом
-            edges_to_delete = []
-            for edge, (n1, n2) in list(self.edges.items()):
-                if n1 == node or n2 == node:
-                    self.canvas.delete(edge)
-                    edges_to_delete.append(edge)
-            for edge in edges_to_delete:
-                del self.edges[edge]
+            for edge in self.incident.pop(node):
+                n1, n2 = self.edges.pop(edge)
+                self.incident[n2 if n1 == node else n1].discard(edge)
+                self.canvas.delete(edge)
             # Удаляем текст и сам узел
+            del self.text_nodes[self.nodes[node][1]]
+            self.node_index.remove(node)
             self.canvas.delete(self.nodes[node][1])
             self.canvas.delete(node)
+            self.graph = None
             del self.nodes[node]
 
     def add_edge(self, x, y):
@@ -159,48 +180,15 @@ class GraphApp:
             self.start_coords[0], self.start_coords[1], x, y, fill='red')
 
     def build_graph(self):
-        """Строит представление графа в виде словаря смежности."""
-        graph = {}
-        for node in self.nodes:
-            graph[node] = []
-        for edge in self.edges.values():
-            n1, n2 = edge
-            if n1 in graph and n2 in graph:
-                graph[n1].append(n2)
-                graph[n2].append(n1)
-        return graph
+        """Строит неориентированный граф (graph_core.Graph) по вершинам и рёбрам холста."""
+        if self.graph is None:
+            self.graph = Graph.from_edges(
+                self.nodes, ((edge, n1, n2) for edge, (n1, n2) in self.edges.items()))
+        return self.graph
 
     def find_bridges(self):
         """Находит мосты в графе с помощью алгоритма на основе времени входа."""
-        graph = self.build_graph()
-        visited = set()
-        disc = {}
-        low = {}
-        parent = {}
-        bridges = []
-
-        time = [0]
-
-        def dfs(u):
-            visited.add(u)
-            disc[u] = low[u] = time[0]
-            time[0] += 1
-            for v in graph[u]:
-                if v not in visited:
-                    parent[v] = u
-                    dfs(v)
-                    low[u] = min(low[u], low[v])
-                    if low[v] > disc[u]:
-                        bridges.append((u, v))
-                elif v != parent.get(u, None):
-                    low[u] = min(low[u], disc[v])
-
-        for node in self.nodes:
-            if node not in visited:
-                parent[node] = None
-                dfs(node)
-
-        return bridges
+        return bridges.find_bridges(self.build_graph())
 
     def start_find_bridges(self):
         if self.animating or not self.nodes:
@@ -222,8 +210,8 @@ class GraphApp:
         if self.current_animation_index < len(self.animation_bridges):
             u, v = self.animation_bridges[self.current_animation_index]
             edge_id = None
-            for edge, (n1, n2) in self.edges.items():
-                if (n1 == u and n2 == v) or (n1 == v and n2 == u):
+            for edge in self.incident[u]:
+                if v in self.edges[edge]:
                     edge_id = edge
                     break
             if edge_id:
@@ -263,6 +251,10 @@ class GraphApp:
         for node, (center, text) in list(self.nodes.items()):
             self.canvas.delete(text)
             self.canvas.delete(node)
+        self.graph = None
+        self.node_index.clear()
+        self.text_nodes.clear()
+        self.incident.clear()
         self.nodes.clear()
 
 if __name__ == "__main__":
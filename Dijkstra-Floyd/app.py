@@ -1,7 +1,16 @@
+import os
+import sys
 import tkinter as tk
-from tkinter import simpledialog
-import heapq
-import math
+from tkinter import simpledialog, filedialog, messagebox
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_core import (  # noqa: E402
+    Graph, IncrementalAPSP, SpatialIndex, SNAPSHOT_EXT, apsp, contraction_hierarchy,
+    shortest_paths, grid_layout, load_snapshot, read_graph, save_snapshot,
+)
+
+# Больше вершин на холсте 600x400 не поместится; такие графы обрабатываются graph_core напрямую
+MAX_DRAWN_VERTICES = 150
 
 
 class GraphApp:
@@ -11,11 +20,24 @@ class GraphApp:
         self.canvas.pack()
 
         self.Radius = 15
+        # Сетка по центрам вершин для поиска узла по точке и обратное отображение id текста -> id узла
+        self.node_index = SpatialIndex(2 * self.Radius)
+        self.text_nodes = {}
         # ключ – id овала, значение – кортеж ((x, y), id текста)
         self.nodes = {}
         self.number_node = 1
         # self.edges: ключ – id линии, значение – кортеж (node1, node2, weight, weight_text)
         self.edges = {}
+        # Кэш graph_core.Graph вместе с его CSR; сбрасывается при любом изменении графа
+        self.graph = None
+        # Матрицы Флойда (graph_core.IncrementalAPSP) после первого запроса; новые вершины и рёбра
+        # вносятся в них без пересчёта, удаление вершины их сбрасывает. Без NumPy не используются
+        self.apsp = None
+        # Множитель эвристики A* (shortest_paths.heuristic_scale); сбрасывается при новых рёбрах,
+        # удалении и перемещении вершин
+        self.astar_scale = None
+        # ключ – id узла, значение – множество id инцидентных ему рёбер
+        self.incident = {}
         self.selected_node = None
         self.mode = 'N'    # 'N' – добавление узла, 'E' – добавление ребра
         self.start_coords = (None, None)
@@ -28,7 +50,7 @@ class GraphApp:
         self.selecting_end = False
         self.start_vertex = None
         self.end_vertex = None
-        self.current_algorithm = None  # "dijkstra" или "floyd"
+        self.current_algorithm = None  # "dijkstra", "floyd", "astar", "bidirectional" или "ch"
 
         self.canvas.bind("<Button-1>", self.left_click)
         self.canvas.bind("<B1-Motion>", self.move_mouse)
@@ -48,6 +70,26 @@ class GraphApp:
             self.button_frame, text="Floyd", command=self.start_floyd)
         self.floyd_button.pack(side=tk.LEFT, padx=10, pady=5)
 
+        self.astar_button = tk.Button(
+            self.button_frame, text="A*", command=self.start_astar)
+        self.astar_button.pack(side=tk.LEFT, padx=10, pady=5)
+
+        self.bidirectional_button = tk.Button(
+            self.button_frame, text="Bidirectional", command=self.start_bidirectional)
+        self.bidirectional_button.pack(side=tk.LEFT, padx=10, pady=5)
+
+        self.ch_button = tk.Button(
+            self.button_frame, text="CH", command=self.start_ch)
+        self.ch_button.pack(side=tk.LEFT, padx=10, pady=5)
+
+        self.load_button = tk.Button(
+            self.button_frame, text="Load Graph", command=self.load_graph_file)
+        self.load_button.pack(side=tk.LEFT, padx=10, pady=5)
+
+        self.save_button = tk.Button(
+            self.button_frame, text="Save Graph", command=self.save_graph_file)
+        self.save_button.pack(side=tk.LEFT, padx=10, pady=5)
+
         self.reset_button = tk.Button(
             self.button_frame, text="Reset Colors", command=self.reset_colors)
         self.reset_button.pack(side=tk.LEFT, padx=10, pady=5)
@@ -56,24 +98,30 @@ class GraphApp:
             self.button_frame, text="Clear Graph", command=self.clear_graph)
         self.clear_button.pack(side=tk.LEFT, padx=10, pady=5)
 
-        # Сохраняем исходные цвета кнопок для сброса
-        self.default_dijkstra_button_color = self.dijkstra_button.cget("bg")
-        self.default_floyd_button_color = self.floyd_button.cget("bg")
+        # алгоритм -> (кнопка, подпись, исходный цвет для сброса); по этой таблице
+        # start_path_search и select_path_vertex управляют кнопками поиска пути
+        self.path_buttons = {
+            algorithm: (button, button.cget("text"), button.cget("bg"))
+            for algorithm, button in (("dijkstra", self.dijkstra_button),
+                                      ("floyd", self.floyd_button),
+                                      ("astar", self.astar_button),
+                                      ("bidirectional", self.bidirectional_button),
+                                      ("ch", self.ch_button))
+        }
 
     def check_node(self, x, y):
         """
         Возвращает id узла (овала), если в точке (x, y) найден соответствующий элемент.
         Если клик произошёл по тексту, возвращается соответствующий овал.
         """
-        overlapping = self.canvas.find_overlapping(x - 1, y - 1, x + 1, y + 1)
-        for item in overlapping:
-            if item in self.nodes:
-                return item
-        # Если не найден овал, проверяем текстовые объекты
-        for item in overlapping:
-            for node, (center, text) in self.nodes.items():
-                if item == text:
-                    return node
+        node = self.node_index.find(x, y, self.Radius + 1)
+        if node is not None:
+            return node
+        # Подпись может выступать за пределы овала – ищем её через обратное отображение текстов
+        for item in self.canvas.find_overlapping(x - 1, y - 1, x + 1, y + 1):
+            node = self.text_nodes.get(item)
+            if node is not None:
+                return node
         return None
 
     def left_click(self, event):
@@ -114,13 +162,9 @@ class GraphApp:
                     "Edge Weight", "Enter weight for this edge:", minvalue=0.0)
                 if weight is None:
                     weight = 1.0
-                # Создаем текст для веса в середине ребра
-                x_mid = (self.start_coords[0] + target_center[0]) / 2
-                y_mid = (self.start_coords[1] + target_center[1]) / 2
-                weight_text = self.canvas.create_text(
-                    x_mid, y_mid, text=str(weight), fill="black")
-                self.edges[self.line] = (
-                    self.selected_node, target, weight, weight_text)
+                # Заменяем временную линию постоянным ребром
+                self.canvas.delete(self.line)
+                self.create_edge(self.selected_node, target, weight)
             else:
                 if self.line is not None:
                     self.canvas.delete(self.line)
@@ -146,19 +190,45 @@ class GraphApp:
             self.start_coords = self.nodes[node][0]
 
     def add_node(self, x, y):
-        R = self.Radius
         current_node = self.check_node(x, y)
         if current_node is None:
-            # Создаем новый узел (овал) и текст с номером вершины
-            node = self.canvas.create_oval(
-                x - R, y - R, x + R, y + R, fill='blue')
-            text = self.canvas.create_text(
-                x, y, text=str(self.number_node), fill='white')
-            self.number_node += 1
-            self.nodes[node] = ((x, y), text)
+            self.create_node(x, y)
         else:
             self.selected_node = current_node
 
+    def create_node(self, x, y):
+        """Создаёт узел (овал) и текст с номером вершины. Возвращает id овала."""
+        R = self.Radius
+        node = self.canvas.create_oval(
+            x - R, y - R, x + R, y + R, fill='blue')
+        text = self.canvas.create_text(
+            x, y, text=str(self.number_node), fill='white')
+        self.number_node += 1
+        self.nodes[node] = ((x, y), text)
+        self.node_index.insert(node, x, y)
+        self.text_nodes[text] = node
+        self.incident[node] = set()
+        self.graph = None
+        if self.apsp is not None:
+            self.apsp.add_vertex(node)
+        return node
+
+    def create_edge(self, n1, n2, weight):
+        """Создаёт ребро n1–n2 с подписью веса в середине. Возвращает id линии."""
+        x1, y1 = self.nodes[n1][0]
+        x2, y2 = self.nodes[n2][0]
+        line = self.canvas.create_line(x1, y1, x2, y2, fill='red')
+        weight_text = self.canvas.create_text(
+            (x1 + x2) / 2, (y1 + y2) / 2, text=str(weight), fill="black")
+        self.graph = None
+        self.astar_scale = None
+        self.incident[n1].add(line)
+        self.incident[n2].add(line)
+        self.edges[line] = (n1, n2, weight, weight_text)
+        if self.apsp is not None:
+            self.apsp.add_edge(n1, n2, weight)
+        return line
+
     def move_node(self, x, y):
         if self.selected_node is not None:
             R = self.Radius
@@ -167,36 +237,40 @@ class GraphApp:
             # Обновляем координаты узла в словаре
             self.nodes[self.selected_node] = (
                 (x, y), self.nodes[self.selected_node][1])
-            # Обновляем положение для всех ребер, связанных с этим узлом
-            for edge_id, edge_data in self.edges.items():
+            self.node_index.move(self.selected_node, x, y)
+            self.astar_scale = None
+            # Обновляем положение только для ребер, связанных с этим узлом
+            for edge_id in self.incident[self.selected_node]:
+                edge_data = self.edges[edge_id]
                 n1, n2 = edge_data[0], edge_data[1]
-                if self.selected_node in (n1, n2):
-                    x1, y1 = self.nodes[n1][0]
-                    x2, y2 = self.nodes[n2][0]
-                    self.canvas.coords(edge_id, x1, y1, x2, y2)
-                    # Если у ребра есть текст с весом, перемещаем его в середину
-                    if len(edge_data) == 4:
-                        weight_text = edge_data[3]
-                        x_mid = (x1 + x2) / 2
-                        y_mid = (y1 + y2) / 2
-                        self.canvas.coords(weight_text, x_mid, y_mid)
+                x1, y1 = self.nodes[n1][0]
+                x2, y2 = self.nodes[n2][0]
+                self.canvas.coords(edge_id, x1, y1, x2, y2)
+                # Если у ребра есть текст с весом, перемещаем его в середину
+                if len(edge_data) == 4:
+                    weight_text = edge_data[3]
+                    x_mid = (x1 + x2) / 2
+                    y_mid = (y1 + y2) / 2
+                    self.canvas.coords(weight_text, x_mid, y_mid)
 
     def delete_node(self, x, y):
         node = self.check_node(x, y)
         if node in self.nodes:
             # Удаляем ребра, связанные с узлом
-            edges_to_delete = []
-            for edge_id, (n1, n2, *rest) in list(self.edges.items()):
-                if n1 == node or n2 == node:
-                    self.canvas.delete(edge_id)
-                    if rest and len(rest) == 2:
-                        self.canvas.delete(rest[1])  # удаляем текст веса
-                    edges_to_delete.append(edge_id)
-            for edge_id in edges_to_delete:
-                del self.edges[edge_id]
+            for edge_id in self.incident.pop(node):
+                n1, n2, *rest = self.edges.pop(edge_id)
+                self.incident[n2 if n1 == node else n1].discard(edge_id)
+                self.canvas.delete(edge_id)
+                if rest and len(rest) == 2:
+                    self.canvas.delete(rest[1])  # удаляем текст веса
             # Удаляем текст и сам узел
+            del self.text_nodes[self.nodes[node][1]]
+            self.node_index.remove(node)
             self.canvas.delete(self.nodes[node][1])
             self.canvas.delete(node)
+            self.graph = None
+            self.apsp = None
+            self.astar_scale = None
             del self.nodes[node]
 
     def add_edge(self, x, y):
@@ -217,8 +291,62 @@ class GraphApp:
         for node, (center, text) in list(self.nodes.items()):
             self.canvas.delete(text)
             self.canvas.delete(node)
+        self.graph = None
+        self.apsp = None
+        self.astar_scale = None
+        self.node_index.clear()
+        self.text_nodes.clear()
+        self.incident.clear()
         self.nodes.clear()
 
+    def load_graph_file(self):
+        """Загружает граф из файла (список рёбер, DIMACS .gr, MatrixMarket .mtx) и рисует его."""
+        if self.animating:
+            return
+        path = filedialog.askopenfilename(
+            title="Load Graph",
+            filetypes=[("Graphs", "*.txt *.el *.gr *.mtx *.gcs"), ("All files", "*.*")])
+        if not path:
+            return
+        if path.lower().endswith(SNAPSHOT_EXT):
+            graph, coords = load_snapshot(path)
+        else:
+            graph, coords = read_graph(path), None
+        if graph.num_vertices > MAX_DRAWN_VERTICES:
+            messagebox.showerror(
+                "Error", f"Graph has {graph.num_vertices} vertices; at most "
+                         f"{MAX_DRAWN_VERTICES} can be drawn. Use graph_core directly.")
+            return
+        self.show_graph(graph, coords)
+
+    def save_graph_file(self):
+        """Сохраняет граф холста вместе с координатами вершин в двоичный снимок (.gcs)."""
+        if self.animating or not self.nodes:
+            return
+        path = filedialog.asksaveasfilename(
+            title="Save Graph", defaultextension=SNAPSHOT_EXT,
+            filetypes=[("Graph snapshots", "*" + SNAPSHOT_EXT)])
+        if not path:
+            return
+        graph = self.build_graph()
+        save_snapshot(graph, path, [self.nodes[node][0] for node in graph.keys])
+
+    def show_graph(self, graph, coords=None):
+        """
+        Заменяет содержимое холста графом graph_core.Graph. Вершины ставятся в точки coords
+        (плоский массив x0, y0, x1, y1, ... из снимка), а без них раскладываются по сетке.
+        """
+        self.clear_graph()
+        self.number_node = 1
+        if coords is None:
+            width, height = int(self.canvas.cget('width')), int(self.canvas.cget('height'))
+            positions = grid_layout(graph.num_vertices, width, height, 2 * self.Radius)
+        else:
+            positions = zip(coords[0::2], coords[1::2])
+        nodes = [self.create_node(x, y) for x, y in positions]
+        for e in range(graph.num_edges):
+            self.create_edge(nodes[graph.tail[e]], nodes[graph.head[e]], graph.weight[e])
+
     def reset_colors(self):
         """Сбрасывает цвет всех узлов на синий и рёбер на красный."""
         for node in self.nodes:
@@ -229,34 +357,36 @@ class GraphApp:
     # ========== Функциональность поиска кратчайшего пути ==========
 
     def start_dijkstra(self):
-        if self.animating or not self.nodes:
-            return
-        self.disable_buttons()
-        self.dijkstra_button.config(state=tk.NORMAL)
-        self.reset_colors()
-        self.current_algorithm = "dijkstra"
-        self.selecting_path = True
-        self.selecting_start = True
-        self.selecting_end = False
-        self.start_vertex = None
-        self.end_vertex = None
-        self.canvas.config(cursor="crosshair")
-        self.dijkstra_button.config(bg="yellow", text="Select start vertex")
+        self.start_path_search("dijkstra")
 
     def start_floyd(self):
+        self.start_path_search("floyd")
+
+    def start_astar(self):
+        self.start_path_search("astar")
+
+    def start_bidirectional(self):
+        self.start_path_search("bidirectional")
+
+    def start_ch(self):
+        self.start_path_search("ch")
+
+    def start_path_search(self, algorithm):
+        """Переводит приложение в режим выбора начальной и конечной вершин для алгоритма algorithm."""
         if self.animating or not self.nodes:
             return
+        button = self.path_buttons[algorithm][0]
         self.disable_buttons()
-        self.floyd_button.config(state=tk.NORMAL)
+        button.config(state=tk.NORMAL)
         self.reset_colors()
-        self.current_algorithm = "floyd"
+        self.current_algorithm = algorithm
         self.selecting_path = True
         self.selecting_start = True
         self.selecting_end = False
         self.start_vertex = None
         self.end_vertex = None
         self.canvas.config(cursor="crosshair")
-        self.floyd_button.config(bg="yellow", text="Select start vertex")
+        button.config(bg="yellow", text="Select start vertex")
 
     def select_path_vertex(self, event):
         """Обрабатывает выбор вершины для поиска кратчайшего пути."""
@@ -264,31 +394,32 @@ class GraphApp:
         node = self.check_node(x, y)
         if node is None:
             return  # клик по пустому месту – игнорируем
+        button, label, color = self.path_buttons[self.current_algorithm]
         if self.selecting_start:
             self.start_vertex = node
             self.selecting_start = False
             self.selecting_end = True
-            if self.current_algorithm == "dijkstra":
-                self.dijkstra_button.config(text="Select end vertex")
-            elif self.current_algorithm == "floyd":
-                self.floyd_button.config(text="Select end vertex")
+            button.config(text="Select end vertex")
         elif self.selecting_end:
             self.end_vertex = node
             self.selecting_path = False
             self.selecting_end = False
             self.canvas.config(cursor="")
-            # Сбросим цвета кнопок поиска
-            if self.current_algorithm == "dijkstra":
-                self.dijkstra_button.config(
-                    bg=self.default_dijkstra_button_color, text="Dijkstra")
-            elif self.current_algorithm == "floyd":
-                self.floyd_button.config(
-                    bg=self.default_floyd_button_color, text="Floyd")
+            # Сбросим цвет кнопки поиска
+            button.config(bg=color, text=label)
             # Запускаем поиск кратчайшего пути
             if self.current_algorithm == "dijkstra":
                 path = self.dijkstra(self.start_vertex, self.end_vertex)
             elif self.current_algorithm == "floyd":
                 path = self.floyd(self.start_vertex, self.end_vertex)
+            elif self.current_algorithm == "ch":
+                path = self.ch_path(self.start_vertex, self.end_vertex)
+            else:
+                if self.current_algorithm == "astar":
+                    path, settled = self.astar(self.start_vertex, self.end_vertex)
+                else:
+                    path, settled = self.bidirectional(self.start_vertex, self.end_vertex)
+                print("Settled vertices:", settled)
             if path:
                 print("Shortest path:", [self.nodes[n][1] for n in path])
                 self.animate_path(path)
@@ -296,87 +427,62 @@ class GraphApp:
                 print("No path found")
                 self.enable_buttons()
 
+    def build_graph(self):
+        """Строит взвешенный неориентированный граф (graph_core.Graph) по вершинам и рёбрам холста."""
+        if self.graph is None:
+            self.graph = Graph.from_edges(
+                self.nodes,
+                ((edge_id, edge_data[0], edge_data[1], edge_data[2])
+                 for edge_id, edge_data in self.edges.items() if len(edge_data) >= 3))
+        return self.graph
+
     def dijkstra(self, start, end):
         """
         Выполняет алгоритм Дейкстры для поиска кратчайшего пути.
         Возвращает список вершин (их id) в порядке прохождения или None, если путь не найден.
         """
-        # Построим граф как словарь: для каждого узла – список (neighbor, weight, edge_id)
-        graph = {node: [] for node in self.nodes}
-        for edge_id, edge_data in self.edges.items():
-            if len(edge_data) < 3:
-                continue
-            n1, n2, weight = edge_data[0], edge_data[1], edge_data[2]
-            graph[n1].append((n2, weight, edge_id))
-            graph[n2].append((n1, weight, edge_id))  # граф неориентированный
-
-        dist = {node: math.inf for node in self.nodes}
-        prev = {node: None for node in self.nodes}
-        dist[start] = 0
-        pq = [(0, start)]
-        while pq:
-            d, current = heapq.heappop(pq)
-            if current == end:
-                break
-            if d > dist[current]:
-                continue
-            for neighbor, w, e_id in graph[current]:
-                alt = d + w
-                if alt < dist[neighbor]:
-                    dist[neighbor] = alt
-                    prev[neighbor] = current
-                    heapq.heappush(pq, (alt, neighbor))
-        if dist[end] == math.inf:
-            return None  # путь не найден
-        # Восстанавливаем путь
-        path = []
-        cur = end
-        while cur is not None:
-            path.append(cur)
-            cur = prev[cur]
-        path.reverse()
-        return path
+        return shortest_paths.dijkstra(self.build_graph(), start, end)
 
     def floyd(self, start, end):
         """
         Выполняет алгоритм Флойда для поиска кратчайшего пути между всеми парами.
-        Затем восстанавливает путь от start до end.
+        Затем восстанавливает путь от start до end. Матрицы сохраняются и обновляются
+        при добавлении вершин и рёбер, так что повторные запросы не пересчитывают их.
+        Без NumPy работает shortest_paths.floyd на списках (матрицы кэшируются до изменения графа).
+        Возвращает список вершин (их id) в порядке прохождения или None, если путь не найден.
+        """
+        if apsp.np is None:
+            return shortest_paths.floyd(self.build_graph(), start, end)
+        if self.apsp is None:
+            self.apsp = IncrementalAPSP(self.build_graph())
+        return self.apsp.shortest_path(start, end)
+
+    def astar(self, start, end):
+        """
+        Поиск A* с эвристикой по координатам вершин на холсте.
+        Множитель эвристики считается по всем рёбрам один раз и хранится до изменения геометрии графа.
+        Возвращает (путь или None, число обработанных вершин).
+        """
+        graph = self.build_graph()
+        coords = [self.nodes[node][0] for node in graph.keys]
+        if self.astar_scale is None:
+            self.astar_scale = shortest_paths.heuristic_scale(graph, coords)
+        return shortest_paths.astar(graph, start, end, coords, self.astar_scale)
+
+    def bidirectional(self, start, end):
+        """
+        Двунаправленный алгоритм Дейкстры.
+        Возвращает (путь или None, число обработанных вершин).
+        """
+        return shortest_paths.bidirectional_dijkstra(self.build_graph(), start, end)
+
+    def ch_path(self, start, end):
+        """
+        Кратчайший путь по иерархии сжатия. Иерархия строится при первом запросе
+        и переиспользуется, пока граф не изменится.
         Возвращает список вершин (их id) в порядке прохождения или None, если путь не найден.
         """
-        nodes_list = list(self.nodes.keys())
-        n = len(nodes_list)
-        # Инициализируем матрицу расстояний и матрицу next для восстановления пути
-        dist = {u: {v: math.inf for v in nodes_list} for u in nodes_list}
-        nxt = {u: {v: None for v in nodes_list} for u in nodes_list}
-        for u in nodes_list:
-            dist[u][u] = 0
-        # Для каждого ребра задаём расстояние и следующий узел
-        for edge_id, edge_data in self.edges.items():
-            if len(edge_data) < 3:
-                continue
-            u, v, weight = edge_data[0], edge_data[1], edge_data[2]
-            # Если несколько ребер между парой вершин, оставляем минимальное
-            if weight < dist[u][v]:
-                dist[u][v] = weight
-                dist[v][u] = weight
-                nxt[u][v] = v
-                nxt[v][u] = u
-
-        # Алгоритм Флойда-Уоршелла
-        for k in nodes_list:
-            for i in nodes_list:
-                for j in nodes_list:
-                    if dist[i][j] > dist[i][k] + dist[k][j]:
-                        dist[i][j] = dist[i][k] + dist[k][j]
-                        nxt[i][j] = nxt[i][k]
-        if nxt[start][end] is None:
-            return None  # путь не найден
-        # Восстанавливаем путь
-        path = [start]
-        while start != end:
-            start = nxt[start][end]
-            path.append(start)
-        return path
+        return contraction_hierarchy(self.build_graph()).shortest_path(start, end)
 
     def animate_path(self, path):
         """Анимирует кратчайший путь: вершины подсвечиваются, а рёбра между ними окрашиваются."""
@@ -405,9 +511,9 @@ class GraphApp:
 
     def find_edge_between(self, node1, node2):
         """Находит ребро, соединяющее node1 и node2 (если есть)."""
-        for edge_id, edge_data in self.edges.items():
-            u, v = edge_data[0], edge_data[1]
-            if (node1 == u and node2 == v) or (node1 == v and node2 == u):
+        for edge_id in self.incident.get(node1, ()):
+            edge_data = self.edges[edge_id]
+            if node2 in (edge_data[0], edge_data[1]):
                 return edge_id
         return None
 
@@ -416,12 +522,22 @@ class GraphApp:
     def disable_buttons(self):
         self.dijkstra_button.config(state=tk.DISABLED)
         self.floyd_button.config(state=tk.DISABLED)
+        self.astar_button.config(state=tk.DISABLED)
+        self.bidirectional_button.config(state=tk.DISABLED)
+        self.ch_button.config(state=tk.DISABLED)
+        self.load_button.config(state=tk.DISABLED)
+        self.save_button.config(state=tk.DISABLED)
         self.reset_button.config(state=tk.DISABLED)
         self.clear_button.config(state=tk.DISABLED)
 
     def enable_buttons(self):
         self.dijkstra_button.config(state=tk.NORMAL)
         self.floyd_button.config(state=tk.NORMAL)
+        self.astar_button.config(state=tk.NORMAL)
+        self.bidirectional_button.config(state=tk.NORMAL)
+        self.ch_button.config(state=tk.NORMAL)
+        self.load_button.config(state=tk.NORMAL)
+        self.save_button.config(state=tk.NORMAL)
         self.reset_button.config(state=tk.NORMAL)
         self.clear_button.config(state=tk.NORMAL)
 
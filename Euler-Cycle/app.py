@@ -1,6 +1,11 @@
+import os
+import sys
 import tkinter as tk
 from tkinter import messagebox
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_core import Graph, SpatialIndex, euler, traversal  # noqa: E402
+
 
 class GraphApp:
     def __init__(self, master):
@@ -9,9 +14,16 @@ class GraphApp:
         self.canvas.pack()
 
         self.Radius = 15
+        # Сетка по центрам вершин для поиска узла по точке и обратное отображение id текста -> id узла
+        self.node_index = SpatialIndex(2 * self.Radius)
+        self.text_nodes = {}
         self.nodes = {}
         self.number_node = 1
         self.edges = {}
+        # Кэш graph_core.Graph вместе с его CSR; сбрасывается при любом изменении графа
+        self.graph = None
+        # ключ – id узла, значение – множество id инцидентных ему рёбер
+        self.incident = {}
         self.selected_node = None
         self.mode = 'N'
         self.start_coords = (None, None)
@@ -41,14 +53,14 @@ class GraphApp:
         self.clear_button.pack(side=tk.LEFT, padx=10, pady=5)
 
     def check_node(self, x, y):
-        overlapping = self.canvas.find_overlapping(x - 1, y - 1, x + 1, y + 1)
-        for item in overlapping:
-            if item in self.nodes:
-                return item
-        for item in overlapping:
-            for node, (center, text) in self.nodes.items():
-                if item == text:
-                    return node
+        node = self.node_index.find(x, y, self.Radius + 1)
+        if node is not None:
+            return node
+        # Подпись может выступать за пределы овала – ищем её через обратное отображение текстов
+        for item in self.canvas.find_overlapping(x - 1, y - 1, x + 1, y + 1):
+            node = self.text_nodes.get(item)
+            if node is not None:
+                return node
         return None
 
     def left_click(self, event):
@@ -77,6 +89,9 @@ class GraphApp:
                 target_center = self.nodes[target][0]
                 self.canvas.coords(self.line, self.start_coords[0], self.start_coords[1],
                                    target_center[0], target_center[1])
+                self.graph = None
+                self.incident[self.selected_node].add(self.line)
+                self.incident[target].add(self.line)
                 self.edges[self.line] = (self.selected_node, target)
             else:
                 if self.line is not None:
@@ -111,6 +126,10 @@ class GraphApp:
                 x, y, text=str(self.number_node), fill='white')
             self.number_node += 1
             self.nodes[node] = ((x, y), text)
+            self.node_index.insert(node, x, y)
+            self.text_nodes[text] = node
+            self.incident[node] = set()
+            self.graph = None
         else:
             self.selected_node = current_node
 
@@ -121,25 +140,25 @@ class GraphApp:
             self.canvas.coords(self.nodes[self.selected_node][1], x, y)
             self.nodes[self.selected_node] = (
                 (x, y), self.nodes[self.selected_node][1])
-            for edge_id, edge_data in self.edges.items():
-                n1, n2 = edge_data[0], edge_data[1]
-                if self.selected_node in (n1, n2):
-                    x1, y1 = self.nodes[n1][0]
-                    x2, y2 = self.nodes[n2][0]
-                    self.canvas.coords(edge_id, x1, y1, x2, y2)
+            self.node_index.move(self.selected_node, x, y)
+            for edge_id in self.incident[self.selected_node]:
+                n1, n2 = self.edges[edge_id]
+                x1, y1 = self.nodes[n1][0]
+                x2, y2 = self.nodes[n2][0]
+                self.canvas.coords(edge_id, x1, y1, x2, y2)
 
     def delete_node(self, x, y):
         node = self.check_node(x, y)
         if node in self.nodes:
-            edges_to_delete = []
-            for edge_id, (n1, n2) in list(self.edges.items()):
-                if n1 == node or n2 == node:
-                    self.canvas.delete(edge_id)
-                    edges_to_delete.append(edge_id)
-            for edge_id in edges_to_delete:
-                del self.edges[edge_id]
+            for edge_id in self.incident.pop(node):
+                n1, n2 = self.edges.pop(edge_id)
+                self.incident[n2 if n1 == node else n1].discard(edge_id)
+                self.canvas.delete(edge_id)
+            del self.text_nodes[self.nodes[node][1]]
+            self.node_index.remove(node)
             self.canvas.delete(self.nodes[node][1])
             self.canvas.delete(node)
+            self.graph = None
             del self.nodes[node]
 
     def add_edge(self, x, y):
@@ -156,6 +175,10 @@ class GraphApp:
         for node, (center, text) in list(self.nodes.items()):
             self.canvas.delete(text)
             self.canvas.delete(node)
+        self.graph = None
+        self.node_index.clear()
+        self.text_nodes.clear()
+        self.incident.clear()
         self.nodes.clear()
 
     def reset_colors(self):
@@ -164,61 +187,20 @@ class GraphApp:
         for edge_id in self.edges:
             self.canvas.itemconfig(edge_id, fill="red", width=1)
 
+    def build_graph(self):
+        if self.graph is None:
+            self.graph = Graph.from_edges(
+                self.nodes, ((edge_id, u, v) for edge_id, (u, v) in self.edges.items()))
+        return self.graph
+
     def all_degrees_even(self):
-        degrees = {node: 0 for node in self.nodes}
-        for u, v in self.edges.values():
-            degrees[u] += 1
-            degrees[v] += 1
-        return all(degree % 2 == 0 for degree in degrees.values())
+        return euler.all_degrees_even(self.build_graph())
 
     def is_connected(self):
-        if not self.nodes:
-            return False
-        visited = set()
-        start_node = next(iter(self.nodes.keys()))
-        stack = [start_node]
-        while stack:
-            node = stack.pop()
-            if node not in visited:
-                visited.add(node)
-                neighbors = []
-                for u, v in self.edges.values():
-                    if u == node:
-                        neighbors.append(v)
-                    elif v == node:
-                        neighbors.append(u)
-                for neighbor in neighbors:
-                    if neighbor not in visited:
-                        stack.append(neighbor)
-        return len(visited) == len(self.nodes)
+        return traversal.is_connected(self.build_graph())
 
     def find_eulerian_cycle_edges(self):
-        if not self.is_connected() or not self.all_degrees_even():
-            return None
-
-        adj = {node: [] for node in self.nodes}
-        for edge_id, (u, v) in self.edges.items():
-            adj[u].append((v, edge_id))
-            adj[v].append((u, edge_id))
-
-        start_node = next(iter(self.nodes))
-        stack = [start_node]
-        path = []
-        edge_order = []
-
-        while stack:
-            current = stack[-1]
-            if adj[current]:
-                next_node, edge_id = adj[current].pop()
-                adj[next_node].remove((current, edge_id))
-                stack.append(next_node)
-                edge_order.append(edge_id)
-            else:
-                path.append(stack.pop())
-
-        if len(edge_order) != len(self.edges):
-            return None
-        return edge_order[::-1]
+        return euler.find_eulerian_cycle_edges(self.build_graph())
 
     def start_eulerian(self):
         if self.animating:
@@ -1,6 +1,17 @@
+import os
+import sys
 import tkinter as tk
-from tkinter import simpledialog, messagebox
-from collections import deque, defaultdict
+from array import array
+from tkinter import simpledialog, filedialog, messagebox
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_core import (  # noqa: E402
+    Graph, IncrementalMaxFlow, SpatialIndex, SNAPSHOT_EXT, grid_layout, load_snapshot, read_graph,
+    save_snapshot,
+)
+
+# Больше вершин на холсте 600x400 не поместится; такие графы обрабатываются graph_core напрямую
+MAX_DRAWN_VERTICES = 150
 
 
 class GraphApp:
@@ -10,9 +21,16 @@ class GraphApp:
         self.canvas.pack()
 
         self.Radius = 15
+        # Сетка по центрам вершин для поиска узла по точке и обратное отображение id текста -> id узла
+        self.node_index = SpatialIndex(2 * self.Radius)
+        self.text_nodes = {}
         self.nodes = {}  # {node_id: ( (x, y), text_id )}
         self.number_node = 1
         self.edges = {}  # {edge_id: {'from': node_id, 'to': node_id, 'capacity': int, 'flow': int, 'text_id': text_id}}
+        # Кэш graph_core.Graph вместе с его CSR; сбрасывается при любом изменении графа
+        self.graph = None
+        # ключ – id узла, значение – множество id инцидентных ему рёбер
+        self.incident = {}
         self.selected_node = None
         self.mode = 'N'
         self.start_coords = (None, None)
@@ -27,7 +45,9 @@ class GraphApp:
             'source': '#008000',
             'sink': '#800000',
             'active_edge': '#008b8b',
-            'final_edge': '#0000ff'
+            'final_edge': '#0000ff',
+            'cut_edge': '#ff8c00',
+            'cut_side': '#66cc66'
         }
 
         self.canvas.bind("<Button-1>", self.left_click)
@@ -43,6 +63,14 @@ class GraphApp:
             self.button_frame, text="Max Flow", command=self.init_max_flow)
         self.max_flow_button.pack(side=tk.LEFT, padx=10, pady=5)
 
+        self.load_button = tk.Button(
+            self.button_frame, text="Load Graph", command=self.load_graph_file)
+        self.load_button.pack(side=tk.LEFT, padx=10, pady=5)
+
+        self.save_button = tk.Button(
+            self.button_frame, text="Save Graph", command=self.save_graph_file)
+        self.save_button.pack(side=tk.LEFT, padx=10, pady=5)
+
         self.reset_button = tk.Button(
             self.button_frame, text="Reset Colors", command=self.reset_colors)
         self.reset_button.pack(side=tk.LEFT, padx=10, pady=5)
@@ -52,21 +80,23 @@ class GraphApp:
         self.clear_button.pack(side=tk.LEFT, padx=10, pady=5)
 
         self.default_button_color = self.max_flow_button.cget("bg")
-        self.animation_steps = []
-        self.current_animation_step = 0
+        self.animation_steps = iter(())   # генератор шагов IncrementalMaxFlow.steps
+        # Поток последнего расчёта (graph_core.IncrementalMaxFlow) для той же пары исток–сток:
+        # новые вершины и рёбра вносятся в него, удалённые рёбра получают нулевую ёмкость,
+        # так что повторный расчёт лишь достраивает поток. Удаление истока или стока его сбрасывает
+        self.flow_state = None
         self.current_path_edges = []
         self.selection_phase = None  # 'source_selection', 'sink_selection'
 
     def check_node(self, x, y):
-        overlapping = self.canvas.find_overlapping(
-            x - 5, y - 5, x + 5, y + 5)
-        for item in overlapping:
-            if item in self.nodes:
-                return item
-        for item in overlapping:
-            for node, (center, text) in self.nodes.items():
-                if item == text:
-                    return node
+        node = self.node_index.find(x, y, self.Radius + 5)
+        if node is not None:
+            return node
+        # Подпись может выступать за пределы овала – ищем её через обратное отображение текстов
+        for item in self.canvas.find_overlapping(x - 5, y - 5, x + 5, y + 5):
+            node = self.text_nodes.get(item)
+            if node is not None:
+                return node
         return None
 
     def left_click(self, event):
@@ -145,22 +175,8 @@ class GraphApp:
                     self.line = None
                     return
                 
-                text_x = (self.start_coords[0] + target_center[0]) // 2
-                text_y = (self.start_coords[1] + target_center[1]) // 2
-                text_id = self.canvas.create_text(
-                    text_x, text_y,
-                    text=f"0/{capacity}",
-                    fill="black",
-                    font=("Arial", 10))
-                
-                self.edges[self.line] = {
-                    'from': self.selected_node,
-                    'to': target,
-                    'capacity': capacity,
-                    'flow': 0,
-                    'text_id': text_id
-                }
-                self.canvas.itemconfig(self.line, arrow=tk.LAST, fill="black")
+                self.canvas.delete(self.line)
+                self.create_edge(self.selected_node, target, capacity)
             else:
                 if self.line is not None:
                     self.canvas.delete(self.line)
@@ -186,18 +202,52 @@ class GraphApp:
             self.start_coords = self.nodes[node][0]
 
     def add_node(self, x, y):
-        R = self.Radius
         current_node = self.check_node(x, y)
         if current_node is None:
-            node = self.canvas.create_oval(
-                x - R, y - R, x + R, y + R, fill=self.colors['default'])
-            text = self.canvas.create_text(
-                x, y, text=str(self.number_node), fill='white')
-            self.number_node += 1
-            self.nodes[node] = ((x, y), text)
+            self.create_node(x, y)
         else:
             self.selected_node = current_node
 
+    def create_node(self, x, y):
+        R = self.Radius
+        node = self.canvas.create_oval(
+            x - R, y - R, x + R, y + R, fill=self.colors['default'])
+        text = self.canvas.create_text(
+            x, y, text=str(self.number_node), fill='white')
+        self.number_node += 1
+        self.nodes[node] = ((x, y), text)
+        self.node_index.insert(node, x, y)
+        self.text_nodes[text] = node
+        self.incident[node] = set()
+        self.graph = None
+        if self.flow_state is not None:
+            self.flow_state.add_vertex(node)
+        return node
+
+    def create_edge(self, u, v, capacity):
+        x1, y1 = self.nodes[u][0]
+        x2, y2 = self.nodes[v][0]
+        line = self.canvas.create_line(x1, y1, x2, y2, fill="black", arrow=tk.LAST)
+        text_id = self.canvas.create_text(
+            (x1 + x2) // 2, (y1 + y2) // 2,
+            text=f"0/{capacity}",
+            fill="black",
+            font=("Arial", 10))
+
+        self.graph = None
+        self.incident[u].add(line)
+        self.incident[v].add(line)
+        self.edges[line] = {
+            'from': u,
+            'to': v,
+            'capacity': capacity,
+            'flow': 0,
+            'text_id': text_id
+        }
+        if self.flow_state is not None:
+            self.flow_state.add_edge(line, u, v, capacity, solve=False)
+        return line
+
     def move_node(self, x, y):
         if self.selected_node is not None:
             if self.selected_node not in self.nodes:
@@ -209,26 +259,33 @@ class GraphApp:
             self.canvas.coords(self.nodes[self.selected_node][1], x, y)
             self.nodes[self.selected_node] = (
                 (x, y), self.nodes[self.selected_node][1])
-            for edge, edge_info in self.edges.items():
-                if edge_info['from'] == self.selected_node or edge_info['to'] == self.selected_node:
-                    x1, y1 = self.nodes[edge_info['from']][0]
-                    x2, y2 = self.nodes[edge_info['to']][0]
-                    self.canvas.coords(edge, x1, y1, x2, y2)
-                    self.canvas.coords(edge_info['text_id'], (x1+x2)//2, (y1+y2)//2)
+            self.node_index.move(self.selected_node, x, y)
+            for edge in self.incident[self.selected_node]:
+                edge_info = self.edges[edge]
+                x1, y1 = self.nodes[edge_info['from']][0]
+                x2, y2 = self.nodes[edge_info['to']][0]
+                self.canvas.coords(edge, x1, y1, x2, y2)
+                self.canvas.coords(edge_info['text_id'], (x1+x2)//2, (y1+y2)//2)
 
     def delete_node(self, x, y):
         node = self.check_node(x, y)
         if node in self.nodes:
-            edges_to_delete = []
-            for edge, edge_info in list(self.edges.items()):
-                if edge_info['from'] == node or edge_info['to'] == node:
-                    self.canvas.delete(edge_info['text_id'])
-                    self.canvas.delete(edge)
-                    edges_to_delete.append(edge)
-            for edge in edges_to_delete:
-                del self.edges[edge]
+            state = self.flow_state
+            if state is not None and node in (state.keys[state.source], state.keys[state.sink]):
+                self.flow_state = state = None
+            for edge in self.incident.pop(node):
+                if state is not None:
+                    state.remove_edge(edge, solve=False)
+                edge_info = self.edges.pop(edge)
+                other = edge_info['to'] if edge_info['from'] == node else edge_info['from']
+                self.incident[other].discard(edge)
+                self.canvas.delete(edge_info['text_id'])
+                self.canvas.delete(edge)
+            del self.text_nodes[self.nodes[node][1]]
+            self.node_index.remove(node)
             self.canvas.delete(self.nodes[node][1])
             self.canvas.delete(node)
+            self.graph = None
             del self.nodes[node]
 
     def add_edge(self, x, y):
@@ -248,109 +305,47 @@ class GraphApp:
         self.max_flow_button.config(bg="yellow", text="Click on source node")
         # messagebox.showinfo("Select Source", "Click on source node")
 
+    def build_graph(self):
+        """Строит сеть (ориентированный graph_core.Graph, вес ребра – пропускная способность)."""
+        if self.graph is None:
+            self.graph = Graph.from_edges(
+                self.nodes,
+                ((edge_id, info['from'], info['to'], info['capacity'])
+                 for edge_id, info in self.edges.items()),
+                directed=True, weight_type='q')
+        return self.graph
+
     def prepare_max_flow_animation(self):
-        edges_data = []
-        node_ids = list(self.nodes.keys())
-        for edge_info in self.edges.values():
-            edges_data.append({
-                'from': edge_info['from'],
-                'to': edge_info['to'],
-                'capacity': edge_info['capacity'],
-                'flow': 0
-            })
-            edges_data.append({
-                'from': edge_info['to'],
-                'to': edge_info['from'],
-                'capacity': 0,
-                'flow': 0
-            })
-
-        parent = {}
-        max_flow = 0
-        residual = defaultdict(dict)
-        for edge in edges_data:
-            u = edge['from']
-            v = edge['to']
-            residual[u][v] = edge['capacity'] - edge['flow']
-
-        self.animation_steps = []
-        while True:
-            queue = deque()
-            queue.append(self.source)
-            parent = {node: None for node in node_ids}
-            parent[self.source] = -1
-
-            found = False
-            while queue and not found:
-                u = queue.popleft()
-                for v in residual[u]:
-                    if parent[v] is None and residual[u][v] > 0:
-                        parent[v] = u
-                        if v == self.sink:
-                            found = True
-                            break
-                        queue.append(v)
-
-            if not found:
-                break
-
-            path_flow = float('inf')
-            v = self.sink
-            path = []
-            while v != self.source:
-                u = parent[v]
-                path_flow = min(path_flow, residual[u][v])
-                path.insert(0, (u, v))
-                v = u
-
-            self.animation_steps.append(('path', path.copy(), path_flow))
-
-            v = self.sink
-            while v != self.source:
-                u = parent[v]
-                residual[u][v] -= path_flow
-                residual[v][u] += path_flow
-
-                forward_edge = None
-                backward_edge = None
-                for edge_id, edge_info in self.edges.items():
-                    if edge_info['from'] == u and edge_info['to'] == v:
-                        forward_edge = edge_id
-                    if edge_info['from'] == v and edge_info['to'] == u:
-                        backward_edge = edge_id
-
-                if forward_edge is not None:
-                    new_flow = self.edges[forward_edge]['flow'] + path_flow
-                    self.animation_steps.append(('update', forward_edge, new_flow))
-                elif backward_edge is not None:
-                    new_flow = self.edges[backward_edge]['flow'] - path_flow
-                    self.animation_steps.append(('update', backward_edge, new_flow))
-
-                v = u
-
-            max_flow += path_flow
-
-        self.animation_steps.append(('done', max_flow))
-        self.current_animation_step = 0
+        # Шаги вычисляются лениво: очередной увеличивающий путь ищется только по таймеру анимации
+        state = self.flow_state
+        if state is None or (state.keys[state.source], state.keys[state.sink]) != (self.source, self.sink):
+            state = self.flow_state = IncrementalMaxFlow(
+                self.build_graph(), self.source, self.sink, solve=False)
+        else:
+            # Тёплый старт: показываем поток прошлого расчёта, анимация лишь достроит его
+            for edge_id, edge_info in self.edges.items():
+                edge_info['flow'] = state.flow(edge_id)
+                self.canvas.itemconfig(edge_info['text_id'],
+                                       text=f"{edge_info['flow']}/{edge_info['capacity']}")
+        self.animation_steps = state.steps()
         self.animating = True
         self.disable_buttons()
         self.max_flow_button.config(bg="yellow", text="Running...")
         self.animate_max_flow_step()
 
     def animate_max_flow_step(self):
-        if self.current_animation_step >= len(self.animation_steps):
+        step = next(self.animation_steps, None)
+        if step is None:
             self.animating = False
             self.max_flow_button.config(bg=self.default_button_color, text="Max Flow")
             self.enable_buttons()
             self.finalize_animation()
             return
 
-        step = self.animation_steps[self.current_animation_step]
         if step[0] == 'path':
             for u, v in step[1]:
                 self.highlight_edge(u, v)
             self.current_path_edges = step[1]
-            self.current_animation_step += 1
             self.master.after(1500, self.animate_max_flow_step)
         elif step[0] == 'update':
             edge_id = step[1]
@@ -359,10 +354,11 @@ class GraphApp:
             capacity = self.edges[edge_id]['capacity']
             self.canvas.itemconfig(self.edges[edge_id]['text_id'], 
                                  text=f"{new_flow}/{capacity}")
-            self.current_animation_step += 1
             self.master.after(500, self.animate_max_flow_step)
         elif step[0] == 'done':
-            messagebox.showinfo("Max Flow", f"Maximum flow: {step[1]}")
+            cut = self.show_min_cut()
+            messagebox.showinfo("Max Flow", f"Maximum flow: {step[1]}\n"
+                                            f"Minimum cut: {len(cut)} edge(s)")
             self.animating = False
             self.max_flow_button.config(bg=self.default_button_color, text="Max Flow")
             self.enable_buttons()
@@ -372,13 +368,92 @@ class GraphApp:
             if edge_info['flow'] > 0:
                 self.canvas.itemconfig(edge_id, fill=self.colors['final_edge'], width=2)
 
+    def show_min_cut(self):
+        """
+        Подсвечивает минимальный разрез: вершины доли истока (кроме самого истока)
+        и насыщенные рёбра, выходящие из неё. Разрез берётся из остаточной сети
+        завершённой анимации, поток заново не вычисляется. Возвращает список id рёбер разреза.
+        """
+        side = self.flow_state.source_side()
+        cut = [edge_id for edge_id, edge_info in self.edges.items()
+               if edge_info['from'] in side and edge_info['to'] not in side]
+        for node in side:
+            if node != self.source:
+                self.canvas.itemconfig(node, fill=self.colors['cut_side'])
+        for edge_id in cut:
+            self.canvas.itemconfig(edge_id, fill=self.colors['cut_edge'], width=3)
+        return cut
+
     def highlight_edge(self, u, v):
-        for edge_id, edge_info in self.edges.items():
+        for edge_id in self.incident[u]:
+            edge_info = self.edges[edge_id]
             if edge_info['from'] == u and edge_info['to'] == v:
                 self.canvas.itemconfig(edge_id, fill=self.colors['active_edge'], width=2)
             elif edge_info['from'] == v and edge_info['to'] == u:
                 self.canvas.itemconfig(edge_id, fill="#ff6666", width=2)
 
+    def load_graph_file(self):
+        """Загружает граф из файла (DIMACS .max, список рёбер «u v пропускная_способность») и рисует его."""
+        if self.animating or self.selection_phase:
+            return
+        path = filedialog.askopenfilename(
+            title="Load Graph",
+            filetypes=[("Graphs", "*.max *.txt *.el *.gcs"), ("All files", "*.*")])
+        if not path:
+            return
+        if path.lower().endswith(SNAPSHOT_EXT):
+            graph, coords = load_snapshot(path)
+            # Снимки из других приложений хранят веса с плавающей точкой, а сеть строится
+            # на целых пропускных способностях
+            weight = graph.weight
+            typecode = weight.typecode if isinstance(weight, array) else weight.format
+            if typecode in 'fd':
+                if not all(float(w).is_integer() for w in weight):
+                    messagebox.showerror("Error", "Capacities in the snapshot must be integers.")
+                    return
+                graph.weight = array('q', (int(w) for w in weight))
+        else:
+            try:
+                graph, coords = read_graph(path, directed=True, weight_type='q'), None
+            except ValueError as error:
+                # Например, дробная пропускная способность или вершина вне объявленного числа
+                messagebox.showerror("Error", f"Cannot load {os.path.basename(path)}: {error}")
+                return
+        if graph.num_vertices > MAX_DRAWN_VERTICES:
+            messagebox.showerror(
+                "Error", f"Graph has {graph.num_vertices} vertices; at most "
+                         f"{MAX_DRAWN_VERTICES} can be drawn. Use graph_core directly.")
+            return
+        self.show_graph(graph, coords)
+
+    def save_graph_file(self):
+        """Сохраняет граф холста вместе с координатами вершин в двоичный снимок (.gcs)."""
+        if self.animating or self.selection_phase or not self.nodes:
+            return
+        path = filedialog.asksaveasfilename(
+            title="Save Graph", defaultextension=SNAPSHOT_EXT,
+            filetypes=[("Graph snapshots", "*" + SNAPSHOT_EXT)])
+        if not path:
+            return
+        graph = self.build_graph()
+        save_snapshot(graph, path, [self.nodes[node][0] for node in graph.keys])
+
+    def show_graph(self, graph, coords=None):
+        """
+        Заменяет содержимое холста графом graph_core.Graph. Вершины ставятся в точки coords
+        (плоский массив x0, y0, x1, y1, ... из снимка), а без них раскладываются по сетке.
+        """
+        self.clear_graph()
+        self.number_node = 1
+        if coords is None:
+            width, height = int(self.canvas.cget('width')), int(self.canvas.cget('height'))
+            positions = grid_layout(graph.num_vertices, width, height, 2 * self.Radius)
+        else:
+            positions = zip(coords[0::2], coords[1::2])
+        nodes = [self.create_node(x, y) for x, y in positions]
+        for e in range(graph.num_edges):
+            self.create_edge(nodes[graph.tail[e]], nodes[graph.head[e]], graph.weight[e])
+
     def reset_colors(self):
         for node in self.nodes:
             self.canvas.itemconfig(node, fill=self.colors['default'])
@@ -398,11 +473,15 @@ class GraphApp:
 
     def disable_buttons(self):
         self.max_flow_button.config(state=tk.DISABLED)
+        self.load_button.config(state=tk.DISABLED)
+        self.save_button.config(state=tk.DISABLED)
         self.reset_button.config(state=tk.DISABLED)
         self.clear_button.config(state=tk.DISABLED)
 
     def enable_buttons(self):
         self.max_flow_button.config(state=tk.NORMAL)
+        self.load_button.config(state=tk.NORMAL)
+        self.save_button.config(state=tk.NORMAL)
         self.reset_button.config(state=tk.NORMAL)
         self.clear_button.config(state=tk.NORMAL)
 
@@ -415,6 +494,11 @@ class GraphApp:
         for node, (center, text) in list(self.nodes.items()):
             self.canvas.delete(text)
             self.canvas.delete(node)
+        self.graph = None
+        self.flow_state = None
+        self.node_index.clear()
+        self.text_nodes.clear()
+        self.incident.clear()
         self.nodes.clear()
         self.number_node = 1
         self.source = None
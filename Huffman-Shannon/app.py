@@ -1,75 +1,10 @@
+import os
+import sys
 import tkinter as tk
 from tkinter import messagebox
-import heapq
 
-# --- Реализация алгоритма Хаффмана ---
-
-
-class HuffmanNode:
-    def __init__(self, freq, symbol, left=None, right=None):
-        self.freq = freq
-        self.symbol = symbol
-        self.left = left
-        self.right = right
-
-    def __lt__(self, other):
-        return self.freq < other.freq
-
-
-def huffman_encoding(symbols):
-    heap = [HuffmanNode(freq, symbol) for symbol, freq in symbols.items()]
-    heapq.heapify(heap)
-
-    if not heap:
-        return {}
-
-    while len(heap) > 1:
-        left = heapq.heappop(heap)
-        right = heapq.heappop(heap)
-        merged = HuffmanNode(left.freq + right.freq, None, left, right)
-        heapq.heappush(heap, merged)
-
-    root = heap[0]
-    codes = {}
-
-    def generate_codes(node, current_code=""):
-        if node is None:
-            return
-        if node.symbol is not None:
-            codes[node.symbol] = current_code or "0"
-        else:
-            generate_codes(node.left, current_code + "0")
-            generate_codes(node.right, current_code + "1")
-    generate_codes(root)
-    return codes
-
-
-# --- Реализация алгоритма Шеннона–Фанно ---
-def shannon_fano(symbols):
-    symbols_sorted = sorted(symbols.items(), key=lambda x: x[1], reverse=True)
-    codes = {symbol: '' for symbol, _ in symbols_sorted}
-
-    def recursive(symbols_list):
-        if len(symbols_list) <= 1:
-            return
-        total = sum(freq for _, freq in symbols_list)
-        acc = 0
-        partition_index = 0
-        for i, (_, freq) in enumerate(symbols_list):
-            acc += freq
-            if acc >= total / 2:
-                partition_index = i
-                break
-        left = symbols_list[:partition_index + 1]
-        right = symbols_list[partition_index + 1:]
-        for symbol, _ in left:
-            codes[symbol] += '0'
-        for symbol, _ in right:
-            codes[symbol] += '1'
-        recursive(left)
-        recursive(right)
-    recursive(symbols_sorted)
-    return codes
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_core import huffman_encoding, shannon_fano  # noqa: E402
 
 
 # --- Основное приложение на Tkinter ---
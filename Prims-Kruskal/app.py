@@ -1,7 +1,16 @@
+import os
+import sys
 import tkinter as tk
-from tkinter import simpledialog
-import heapq
-import math
+from tkinter import simpledialog, filedialog, messagebox
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_core import (  # noqa: E402
+    Graph, SpatialIndex, SNAPSHOT_EXT, mst, grid_layout, load_snapshot, read_graph, save_snapshot,
+)
+
+# Больше вершин на холсте 600x400 не поместится; такие графы обрабатываются graph_core напрямую
+MAX_DRAWN_VERTICES = 150
+
 
 class GraphApp:
     def __init__(self, master):
@@ -10,10 +19,17 @@ class GraphApp:
         self.canvas.pack()
 
         self.Radius = 15
+        # Сетка по центрам вершин для поиска узла по точке и обратное отображение id текста -> id узла
+        self.node_index = SpatialIndex(2 * self.Radius)
+        self.text_nodes = {}
         self.nodes = {}    # ключ – id овала, значение – кортеж ((x, y), id текста)
         self.number_node = 1
         # self.edges: ключ – id линии, значение – кортеж (node1, node2, weight, weight_text)
         self.edges = {}
+        # Кэш graph_core.Graph вместе с его CSR; сбрасывается при любом изменении графа
+        self.graph = None
+        # ключ – id узла, значение – множество id инцидентных ему рёбер
+        self.incident = {}
         self.selected_node = None
         self.mode = 'N'    # 'N' – добавление узла, 'E' – добавление ребра
         self.start_coords = (None, None)
@@ -40,6 +56,12 @@ class GraphApp:
         self.kruskal_button = tk.Button(self.button_frame, text="Kruskal", command=self.start_kruskal)
         self.kruskal_button.pack(side=tk.LEFT, padx=10, pady=5)
 
+        self.load_button = tk.Button(self.button_frame, text="Load Graph", command=self.load_graph_file)
+        self.load_button.pack(side=tk.LEFT, padx=10, pady=5)
+
+        self.save_button = tk.Button(self.button_frame, text="Save Graph", command=self.save_graph_file)
+        self.save_button.pack(side=tk.LEFT, padx=10, pady=5)
+
         self.reset_button = tk.Button(self.button_frame, text="Reset Colors", command=self.reset_colors)
         self.reset_button.pack(side=tk.LEFT, padx=10, pady=5)
 
@@ -57,14 +79,14 @@ class GraphApp:
         Возвращает id узла (овала), если в точке (x, y) найден соответствующий элемент.
         Если клик произошёл по тексту, возвращается соответствующий овал.
         """
-        overlapping = self.canvas.find_overlapping(x - 1, y - 1, x + 1, y + 1)
-        for item in overlapping:
-            if item in self.nodes:
-                return item
-        for item in overlapping:
-            for node, (center, text) in self.nodes.items():
-                if item == text:
-                    return node
+        node = self.node_index.find(x, y, self.Radius + 1)
+        if node is not None:
+            return node
+        # Подпись может выступать за пределы овала – ищем её через обратное отображение текстов
+        for item in self.canvas.find_overlapping(x - 1, y - 1, x + 1, y + 1):
+            node = self.text_nodes.get(item)
+            if node is not None:
+                return node
         return None
 
     def left_click(self, event):
@@ -103,10 +125,8 @@ class GraphApp:
                 weight = simpledialog.askfloat("Edge Weight", "Enter weight for this edge:", minvalue=0.0)
                 if weight is None:
                     weight = 1.0
-                x_mid = (self.start_coords[0] + target_center[0]) / 2
-                y_mid = (self.start_coords[1] + target_center[1]) / 2
-                weight_text = self.canvas.create_text(x_mid, y_mid, text=str(weight), fill="black")
-                self.edges[self.line] = (self.selected_node, target, weight, weight_text)
+                self.canvas.delete(self.line)
+                self.create_edge(self.selected_node, target, weight)
             else:
                 if self.line is not None:
                     self.canvas.delete(self.line)
@@ -131,48 +151,68 @@ class GraphApp:
             self.start_coords = self.nodes[node][0]
 
     def add_node(self, x, y):
-        R = self.Radius
         current_node = self.check_node(x, y)
         if current_node is None:
-            node = self.canvas.create_oval(x - R, y - R, x + R, y + R, fill='blue')
-            text = self.canvas.create_text(x, y, text=str(self.number_node), fill='white')
-            self.number_node += 1
-            self.nodes[node] = ((x, y), text)
+            self.create_node(x, y)
         else:
             self.selected_node = current_node
 
+    def create_node(self, x, y):
+        R = self.Radius
+        node = self.canvas.create_oval(x - R, y - R, x + R, y + R, fill='blue')
+        text = self.canvas.create_text(x, y, text=str(self.number_node), fill='white')
+        self.number_node += 1
+        self.nodes[node] = ((x, y), text)
+        self.node_index.insert(node, x, y)
+        self.text_nodes[text] = node
+        self.incident[node] = set()
+        self.graph = None
+        return node
+
+    def create_edge(self, u, v, weight):
+        x1, y1 = self.nodes[u][0]
+        x2, y2 = self.nodes[v][0]
+        line = self.canvas.create_line(x1, y1, x2, y2, fill='red')
+        weight_text = self.canvas.create_text((x1 + x2) / 2, (y1 + y2) / 2, text=str(weight), fill="black")
+        self.graph = None
+        self.incident[u].add(line)
+        self.incident[v].add(line)
+        self.edges[line] = (u, v, weight, weight_text)
+        return line
+
     def move_node(self, x, y):
         if self.selected_node is not None:
             R = self.Radius
             self.canvas.coords(self.selected_node, x - R, y - R, x + R, y + R)
             self.canvas.coords(self.nodes[self.selected_node][1], x, y)
             self.nodes[self.selected_node] = ((x, y), self.nodes[self.selected_node][1])
-            for edge_id, edge_data in self.edges.items():
+            self.node_index.move(self.selected_node, x, y)
+            for edge_id in self.incident[self.selected_node]:
+                edge_data = self.edges[edge_id]
                 u, v = edge_data[0], edge_data[1]
-                if self.selected_node in (u, v):
-                    x1, y1 = self.nodes[u][0]
-                    x2, y2 = self.nodes[v][0]
-                    self.canvas.coords(edge_id, x1, y1, x2, y2)
-                    if len(edge_data) == 4:
-                        weight_text = edge_data[3]
-                        x_mid = (x1 + x2) / 2
-                        y_mid = (y1 + y2) / 2
-                        self.canvas.coords(weight_text, x_mid, y_mid)
+                x1, y1 = self.nodes[u][0]
+                x2, y2 = self.nodes[v][0]
+                self.canvas.coords(edge_id, x1, y1, x2, y2)
+                if len(edge_data) == 4:
+                    weight_text = edge_data[3]
+                    x_mid = (x1 + x2) / 2
+                    y_mid = (y1 + y2) / 2
+                    self.canvas.coords(weight_text, x_mid, y_mid)
 
     def delete_node(self, x, y):
         node = self.check_node(x, y)
         if node in self.nodes:
-            edges_to_delete = []
-            for edge_id, (u, v, *rest) in list(self.edges.items()):
-                if u == node or v == node:
-                    self.canvas.delete(edge_id)
-                    if rest and len(rest) == 2:
-                        self.canvas.delete(rest[1])
-                    edges_to_delete.append(edge_id)
-            for edge_id in edges_to_delete:
-                del self.edges[edge_id]
+            for edge_id in self.incident.pop(node):
+                u, v, *rest = self.edges.pop(edge_id)
+                self.incident[v if u == node else u].discard(edge_id)
+                self.canvas.delete(edge_id)
+                if rest and len(rest) == 2:
+                    self.canvas.delete(rest[1])
+            del self.text_nodes[self.nodes[node][1]]
+            self.node_index.remove(node)
             self.canvas.delete(self.nodes[node][1])
             self.canvas.delete(node)
+            self.graph = None
             del self.nodes[node]
 
     def add_edge(self, x, y):
@@ -189,8 +229,60 @@ class GraphApp:
         for node, (center, text) in list(self.nodes.items()):
             self.canvas.delete(text)
             self.canvas.delete(node)
+        self.graph = None
+        self.node_index.clear()
+        self.text_nodes.clear()
+        self.incident.clear()
         self.nodes.clear()
 
+    def load_graph_file(self):
+        """Загружает граф из файла (список рёбер, DIMACS .gr, MatrixMarket .mtx) и рисует его."""
+        if self.animating:
+            return
+        path = filedialog.askopenfilename(
+            title="Load Graph",
+            filetypes=[("Graphs", "*.txt *.el *.gr *.mtx *.gcs"), ("All files", "*.*")])
+        if not path:
+            return
+        if path.lower().endswith(SNAPSHOT_EXT):
+            graph, coords = load_snapshot(path)
+        else:
+            graph, coords = read_graph(path), None
+        if graph.num_vertices > MAX_DRAWN_VERTICES:
+            messagebox.showerror(
+                "Error", f"Graph has {graph.num_vertices} vertices; at most "
+                         f"{MAX_DRAWN_VERTICES} can be drawn. Use graph_core directly.")
+            return
+        self.show_graph(graph, coords)
+
+    def save_graph_file(self):
+        """Сохраняет граф холста вместе с координатами вершин в двоичный снимок (.gcs)."""
+        if self.animating or not self.nodes:
+            return
+        path = filedialog.asksaveasfilename(
+            title="Save Graph", defaultextension=SNAPSHOT_EXT,
+            filetypes=[("Graph snapshots", "*" + SNAPSHOT_EXT)])
+        if not path:
+            return
+        graph = self.build_graph()
+        save_snapshot(graph, path, [self.nodes[node][0] for node in graph.keys])
+
+    def show_graph(self, graph, coords=None):
+        """
+        Заменяет содержимое холста графом graph_core.Graph. Вершины ставятся в точки coords
+        (плоский массив x0, y0, x1, y1, ... из снимка), а без них раскладываются по сетке.
+        """
+        self.clear_graph()
+        self.number_node = 1
+        if coords is None:
+            width, height = int(self.canvas.cget('width')), int(self.canvas.cget('height'))
+            positions = grid_layout(graph.num_vertices, width, height, 2 * self.Radius)
+        else:
+            positions = zip(coords[0::2], coords[1::2])
+        nodes = [self.create_node(x, y) for x, y in positions]
+        for e in range(graph.num_edges):
+            self.create_edge(nodes[graph.tail[e]], nodes[graph.head[e]], graph.weight[e])
+
     def reset_colors(self):
         for node in self.nodes:
             self.canvas.itemconfig(node, fill="blue")
@@ -227,39 +319,21 @@ class GraphApp:
             print("No MST found")
             self.enable_buttons()
 
+    def build_graph(self):
+        """Строит взвешенный неориентированный граф (graph_core.Graph) по вершинам и рёбрам холста."""
+        if self.graph is None:
+            self.graph = Graph.from_edges(
+                self.nodes,
+                ((edge_id, edge_data[0], edge_data[1], edge_data[2])
+                 for edge_id, edge_data in self.edges.items()))
+        return self.graph
+
     def prim(self, start):
         """
         Реализует алгоритм Прима для построения минимального остовного дерева.
         Возвращает список id рёбер, входящих в MST или None, если MST построить не удалось.
         """
-        visited = set()
-        mst_edges = []
-        visited.add(start)
-        pq = []
-        # Добавляем все рёбра, исходящие из стартовой вершины
-        for edge_id, edge_data in self.edges.items():
-            u, v, weight = edge_data[0], edge_data[1], edge_data[2]
-            if u == start and v not in visited:
-                heapq.heappush(pq, (weight, edge_id, u, v))
-            elif v == start and u not in visited:
-                heapq.heappush(pq, (weight, edge_id, v, u))
-        while pq and len(visited) < len(self.nodes):
-            weight, edge_id, u, v = heapq.heappop(pq)
-            if v in visited:
-                continue
-            mst_edges.append(edge_id)
-            visited.add(v)
-            # Добавляем новые рёбра, выходящие из только что добавленной вершины
-            for e_id, e_data in self.edges.items():
-                a, b, w = e_data[0], e_data[1], e_data[2]
-                if a == v and b not in visited:
-                    heapq.heappush(pq, (w, e_id, a, b))
-                elif b == v and a not in visited:
-                    heapq.heappush(pq, (w, e_id, b, a))
-        if len(visited) == len(self.nodes):
-            return mst_edges
-        else:
-            return None
+        return mst.prim(self.build_graph(), start)
 
     def start_kruskal(self):
         """Запускает алгоритм Краскала для построения MST."""
@@ -283,43 +357,7 @@ class GraphApp:
         Реализует алгоритм Краскала для построения минимального остовного дерева.
         Возвращает список id рёбер, входящих в MST или None, если MST построить не удалось.
         """
-        edges_list = []
-        for edge_id, edge_data in self.edges.items():
-            u, v, weight = edge_data[0], edge_data[1], edge_data[2]
-            edges_list.append((weight, edge_id, u, v))
-        edges_list.sort(key=lambda x: x[0])
-        parent = {node: node for node in self.nodes}
-        rank = {node: 0 for node in self.nodes}
-
-        def find(u):
-            while parent[u] != u:
-                parent[u] = parent[parent[u]]
-                u = parent[u]
-            return u
-
-        def union(u, v):
-            ru = find(u)
-            rv = find(v)
-            if ru == rv:
-                return False
-            if rank[ru] < rank[rv]:
-                parent[ru] = rv
-            elif rank[ru] > rank[rv]:
-                parent[rv] = ru
-            else:
-                parent[rv] = ru
-                rank[ru] += 1
-            return True
-
-        mst_edges = []
-        for weight, edge_id, u, v in edges_list:
-            if union(u, v):
-                mst_edges.append(edge_id)
-        roots = set(find(node) for node in self.nodes)
-        if len(roots) == 1:
-            return mst_edges
-        else:
-            return None
+        return mst.kruskal(self.build_graph())
 
     def animate_mst(self, mst_edges):
         """Анимирует MST: рёбра по очереди подсвечиваются пурпурным, а вершины – оранжевым с последующим окончательным зелёным цветом."""
@@ -349,12 +387,16 @@ class GraphApp:
     def disable_buttons(self):
         self.prim_button.config(state=tk.DISABLED)
         self.kruskal_button.config(state=tk.DISABLED)
+        self.load_button.config(state=tk.DISABLED)
+        self.save_button.config(state=tk.DISABLED)
         self.reset_button.config(state=tk.DISABLED)
         self.clear_button.config(state=tk.DISABLED)
 
     def enable_buttons(self):
         self.prim_button.config(state=tk.NORMAL)
         self.kruskal_button.config(state=tk.NORMAL)
+        self.load_button.config(state=tk.NORMAL)
+        self.save_button.config(state=tk.NORMAL)
         self.reset_button.config(state=tk.NORMAL)
         self.clear_button.config(state=tk.NORMAL)
 
@@ -1,6 +1,11 @@
+import os
+import sys
 import tkinter as tk
 import tkinter.messagebox as messagebox
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_core import Graph, SpatialIndex, traversal  # noqa: E402
+
 
 class GraphApp:
     def __init__(self, master):
@@ -9,9 +14,16 @@ class GraphApp:
         self.canvas.pack()
 
         self.Radius = 15
+        # Сетка по центрам вершин для поиска узла по точке и обратное отображение id текста -> id узла
+        self.node_index = SpatialIndex(2 * self.Radius)
+        self.text_nodes = {}
         self.nodes = {}
         self.number_node = 1
         self.edges = {}
+        # Кэш graph_core.Graph вместе с его CSR; сбрасывается при любом изменении графа
+        self.graph = None
+        # ключ – id узла, значение – множество id инцидентных ему рёбер
+        self.incident = {}
         self.selected_node = None
         self.mode = 'N'
         self.start_coords = (None, None)
@@ -45,14 +57,14 @@ class GraphApp:
         self.default_topological_button_color = self.topological_button.cget("bg")
 
     def check_node(self, x, y):
-        overlapping = self.canvas.find_overlapping(x - 1, y - 1, x + 1, y + 1)
-        for item in overlapping:
-            if item in self.nodes:
-                return item
-        for item in overlapping:
-            for node, (center, text) in self.nodes.items():
-                if item == text:
-                    return node
+        node = self.node_index.find(x, y, self.Radius + 1)
+        if node is not None:
+            return node
+        # Подпись может выступать за пределы овала – ищем её через обратное отображение текстов
+        for item in self.canvas.find_overlapping(x - 1, y - 1, x + 1, y + 1):
+            node = self.text_nodes.get(item)
+            if node is not None:
+                return node
         return None
 
     def left_click(self, event):
@@ -81,6 +93,9 @@ class GraphApp:
                 target_center = self.nodes[target][0]
                 self.canvas.coords(self.line, self.start_coords[0], self.start_coords[1],
                                    target_center[0], target_center[1])
+                self.graph = None
+                self.incident[self.selected_node].add(self.line)
+                self.incident[target].add(self.line)
                 self.edges[self.line] = (self.selected_node, target)
                 self.canvas.itemconfig(self.line, arrow=tk.LAST)
             else:
@@ -116,6 +131,10 @@ class GraphApp:
                 x, y, text=str(self.number_node), fill='white')
             self.number_node += 1
             self.nodes[node] = ((x, y), text)
+            self.node_index.insert(node, x, y)
+            self.text_nodes[text] = node
+            self.incident[node] = set()
+            self.graph = None
         else:
             self.selected_node = current_node
 
@@ -133,7 +152,9 @@ class GraphApp:
                 self.canvas.coords(label_id, x, y + 30)
             self.nodes[self.selected_node] = (
                 (x, y), self.nodes[self.selected_node][1])
-            for edge, (n1, n2) in self.edges.items():
+            self.node_index.move(self.selected_node, x, y)
+            for edge in self.incident[self.selected_node]:
+                n1, n2 = self.edges[edge]
                 x1, y1 = self.nodes[n1][0]
                 x2, y2 = self.nodes[n2][0]
                 self.canvas.coords(edge, x1, y1, x2, y2)
@@ -144,15 +165,15 @@ class GraphApp:
             if node in self.order_labels:
                 label_id = self.order_labels.pop(node)
                 self.canvas.delete(label_id)
-            edges_to_delete = []
-            for edge, (n1, n2) in list(self.edges.items()):
-                if n1 == node or n2 == node:
-                    self.canvas.delete(edge)
-                    edges_to_delete.append(edge)
-            for edge in edges_to_delete:
-                del self.edges[edge]
+            for edge in self.incident.pop(node):
+                n1, n2 = self.edges.pop(edge)
+                self.incident[n2 if n1 == node else n1].discard(edge)
+                self.canvas.delete(edge)
+            del self.text_nodes[self.nodes[node][1]]
+            self.node_index.remove(node)
             self.canvas.delete(self.nodes[node][1])
             self.canvas.delete(node)
+            self.graph = None
             del self.nodes[node]
 
     def add_edge(self, x, y):
@@ -163,43 +184,14 @@ class GraphApp:
             self.start_coords[0], self.start_coords[1], x, y, fill='red', arrow=tk.LAST)
 
     def build_graph(self):
-        graph = {node: [] for node in self.nodes}
-        for edge in self.edges.values():
-            n1, n2 = edge
-            if n1 in graph and n2 in graph:
-                graph[n1].append(n2)
-        return graph
+        if self.graph is None:
+            self.graph = Graph.from_edges(
+                self.nodes, ((edge, n1, n2) for edge, (n1, n2) in self.edges.items()),
+                directed=True)
+        return self.graph
 
     def topological_sort(self):
-        graph = self.build_graph()
-        visited = {}
-        order = []
-        is_cyclic = False
-
-        for node in graph:
-            visited[node] = 0
-
-        def dfs(node):
-            nonlocal is_cyclic
-            if visited[node] == 1:
-                is_cyclic = True
-                return
-            if visited[node] == 2:
-                return
-            visited[node] = 1
-            for neighbor in graph[node]:
-                dfs(neighbor)
-            visited[node] = 2
-            order.append(node)
-
-        for node in graph:
-            if visited[node] == 0:
-                dfs(node)
-                if is_cyclic:
-                    return None
-
-        order.reverse()
-        return order
+        return traversal.topological_sort(self.build_graph())
 
     def start_topological_sort(self):
         if self.animating or not self.nodes:
@@ -285,6 +277,10 @@ class GraphApp:
         for node, (center, text) in list(self.nodes.items()):
             self.canvas.delete(text)
             self.canvas.delete(node)
+        self.graph = None
+        self.node_index.clear()
+        self.text_nodes.clear()
+        self.incident.clear()
         self.nodes.clear()
         self.number_node = 1
 
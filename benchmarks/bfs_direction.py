@@ -0,0 +1,57 @@
+"""
+Сравнение BFS «сверху вниз», «снизу вверх» и с переключением направления
+на случайном графе малого диаметра: время и число просмотренных дуг на каждом уровне.
+
+    python benchmarks/bfs_direction.py --vertices 200000 --degree 16
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_core import Graph, bfs_direction_optimizing, bfs_levels  # noqa: E402
+
+
+def random_graph(n, degree, seed):
+    rnd = random.Random(seed)
+    graph = Graph()
+    for v in range(n):
+        graph.add_vertex(v)
+    for _ in range(n * degree // 2):
+        graph.add_edge(rnd.randrange(n), rnd.randrange(n))
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--vertices', type=int, default=100000)
+    parser.add_argument('--degree', type=int, default=16)
+    parser.add_argument('--alpha', type=float, default=14)
+    parser.add_argument('--beta', type=float, default=24)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    graph = random_graph(args.vertices, args.degree, args.seed)
+    csr = graph.csr()
+    print(f"V = {graph.num_vertices}, E = {graph.num_edges}")
+
+    start = time.perf_counter()
+    _, reference_level, _ = bfs_levels(csr, 0)
+    print(f"bfs_levels: {time.perf_counter() - start:.3f} s")
+
+    for mode in ('top-down', 'bottom-up', 'auto'):
+        start = time.perf_counter()
+        level, _, stats = bfs_direction_optimizing(
+            csr, 0, alpha=args.alpha, beta=args.beta, mode=mode)
+        elapsed = time.perf_counter() - start
+        assert level == reference_level
+        total = sum(examined for *_, examined in stats)
+        print(f"\n{mode}: {elapsed:.3f} s, examined {total} arcs")
+        for depth, direction, size, examined in stats:
+            print(f"  level {depth:3d}  {direction:9s}  frontier {size:8d}  arcs {examined:10d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Масштабирование delta-stepping по числу процессов в сравнении с последовательной Дейкстрой
+на случайном графе; расстояния сверяются побитно.
+
+    python benchmarks/delta_stepping.py --vertices 200000 --degree 8 --max-processes 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_core import Graph, ShortestPathTree, delta_stepping  # noqa: E402
+from graph_core.delta_stepping import default_delta  # noqa: E402
+
+
+def random_graph(n, degree, seed):
+    rnd = random.Random(seed)
+    m = n * degree // 2
+    graph = Graph()
+    graph.add_vertices(n)
+    graph.extend_edges(array('q', (rnd.randrange(n) for _ in range(m))),
+                       array('q', (rnd.randrange(n) for _ in range(m))),
+                       array('d', (rnd.random() for _ in range(m))))
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--vertices', type=int, default=200000)
+    parser.add_argument('--degree', type=int, default=8)
+    parser.add_argument('--delta', type=float, default=None)
+    parser.add_argument('--max-processes', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    graph = random_graph(args.vertices, args.degree, args.seed)
+    csr = graph.csr()
+    delta = args.delta if args.delta is not None else default_delta(csr)
+    print(f"V = {graph.num_vertices}, E = {graph.num_edges}, delta = {delta:.4f}")
+
+    start = time.perf_counter()
+    tree = ShortestPathTree(csr, 0, 0)
+    tree.settle()
+    base = time.perf_counter() - start
+    print(f"dijkstra: {base:.3f} s")
+
+    processes = 1
+    while processes <= args.max_processes:
+        start = time.perf_counter()
+        dist = delta_stepping(csr, 0, delta, processes)
+        elapsed = time.perf_counter() - start
+        assert dist.tobytes() == tree.dist.tobytes()
+        print(f"delta-stepping, {processes:3d} processes: {elapsed:.3f} s "
+              f"(x{base / elapsed:.2f} to dijkstra)")
+        processes *= 2
+
+
+if __name__ == '__main__':
+    main()
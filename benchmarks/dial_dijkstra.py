@@ -0,0 +1,60 @@
+"""
+Сравнение очереди heapq и корзин Дайала в алгоритме Дейкстры на случайном графе
+с целыми весами: время построения полного дерева кратчайших путей из нескольких источников.
+
+    python benchmarks/dial_dijkstra.py --vertices 100000 --edges 1000000 --max-weight 100
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_core import Graph, ShortestPathTree  # noqa: E402
+from graph_core.shortest_paths import dial_width  # noqa: E402
+
+
+def random_graph(n, m, max_weight, seed):
+    rnd = random.Random(seed)
+    graph = Graph(directed=True, weight_type='q')
+    graph.add_vertices(n)
+    graph.extend_edges(array('q', (rnd.randrange(n) for _ in range(m))),
+                       array('q', (rnd.randrange(n) for _ in range(m))),
+                       array('q', (rnd.randint(1, max_weight) for _ in range(m))))
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--vertices', type=int, default=100000)
+    parser.add_argument('--edges', type=int, default=1000000)
+    parser.add_argument('--max-weight', type=int, default=100)
+    parser.add_argument('--sources', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    graph = random_graph(args.vertices, args.edges, args.max_weight, args.seed)
+    csr = graph.csr()
+    width = dial_width(csr.weights)
+    print(f"V = {graph.num_vertices}, E = {graph.num_edges}, buckets = {width}")
+
+    sources = random.Random(args.seed).sample(range(args.vertices), args.sources)
+    reference = {}
+    for name, w in (('heapq', 0), ('dial', width)):
+        total = 0
+        for s in sources:
+            start = time.perf_counter()
+            tree = ShortestPathTree(csr, s, w)
+            tree.settle()
+            total += time.perf_counter() - start
+            if name == 'heapq':
+                reference[s] = tree.dist
+            else:
+                assert tree.dist == reference[s]
+        print(f"{name}: {total / len(sources):.3f} s per source")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Сравнение алгоритмов максимального потока (Эдмондс–Карп, Диниц, проталкивание предпотока)
+на задачах DIMACS (.max) или, если файлы не заданы, на случайной слоистой транспортной сети.
+
+    python benchmarks/max_flow.py instance1.max instance2.max --engines dinic push_relabel
+    python benchmarks/max_flow.py --layers 100 --width 100 --write network.max
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_core import Graph, max_flow, read_dimacs  # noqa: E402
+
+ENGINES = ('edmonds_karp', 'dinic', 'push_relabel')
+
+
+def layered_network(layers, width, degree, seed):
+    """
+    Исток 1, сток 2, между ними layers слоёв по width вершин; каждая вершина связана с degree
+    случайными вершинами следующего слоя. Возвращает (graph, source, sink) как read_dimacs.
+    """
+    rnd = random.Random(seed)
+    graph = Graph(directed=True, weight_type='q')
+    graph.add_vertices(2 + layers * width, first=1)
+
+    def vertex(layer, i):
+        return 3 + layer * width + i
+
+    for i in range(width):
+        graph.add_edge(1, vertex(0, i), rnd.randint(50, 200))
+        graph.add_edge(vertex(layers - 1, i), 2, rnd.randint(50, 200))
+    for layer in range(layers - 1):
+        for i in range(width):
+            for _ in range(degree):
+                graph.add_edge(vertex(layer, i), vertex(layer + 1, rnd.randrange(width)),
+                               rnd.randint(1, 100))
+    return graph, 1, 2
+
+
+def write_dimacs(graph, source, sink, path):
+    with open(path, 'w') as f:
+        f.write(f"p max {graph.num_vertices} {graph.num_edges}\n")
+        f.write(f"n {source} s\nn {sink} t\n")
+        for e in range(graph.num_edges):
+            f.write(f"a {graph.tail[e] + 1} {graph.head[e] + 1} {graph.weight[e]}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('instances', nargs='*', help='DIMACS max-flow files')
+    parser.add_argument('--engines', nargs='+', choices=ENGINES, default=list(ENGINES))
+    parser.add_argument('--layers', type=int, default=50)
+    parser.add_argument('--width', type=int, default=200)
+    parser.add_argument('--degree', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--write', help='save the generated network as DIMACS')
+    args = parser.parse_args()
+
+    if args.instances:
+        problems = [(path, read_dimacs(path)) for path in args.instances]
+    else:
+        problem = layered_network(args.layers, args.width, args.degree, args.seed)
+        if args.write:
+            write_dimacs(*problem, args.write)
+        problems = [('layered', problem)]
+
+    for name, (graph, source, sink) in problems:
+        print(f"{name}: V = {graph.num_vertices}, E = {graph.num_edges}")
+        values = set()
+        for engine in args.engines:
+            start = time.perf_counter()
+            value, _ = max_flow(graph, source, sink, engine)
+            print(f"  {engine:13s} {time.perf_counter() - start:8.3f} s  flow {value}")
+            values.add(value)
+        assert len(values) == 1
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Общее ядро графовых алгоритмов без зависимости от tkinter.
+Графические приложения лабораторных работ – лишь тонкая оболочка над этим пакетом.
+"""
+from .graph import Graph, RangeIndex
+from .csr import CSR
+from .traversal import (
+    bfs, bfs_frontiers, bfs_levels, bfs_direction_optimizing, TOP_DOWN, BOTTOM_UP,
+    dfs, dfs_order, DFSResult,
+    TREE_EDGE, BACK_EDGE, FORWARD_EDGE, CROSS_EDGE,
+    topological_sort, is_connected,
+)
+from .multi_source import multi_source_bfs, eccentricities, diameter
+from .shortest_paths import (
+    dijkstra, floyd, floyd_matrices, sssp_tree, ShortestPathTree, SSSPCache,
+    astar, bidirectional_dijkstra, heuristic_scale,
+)
+from .ch import ContractionHierarchy, contraction_hierarchy, CH_EXT
+from .apsp import (
+    floyd_warshall, blocked_floyd_warshall, johnson, johnson_potentials, all_pairs_shortest_paths,
+    successor_path, IncrementalAPSP,
+)
+from .many_to_many import distance_matrix
+from .delta_stepping import delta_stepping
+from .mst import prim, kruskal
+from .bridges import find_bridges
+from .euler import all_degrees_even, find_eulerian_cycle_edges
+from .flow import (
+    ResidualNetwork, edmonds_karp, edmonds_karp_steps, dinic, push_relabel, max_flow,
+    IncrementalMaxFlow,
+)
+from .cuts import min_cut, residual_min_cut, gomory_hu_tree, GomoryHuTree
+from .importers import read_edge_list, read_dimacs, read_matrix_market, read_graph
+from .snapshot import SNAPSHOT_EXT, save_snapshot, load_snapshot, load_csr, MappedCSR
+from .spatial import SpatialIndex, grid_layout
+from .coding import huffman_encoding, shannon_fano
+
+__all__ = [
+    'Graph', 'RangeIndex', 'CSR',
+    'bfs', 'bfs_frontiers', 'bfs_levels', 'bfs_direction_optimizing', 'TOP_DOWN', 'BOTTOM_UP',
+    'dfs', 'dfs_order', 'DFSResult',
+    'TREE_EDGE', 'BACK_EDGE', 'FORWARD_EDGE', 'CROSS_EDGE',
+    'topological_sort', 'is_connected',
+    'multi_source_bfs', 'eccentricities', 'diameter',
+    'dijkstra', 'floyd', 'floyd_matrices', 'sssp_tree', 'ShortestPathTree', 'SSSPCache',
+    'astar', 'bidirectional_dijkstra', 'heuristic_scale',
+    'ContractionHierarchy', 'contraction_hierarchy', 'CH_EXT',
+    'floyd_warshall', 'blocked_floyd_warshall', 'johnson', 'johnson_potentials',
+    'all_pairs_shortest_paths', 'successor_path', 'IncrementalAPSP',
+    'distance_matrix', 'delta_stepping',
+    'prim', 'kruskal',
+    'find_bridges',
+    'all_degrees_even', 'find_eulerian_cycle_edges',
+    'ResidualNetwork', 'edmonds_karp', 'edmonds_karp_steps', 'dinic', 'push_relabel', 'max_flow',
+    'IncrementalMaxFlow',
+    'min_cut', 'residual_min_cut', 'gomory_hu_tree', 'GomoryHuTree',
+    'read_edge_list', 'read_dimacs', 'read_matrix_market', 'read_graph',
+    'SNAPSHOT_EXT', 'save_snapshot', 'load_snapshot', 'load_csr', 'MappedCSR',
+    'SpatialIndex', 'grid_layout',
+    'huffman_encoding', 'shannon_fano',
+]
@@ -0,0 +1,540 @@
+"""
+Кратчайшие пути между всеми парами вершин на матрицах NumPy (в памяти или отображённых из файла).
+NumPy – необязательная зависимость: без неё shortest_paths.floyd работает на списках Python.
+"""
+import heapq
+import math
+import os
+import tempfile
+import weakref
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - зависит от окружения
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("graph_core.apsp requires NumPy")
+
+
+def adjacency_matrices(graph, dtype='float64'):
+    """
+    Начальные матрицы алгоритма Флойда: dist (inf там, где ребра нет, 0 на диагонали;
+    из кратных рёбер берётся минимальное) и nxt – следующая вершина пути (-1, если пути нет).
+    """
+    _require_numpy()
+    n = graph.num_vertices
+    dist = np.full((n, n), np.inf, dtype=dtype)
+    nxt = np.full((n, n), -1, dtype=np.int32)
+    diag = np.arange(n)
+    dist[diag, diag] = 0
+    nxt[diag, diag] = diag
+    if graph.num_edges:
+        tail = np.asarray(graph.tail, dtype=np.int64)
+        head = np.asarray(graph.head, dtype=np.int64)
+        weight = np.asarray(graph.weight, dtype=dtype)
+        if not graph.directed:
+            tail, head = np.concatenate((tail, head)), np.concatenate((head, tail))
+            weight = np.concatenate((weight, weight))
+        np.minimum.at(dist, (tail, head), weight)
+        edge = tail != head
+        nxt[tail[edge], head[edge]] = head[edge]
+    return dist, nxt
+
+
+def floyd_warshall(graph, dtype='float64'):
+    """
+    Алгоритм Флойда–Уоршелла: одна векторная релаксация всей матрицы на каждую вершину k.
+    Возвращает (dist, nxt): матрицу расстояний dtype (float64 или float32) и матрицу
+    следующих вершин int32, по которой путь восстанавливает successor_path.
+    """
+    dist, nxt = adjacency_matrices(graph, dtype)
+    _relax_all(dist, nxt)
+    return dist, nxt
+
+
+def _relax_all(dist, nxt):
+    """Релаксирует матрицы dist и nxt на месте через каждую вершину k по очереди."""
+    n = len(dist)
+    through_k = np.empty_like(dist)
+    better = np.empty(dist.shape, dtype=bool)
+    for k in range(n):
+        # Пути через k: dist[i][k] + dist[k][j]; строка и столбец k на шаге k не меняются
+        np.add(dist[:, k, None], dist[k], out=through_k)
+        np.less(through_k, dist, out=better)
+        if better.any():
+            np.minimum(dist, through_k, out=dist)
+            np.copyto(nxt, nxt[:, k, None], where=better)
+
+
+BLOCK_SIZE = 256   # сторона плитки: три плитки float64 по 256x256 занимают около 1.5 МБ
+
+
+def _relax_tiles(dist, nxt, hops, tiles):
+    """
+    Релаксирует плитки dist[r0:r1, c0:c1] через вершины k0..k1-1.
+    Плитки строки и столбца k могут совпадать с обновляемой (фазы 1 и 2): на шаге k
+    столбец и строка k не меняются, поэтому чтение из той же плитки корректно.
+    При равной длине путь с меньшим числом дуг (hops) предпочтительнее: фазы блочного
+    алгоритма идут не в порядке k, и без этого на рёбрах нулевого веса nxt зацикливается.
+    """
+    for r0, r1, c0, c1, k0, k1 in tiles:
+        tile, tile_nxt, tile_hops = dist[r0:r1, c0:c1], nxt[r0:r1, c0:c1], hops[r0:r1, c0:c1]
+        via, via_nxt, via_hops = dist[r0:r1, k0:k1], nxt[r0:r1, k0:k1], hops[r0:r1, k0:k1]
+        row_k, row_hops = dist[k0:k1, c0:c1], hops[k0:k1, c0:c1]
+        through_k = np.empty_like(tile)
+        hops_k = np.empty_like(tile_hops)
+        better = np.empty(tile.shape, dtype=bool)
+        tie = np.empty(tile.shape, dtype=bool)
+        for k in range(k1 - k0):
+            np.add(via[:, k, None], row_k[k], out=through_k)
+            np.add(via_hops[:, k, None], row_hops[k], out=hops_k)
+            np.less(through_k, tile, out=better)
+            np.equal(through_k, tile, out=tie)
+            tie &= hops_k < tile_hops
+            better |= tie
+            if better.any():
+                np.copyto(tile, through_k, where=better)
+                np.copyto(tile_hops, hops_k, where=better)
+                np.copyto(tile_nxt, via_nxt[:, k, None], where=better)
+
+
+_worker_matrices = None
+
+
+def _init_worker(dist_name, nxt_name, hops_name, n, dtype):
+    global _worker_matrices
+    dist_shm = shared_memory.SharedMemory(dist_name)
+    nxt_shm = shared_memory.SharedMemory(nxt_name)
+    hops_shm = shared_memory.SharedMemory(hops_name)
+    _worker_matrices = (
+        np.ndarray((n, n), dtype=dtype, buffer=dist_shm.buf),
+        np.ndarray((n, n), dtype=np.int32, buffer=nxt_shm.buf),
+        np.ndarray((n, n), dtype=np.int32, buffer=hops_shm.buf),
+        dist_shm, nxt_shm, hops_shm,   # держим отображения, пока жив процесс
+    )
+
+
+def _run_tiles(tiles):
+    dist, nxt, hops = _worker_matrices[:3]
+    _relax_tiles(dist, nxt, hops, tiles)
+
+
+def _blocked_rounds(n, block_size):
+    """
+    Для каждого блока вершин kb выдаёт три фазы блочного алгоритма Флойда.
+    Каждая фаза – список задач, каждая задача – список плиток, которые можно считать независимо.
+    """
+    bounds = [(b, min(b + block_size, n)) for b in range(0, n, block_size)]
+    for kb, (k0, k1) in enumerate(bounds):
+        diagonal = [[(k0, k1, k0, k1, k0, k1)]]
+        cross = [[(k0, k1, c0, c1, k0, k1)] for jb, (c0, c1) in enumerate(bounds) if jb != kb]
+        cross += [[(r0, r1, k0, k1, k0, k1)] for ib, (r0, r1) in enumerate(bounds) if ib != kb]
+        rest = [[(r0, r1, c0, c1, k0, k1) for jb, (c0, c1) in enumerate(bounds) if jb != kb]
+                for ib, (r0, r1) in enumerate(bounds) if ib != kb]
+        yield diagonal, cross, rest
+
+
+def blocked_floyd_warshall(graph, block_size=BLOCK_SIZE, processes=None, dtype='float64'):
+    """
+    Блочный алгоритм Флойда–Уоршелла. Матрица делится на плитки block_size x block_size;
+    для каждого блока вершин k считается диагональная плитка, затем плитки его строки
+    и столбца, затем все остальные. Плитки одной фазы независимы и раздаются пулу процессов
+    (processes=None – по числу ядер, 1 – без пула), матрицы лежат в общей памяти.
+    Возвращает (dist, nxt) так же, как floyd_warshall.
+    На платформах без fork вызывать следует из-под if __name__ == '__main__'.
+    """
+    dist, nxt = adjacency_matrices(graph, dtype)
+    n = len(dist)
+    # Число дуг в найденном пути: 0 на диагонали, 1 для ребра, n там, где пути нет
+    # (сумма с n не меньше n, поэтому недостижимые пары не выигрывают сравнение по hops)
+    hops = np.where(nxt >= 0, 1, n).astype(np.int32)
+    np.fill_diagonal(hops, 0)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, max(1, -(-n // block_size) - 1))
+    if processes <= 1:
+        for phases in _blocked_rounds(n, block_size):
+            for tasks in phases:
+                for tiles in tasks:
+                    _relax_tiles(dist, nxt, hops, tiles)
+        return dist, nxt
+
+    matrices = (dist, nxt, hops)
+    segments = [shared_memory.SharedMemory(create=True, size=max(m.nbytes, 1)) for m in matrices]
+    try:
+        shared = [np.ndarray(m.shape, dtype=m.dtype, buffer=shm.buf) for m, shm in zip(matrices, segments)]
+        for target, m in zip(shared, matrices):
+            target[...] = m
+        with ProcessPoolExecutor(processes, initializer=_init_worker,
+                                 initargs=(*(shm.name for shm in segments), n, dist.dtype)) as pool:
+            for diagonal, cross, rest in _blocked_rounds(n, block_size):
+                _relax_tiles(*shared, diagonal[0])
+                list(pool.map(_run_tiles, cross))
+                list(pool.map(_run_tiles, rest))
+        dist[...] = shared[0]
+        nxt[...] = shared[1]
+        del shared
+    finally:
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+    return dist, nxt
+
+
+# Во сколько раз релаксация дуги в куче Дейкстры на Python (с учётом log V кучи) дороже
+# обновления одного элемента матрицы векторным Флойдом; замерено на графе в 1500 вершин:
+# около 40 нс против 3.5 нс
+JOHNSON_COST_RATIO = 12
+
+
+def johnson_potentials(csr):
+    """
+    Потенциалы Джонсона: расстояния Беллмана–Форда от фиктивной вершины, связанной со всеми
+    дугами веса 0. С ними веса w(u, v) + h[u] - h[v] неотрицательны.
+    Без отрицательных весов возвращает нули; при отрицательном цикле бросает ValueError.
+    """
+    n = csr.num_vertices
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    h = array('d', [0.0]) * n
+    if all(w >= 0 for w in weights):
+        return h
+    for _ in range(n):
+        changed = False
+        for u in range(n):
+            hu = h[u]
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if hu + weights[i] < h[v]:
+                    h[v] = hu + weights[i]
+                    changed = True
+        if not changed:
+            return h
+    raise ValueError("graph contains a negative cycle")
+
+
+def _dijkstra_row(offsets, targets, weights, potentials, s):
+    """
+    Дейкстра из s по перевзвешенным дугам. Возвращает строку расстояний в исходных весах
+    и строку первых вершин путей (nxt[s][t]; -1, если t недостижима).
+    """
+    n = len(offsets) - 1
+    dist = [math.inf] * n
+    prev = [-1] * n
+    first = [-1] * n
+    dist[s] = 0
+    first[s] = s
+    pq = [(0, s)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]:
+            continue
+        p = prev[u]
+        if p >= 0:
+            first[u] = u if p == s else first[p]
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            alt = d + weights[i]
+            if alt < dist[v]:
+                dist[v] = alt
+                prev[v] = u
+                heapq.heappush(pq, (alt, v))
+    hs = potentials[s]
+    return [d - hs + potentials[t] if d != math.inf else d for t, d in enumerate(dist)], first
+
+
+def _open_output(path, n, dtype, create=False):
+    """Матрицы dist и nxt, отображённые из одного файла: сначала dist, затем nxt (с выравниванием)."""
+    dist_bytes = n * n * np.dtype(dtype).itemsize
+    nxt_offset = dist_bytes + (-dist_bytes % 8)
+    if create:
+        with open(path, 'wb') as f:
+            f.truncate(nxt_offset + n * n * 4)
+    dist = np.memmap(path, dtype=dtype, mode='r+', shape=(n, n))
+    nxt = np.memmap(path, dtype=np.int32, mode='r+', offset=nxt_offset, shape=(n, n))
+    return dist, nxt
+
+
+_worker_johnson = None
+
+
+def _init_johnson_worker(csr, weights, potentials, path, n, dtype):
+    global _worker_johnson
+    _worker_johnson = (csr.offsets, csr.targets, weights, potentials) + _open_output(path, n, dtype)
+
+
+def _run_sources(sources):
+    offsets, targets, weights, potentials, dist, nxt = _worker_johnson
+    for s in sources:
+        dist[s], nxt[s] = _dijkstra_row(offsets, targets, weights, potentials, s)
+    dist.flush()
+    nxt.flush()
+
+
+def johnson(graph, path=None, processes=None, batch_size=64, dtype='float64'):
+    """
+    Кратчайшие пути между всеми парами вершин алгоритмом Джонсона: по одному поиску Дейкстры
+    из каждой вершины, при отрицательных весах – с потенциалами Беллмана–Форда.
+    Источники раздаются пулу процессов пачками по batch_size (processes=None – по числу ядер,
+    1 – без пула), и каждый процесс сразу пишет свои строки в файл path, отображённый в память,
+    так что матрица целиком в ОЗУ не держится. Без path используется временный файл,
+    который удаляется, когда вызывающий код освободит оба возвращённых массива.
+    Возвращает (dist, nxt) – numpy.memmap той же формы, что у floyd_warshall.
+    На платформах без fork вызывать следует из-под if __name__ == '__main__'.
+    """
+    _require_numpy()
+    n = graph.num_vertices
+    if not n:
+        return np.zeros((0, 0), dtype=dtype), np.zeros((0, 0), dtype=np.int32)
+    csr = graph.csr()
+    potentials = johnson_potentials(csr)
+    weights = csr.weights
+    if any(potentials):
+        weights = array('d', (weights[i] + potentials[u] - potentials[csr.targets[i]]
+                              for u in range(n) for i in range(csr.offsets[u], csr.offsets[u + 1])))
+
+    temporary = path is None
+    if temporary:
+        fd, path = tempfile.mkstemp(suffix='.apsp')
+        os.close(fd)
+    try:
+        dist, nxt = _open_output(path, n, dtype, create=True)
+        tasks = [range(i, min(i + batch_size, n)) for i in range(0, n, batch_size)]
+        if processes is None:
+            processes = os.cpu_count() or 1
+        processes = min(processes, len(tasks))
+        if processes <= 1:
+            for sources in tasks:
+                for s in sources:
+                    dist[s], nxt[s] = _dijkstra_row(csr.offsets, csr.targets, weights, potentials, s)
+        else:
+            with ProcessPoolExecutor(processes, initializer=_init_johnson_worker,
+                                     initargs=(csr, weights, potentials, path, n, dtype)) as pool:
+                list(pool.map(_run_sources, tasks))
+    except BaseException:
+        dist = nxt = None   # закрываем отображения, иначе в Windows файл не удалить
+        if temporary:
+            _unlink_quietly(path)
+        raise
+    if temporary:
+        _delete_with(path, dist, nxt)
+    return dist, nxt
+
+
+class _TemporaryOutput:
+    """Временный файл матриц; удаляется, когда умирают все отображающие его memmap."""
+
+    def __init__(self, path):
+        weakref.finalize(self, _unlink_quietly, path)
+
+
+def _delete_with(path, *arrays):
+    # Ссылку держит каждый массив (срезы и представления держат исходный массив через base),
+    # так что файл удаляется после закрытия последнего отображения, а не пока оно открыто
+    output = _TemporaryOutput(path)
+    for matrix in arrays:
+        matrix._apsp_output = output
+
+
+def _unlink_quietly(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass   # например, при выходе из интерпретатора, пока массивы ещё живы (Windows)
+
+
+def all_pairs_shortest_paths(graph, path=None, processes=None, dtype='float64'):
+    """
+    Кратчайшие пути между всеми парами вершин, выбирая алгоритм по плотности графа:
+    Флойд (Θ(V³), но векторный) для плотных графов и Джонсон (V поисков Дейкстры, Θ(V·E·log V))
+    для разреженных. Если задан path, результат всегда пишется в файл алгоритмом Джонсона.
+    Возвращает (dist, nxt).
+    """
+    n, m = graph.num_vertices, graph.num_edges
+    if not graph.directed:
+        m *= 2
+    # V·E·log V·ratio против V³
+    sparse = JOHNSON_COST_RATIO * m * max(math.log2(n), 1) < n * n
+    if path is not None or sparse:
+        return johnson(graph, path, processes, dtype=dtype)
+    if n >= 4 * BLOCK_SIZE:
+        return blocked_floyd_warshall(graph, processes=processes, dtype=dtype)
+    return floyd_warshall(graph, dtype)
+
+
+def successor_path(nxt, u, v):
+    """
+    Путь из u в v (список индексов вершин) по матрице следующих вершин или None, если пути нет.
+    Простой путь короче V вершин; если цепочка nxt длиннее, в матрице цикл – бросает ValueError.
+    """
+    if nxt[u][v] == -1:
+        return None
+    path = [u]
+    limit = len(nxt)
+    while u != v:
+        if len(path) > limit:
+            raise ValueError("successor matrix contains a cycle")
+        u = int(nxt[u][v])
+        path.append(u)
+    return path
+
+
+AFFECTED_RTOL = 1e-9   # допуск сравнения сумм с плавающей точкой при поиске затронутых пар
+
+
+class IncrementalAPSP:
+    """
+    Кратчайшие пути между всеми парами, сохраняемые между правками графа.
+    Хранит матрицу прямых весов weights (из кратных рёбер – минимальный) и матрицы dist, nxt.
+    Уменьшение веса дуги или новое ребро обновляют матрицы за O(V²); увеличение веса
+    и удаление пересчитывают только пары, чей кратчайший путь мог проходить через изменённую дугу.
+    Вершины задаются ключами, как в исходном графе.
+    """
+
+    __slots__ = ('directed', 'keys', 'index', 'weights', 'dist', 'nxt')
+
+    def __init__(self, graph):
+        _require_numpy()
+        self.directed = graph.directed
+        self.keys = list(graph.keys)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.weights = adjacency_matrices(graph)[0]
+        if graph.num_vertices >= 4 * BLOCK_SIZE:
+            self.dist, self.nxt = blocked_floyd_warshall(graph)
+        else:
+            self.dist, self.nxt = floyd_warshall(graph)
+
+    def add_vertex(self, key):
+        """Добавляет изолированную вершину (O(V²) на расширение матриц) и возвращает её индекс."""
+        i = self.index.get(key)
+        if i is not None:
+            return i
+        n = len(self.keys)
+        grown = []
+        for matrix, fill in ((self.weights, np.inf), (self.dist, np.inf), (self.nxt, -1)):
+            out = np.full((n + 1, n + 1), fill, dtype=matrix.dtype)
+            out[:n, :n] = matrix
+            grown.append(out)
+        self.weights, self.dist, self.nxt = grown
+        self.weights[n, n] = self.dist[n, n] = 0
+        self.nxt[n, n] = n
+        self.keys.append(key)
+        self.index[key] = n
+        return n
+
+    def add_edge(self, u, v, weight):
+        """Добавляет ребро u–v: прямой вес пары становится минимумом из прежнего и weight."""
+        i, j = self.index[u], self.index[v]
+        self.set_weight(u, v, min(weight, self.weights[i, j]))
+
+    def remove_edge(self, u, v):
+        """Удаляет прямую связь u–v (все кратные рёбра между ними)."""
+        self.set_weight(u, v, math.inf)
+
+    def set_weight(self, u, v, weight):
+        """
+        Задаёт прямой вес пары u–v (math.inf – связи нет) и обновляет матрицы.
+        Если вес создаёт отрицательный цикл (в неориентированном графе – любой отрицательный вес),
+        бросает ValueError, и матрицы не меняются.
+        """
+        a, b = self.index[u], self.index[v]
+        if a == b:
+            return
+        arcs = ((a, b),) if self.directed else ((a, b), (b, a))
+        old = self.weights[a, b]
+        if weight == old:
+            return
+        if weight < 0 and not self.directed:
+            # Неориентированное ребро отрицательного веса само по себе – цикл a -> b -> a веса 2 * weight
+            raise ValueError("negative edge weight in an undirected graph creates a negative cycle")
+        if weight < old:
+            for a, b in arcs:
+                if weight + self.dist[b, a] < 0:
+                    raise ValueError("edge weight creates a negative cycle")
+            for a, b in arcs:
+                self.weights[a, b] = weight
+                self._decrease(a, b, weight)
+        else:
+            affected = np.zeros(self.dist.shape, dtype=bool)
+            for a, b in arcs:
+                affected |= self._uses_arc(a, b, old)
+            for a, b in arcs:
+                self.weights[a, b] = weight
+            self._recompute(affected)
+
+    def _decrease(self, a, b, weight):
+        """Новая дуга a -> b веса weight: пути i -> a -> b -> j за одну векторную релаксацию."""
+        dist, nxt = self.dist, self.nxt
+        if not weight < dist[a, b]:
+            return   # дуга не короче уже известного пути a -> b, значит, ничего не улучшит
+        through = dist[:, a, None] + (weight + dist[b])
+        better = through < dist
+        first = nxt[:, a].copy()
+        first[a] = b
+        np.minimum(dist, through, out=dist)
+        np.copyto(nxt, first[:, None], where=better)
+
+    def _uses_arc(self, a, b, weight):
+        """Пары (i, j), чей кратчайший путь может проходить через дугу a -> b веса weight."""
+        dist = self.dist
+        through = dist[:, a, None] + (weight + dist[b])
+        affected = (through <= dist + AFFECTED_RTOL * np.abs(dist)) & np.isfinite(dist)
+        np.fill_diagonal(affected, False)
+        return affected
+
+    def _recompute(self, affected):
+        """
+        Пересчитывает затронутые пары. Расстояния до незатронутых вершин строки верны, поэтому
+        для каждой строки i затронутые вершины получают оценки через незатронутых соседей,
+        а дальше – Дейкстра только среди затронутых вершин на плотной матрице весов.
+        При отрицательных весах Дейкстра неприменима – тогда матрицы строятся заново.
+        """
+        if not affected.any():
+            return
+        weights, dist, nxt = self.weights, self.dist, self.nxt
+        if (weights < 0).any():
+            np.copyto(dist, weights)
+            finite = np.isfinite(weights)
+            nxt[...] = np.where(finite, np.arange(len(weights)), -1)
+            np.fill_diagonal(nxt, np.arange(len(weights)))
+            _relax_all(dist, nxt)
+            return
+        for i in np.flatnonzero(affected.any(axis=1)):
+            cols = np.flatnonzero(affected[i])
+            known = np.flatnonzero(~affected[i])
+            row, hop = dist[i], nxt[i]
+            via = row[known, None] + weights[np.ix_(known, cols)]
+            best = via.argmin(axis=0)
+            cand = via[best, np.arange(len(cols))]
+            k = known[best]
+            first = np.where(k == i, cols, hop[k])
+            pending = np.ones(len(cols), dtype=bool)
+            while True:
+                t = np.where(pending, cand, np.inf).argmin()
+                if not pending[t] or cand[t] == np.inf:
+                    break
+                pending[t] = False
+                j = cols[t]
+                row[j], hop[j] = cand[t], first[t]
+                alt = cand[t] + weights[j, cols]
+                better = pending & (alt < cand)
+                cand[better] = alt[better]
+                first[better] = first[t]
+            rest = cols[pending]
+            row[rest] = np.inf
+            hop[rest] = -1
+
+    def distance(self, u, v):
+        return float(self.dist[self.index[u], self.index[v]])
+
+    def shortest_path(self, u, v):
+        """Список ключей вершин пути из u в v или None, если пути нет."""
+        path = successor_path(self.nxt, self.index[u], self.index[v])
+        if path is None:
+            return None
+        return [self.keys[w] for w in path]
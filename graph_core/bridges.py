@@ -0,0 +1,49 @@
+from array import array
+
+
+def find_bridges(graph):
+    """
+    Находит мосты в неориентированном графе с помощью алгоритма на основе времени входа.
+    Обход в глубину итеративный, с явным стеком по CSR (как dfs_order), без рекурсии.
+    Возвращает список пар ключей вершин (u, v).
+    """
+    csr = graph.csr()
+    offsets, targets, edge_ids = csr.offsets, csr.targets, csr.edge_ids
+    n = graph.num_vertices
+    disc = array('q', [-1]) * n
+    low = array('q', [0]) * n
+    parent_edge = array('q', [-1]) * n
+    ptr = array('q', offsets[:-1])
+    stack = array('q')
+    bridges = []
+    time = 0
+
+    for root in range(n):
+        if disc[root] >= 0:
+            continue
+        disc[root] = low[root] = time
+        time += 1
+        stack.append(root)
+        while stack:
+            u = stack[-1]
+            i = ptr[u]
+            if i < offsets[u + 1]:
+                ptr[u] = i + 1
+                v, e = targets[i], edge_ids[i]
+                if disc[v] < 0:
+                    parent_edge[v] = e
+                    disc[v] = low[v] = time
+                    time += 1
+                    stack.append(v)
+                elif e != parent_edge[u]:
+                    # Пропускаем только то ребро, по которому пришли: кратные рёбра мостами не являются
+                    low[u] = min(low[u], disc[v])
+            else:
+                stack.pop()
+                if stack:
+                    p = stack[-1]
+                    low[p] = min(low[p], low[u])
+                    if low[u] > disc[p]:
+                        bridges.append((graph.keys[p], graph.keys[u]))
+
+    return bridges
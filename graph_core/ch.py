@@ -0,0 +1,307 @@
+"""
+Иерархии сжатия (contraction hierarchies) для быстрых запросов кратчайшего пути
+между парами вершин неизменного графа с неотрицательными весами.
+
+Предобработка по очереди «сжимает» вершины в порядке важности: вершина удаляется,
+а кратчайшие пути через неё сохраняются рёбрами-сокращениями (shortcut) между соседями.
+Запрос – двунаправленный поиск, который ходит только к более важным вершинам:
+прямой по восходящим дугам, обратный по нисходящим.
+"""
+import heapq
+import math
+import struct
+from array import array
+
+from .graph import RangeIndex
+from .snapshot import _KeyIndex, _as_bytes, map_blocks, write_blocks
+
+WITNESS_SETTLE_LIMIT = 64   # сколько вершин обрабатывает поиск свидетеля, прежде чем сдаться
+PRIORITY_SETTLE_LIMIT = 8   # то же при оценке приоритета вершины
+
+CH_MAGIC = b'GCCH\x00\x00\x00\x00'
+CH_FORMAT_VERSION = 1
+CH_EXT = '.gch'
+
+# magic, версия формата, флаги, число вершин, первый ключ вершины
+_CH_HEADER = struct.Struct('<8sHHqq')
+_CH_BLOCKS = ('rank', 'up_offsets', 'up_targets', 'up_weights', 'up_middle',
+              'down_offsets', 'down_targets', 'down_weights', 'down_middle', 'keys')
+_CH_TYPES = ('q', 'q', 'q', 'd', 'q', 'q', 'q', 'd', 'q', 'q')
+
+_DIRECTED = 1
+_RANGE_KEYS = 2
+
+
+def _witness_search(out, source, skip, targets, limit, settle_limit):
+    """
+    Ограниченный поиск Дейкстры из source в ещё не сжатом графе в обход вершины skip.
+    Возвращает найденные расстояния до вершин targets (не дальше limit).
+    """
+    dist = {source: 0}
+    found = {}
+    pq = [(0, source)]
+    settled = 0
+    remaining = len(targets)
+    while pq and remaining and settled < settle_limit:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]:
+            continue
+        settled += 1
+        if u in targets and u not in found:
+            found[u] = d
+            remaining -= 1
+        for v, (w, _) in out[u].items():
+            if v == skip:
+                continue
+            alt = d + w
+            if alt <= limit and alt < dist.get(v, math.inf):
+                dist[v] = alt
+                heapq.heappush(pq, (alt, v))
+    return found
+
+
+def _shortcuts(out, inc, v, settle_limit):
+    """Сокращения (u, w, вес), необходимые при сжатии вершины v."""
+    shortcuts = []
+    outgoing = out[v]
+    if not outgoing:
+        return shortcuts
+    max_out = max(w for w, _ in outgoing.values())
+    for u, (w_uv, _) in inc[v].items():
+        targets = {w for w in outgoing if w != u}
+        if not targets:
+            continue
+        found = _witness_search(out, u, v, targets, w_uv + max_out, settle_limit)
+        for w in targets:
+            weight = w_uv + outgoing[w][0]
+            if found.get(w, math.inf) > weight:
+                shortcuts.append((u, w, weight))
+    return shortcuts
+
+
+def _to_csr(n, rows):
+    """Упаковывает списки дуг (цель, вес, середина) по вершинам в массивы CSR."""
+    offsets = array('q', [0])
+    targets, weights, middle = array('q'), array('d'), array('q')
+    for u in range(n):
+        for v, w, mid in rows[u]:
+            targets.append(v)
+            weights.append(w)
+            middle.append(mid)
+        offsets.append(len(targets))
+    return offsets, targets, weights, middle
+
+
+def _find_arc(offsets, targets, row, target):
+    for i in range(offsets[row], offsets[row + 1]):
+        if targets[i] == target:
+            return i
+    raise KeyError((row, target))
+
+
+class ContractionHierarchy:
+    """
+    Иерархия сжатия графа: ранг (порядок сжатия) каждой вершины и два CSR.
+    Строка u восходящего CSR (up_*) – дуги u -> v к вершинам с большим рангом;
+    строка u нисходящего CSR (down_*) – дуги v -> u из вершин с большим рангом.
+    *_middle – вершина, через которую проходит сокращение (-1 для исходного ребра).
+    Ключи вершин те же, что у исходного graph_core.Graph.
+    """
+
+    __slots__ = ('directed', 'keys', 'index', 'rank',
+                 'up_offsets', 'up_targets', 'up_weights', 'up_middle',
+                 'down_offsets', 'down_targets', 'down_weights', 'down_middle')
+
+    def __init__(self, directed, keys, index, rank, up, down):
+        self.directed = directed
+        self.keys = keys
+        self.index = index
+        self.rank = rank
+        self.up_offsets, self.up_targets, self.up_weights, self.up_middle = up
+        self.down_offsets, self.down_targets, self.down_weights, self.down_middle = down
+
+    @classmethod
+    def from_graph(cls, graph, settle_limit=WITNESS_SETTLE_LIMIT):
+        """
+        Строит иерархию. Порядок сжатия – ленивая очередь по «разности рёбер» (сколько сокращений
+        добавится минус сколько рёбер исчезнет) плюс число уже сжатых соседей и глубина вершины.
+        Приоритет пересчитывается при извлечении вершины; если он вырос, вершина возвращается в очередь.
+        Для оценки приоритета поиск свидетелей короче (PRIORITY_SETTLE_LIMIT), чем при самом сжатии.
+        """
+        n = graph.num_vertices
+        # out[u][v] = (вес, середина), inc[v][u] – то же ребро; из кратных рёбер остаётся минимальное
+        out = [{} for _ in range(n)]
+        inc = [{} for _ in range(n)]
+
+        def add_arc(u, v, w, mid):
+            if u != v and w < out[u].get(v, (math.inf,))[0]:
+                out[u][v] = inc[v][u] = (w, mid)
+
+        for e in range(graph.num_edges):
+            u, v, w = graph.tail[e], graph.head[e], graph.weight[e]
+            add_arc(u, v, w, -1)
+            if not graph.directed:
+                add_arc(v, u, w, -1)
+
+        deleted = [0] * n   # сколько соседей вершины уже сжато
+        level = [0] * n     # глубина вершины в иерархии: 1 + наибольшая глубина сжатых соседей
+
+        def priority(v):
+            removed = len(out[v]) + len(inc[v])
+            shortcuts = len(_shortcuts(out, inc, v, PRIORITY_SETTLE_LIMIT))
+            return shortcuts - removed + deleted[v] + level[v]
+
+        pq = [(priority(v), v) for v in range(n)]
+        heapq.heapify(pq)
+        rank = array('q', [0]) * n
+        up_rows = [[] for _ in range(n)]
+        down_rows = [[] for _ in range(n)]
+        contracted = 0
+        while pq:
+            _, v = heapq.heappop(pq)
+            current = priority(v)
+            if pq and current > pq[0][0]:
+                heapq.heappush(pq, (current, v))
+                continue
+            for u, w, weight in _shortcuts(out, inc, v, settle_limit):
+                add_arc(u, w, weight, v)
+            rank[v] = contracted
+            contracted += 1
+            # Оставшиеся рёбра v ведут к вершинам с большим рангом
+            for w, (weight, mid) in out[v].items():
+                up_rows[v].append((w, weight, mid))
+                del inc[w][v]
+            for u, (weight, mid) in inc[v].items():
+                down_rows[v].append((u, weight, mid))
+                del out[u][v]
+            for u in out[v].keys() | inc[v].keys():
+                deleted[u] += 1
+                level[u] = max(level[u], level[v] + 1)
+            out[v] = {}
+            inc[v] = {}
+
+        keys = graph.keys if isinstance(graph.keys, range) else list(graph.keys)
+        index = dict(graph.index) if isinstance(graph.index, dict) else graph.index
+        return cls(graph.directed, keys, index, rank, _to_csr(n, up_rows), _to_csr(n, down_rows))
+
+    @property
+    def num_vertices(self):
+        return len(self.rank)
+
+    def _search(self, s, t):
+        """
+        Двунаправленный поиск вверх по иерархии. Каждая сторона продолжает, пока минимум
+        её кучи меньше лучшего найденного расстояния. Возвращает (расстояние, вершина встречи,
+        предки прямого поиска, предки обратного поиска); предок – пара (вершина, номер дуги).
+        """
+        sides = ((self.up_offsets, self.up_targets, self.up_weights),
+                 (self.down_offsets, self.down_targets, self.down_weights))
+        dist = ({s: 0}, {t: 0})
+        prev = ({s: None}, {t: None})
+        heaps = ([(0, s)], [(0, t)])
+        best, meet = (0, s) if s == t else (math.inf, -1)
+        while True:
+            side = -1
+            for i in (0, 1):
+                if heaps[i] and heaps[i][0][0] < best and (side < 0 or heaps[i][0][0] < heaps[side][0][0]):
+                    side = i
+            if side < 0:
+                break
+            d, u = heapq.heappop(heaps[side])
+            my_dist, other_dist = dist[side], dist[1 - side]
+            if d > my_dist[u]:
+                continue
+            if u in other_dist and d + other_dist[u] < best:
+                best, meet = d + other_dist[u], u
+            offsets, targets, weights = sides[side]
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                alt = d + weights[i]
+                if alt < my_dist.get(v, math.inf):
+                    my_dist[v] = alt
+                    prev[side][v] = (u, i)
+                    heapq.heappush(heaps[side], (alt, v))
+        return best, meet, prev[0], prev[1]
+
+    def distance(self, start, end):
+        """Длина кратчайшего пути между вершинами с ключами start и end (math.inf, если пути нет)."""
+        return self._search(self.index[start], self.index[end])[0]
+
+    def _unpack(self, u, v, mid, path):
+        """Дописывает в path вершины дуги u -> v после u, раскрывая сокращения."""
+        stack = [(u, v, mid)]
+        while stack:
+            u, v, mid = stack.pop()
+            if mid < 0:
+                path.append(v)
+                continue
+            # u -> mid – нисходящая дуга в строке mid, mid -> v – восходящая в строке mid
+            first = self.down_middle[_find_arc(self.down_offsets, self.down_targets, mid, u)]
+            second = self.up_middle[_find_arc(self.up_offsets, self.up_targets, mid, v)]
+            stack.append((mid, v, second))
+            stack.append((u, mid, first))
+
+    def shortest_path(self, start, end):
+        """
+        Кратчайший путь между вершинами с ключами start и end.
+        Возвращает список ключей вершин исходного графа (сокращения раскрыты) или None.
+        """
+        s, t = self.index[start], self.index[end]
+        best, meet, prev_up, prev_down = self._search(s, t)
+        if best == math.inf:
+            return None
+        arcs = []
+        v = meet
+        while prev_up[v] is not None:
+            u, i = prev_up[v]
+            arcs.append((u, v, self.up_middle[i]))
+            v = u
+        arcs.reverse()
+        v = meet
+        while prev_down[v] is not None:
+            u, i = prev_down[v]
+            arcs.append((v, u, self.down_middle[i]))
+            v = u
+        path = [s]
+        for u, v, mid in arcs:
+            self._unpack(u, v, mid, path)
+        keys = self.keys
+        return [keys[u] for u in path]
+
+    def save(self, path):
+        """Сохраняет иерархию в двоичный файл (формат блоков как у снимков графа)."""
+        flags = _DIRECTED if self.directed else 0
+        first = 0
+        keys = None
+        if isinstance(self.keys, range):
+            flags |= _RANGE_KEYS
+            first = self.keys.start
+        else:
+            keys = _as_bytes(self.keys, 'q')
+        arrays = (self.rank, self.up_offsets, self.up_targets, self.up_weights, self.up_middle,
+                  self.down_offsets, self.down_targets, self.down_weights, self.down_middle)
+        blocks = [_as_bytes(a, item) for a, item in zip(arrays, _CH_TYPES)] + [keys]
+        write_blocks(path, _CH_HEADER.pack(CH_MAGIC, CH_FORMAT_VERSION, flags, len(self.rank), first),
+                     blocks)
+
+    @classmethod
+    def load(cls, path):
+        """Открывает сохранённую иерархию через mmap без копирования массивов."""
+        with open(path, 'rb') as f:
+            magic, version = _CH_HEADER.unpack(f.read(_CH_HEADER.size).ljust(_CH_HEADER.size, b'\0'))[:2]
+        if magic != CH_MAGIC:
+            raise ValueError(f"{path}: not a contraction hierarchy")
+        if version != CH_FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported contraction hierarchy version {version}")
+        (_, _, flags, n, first), blocks = map_blocks(path, _CH_HEADER, _CH_TYPES)
+        if flags & _RANGE_KEYS:
+            keys, index = range(first, first + n), RangeIndex(first, n)
+        else:
+            keys = blocks[9]
+            index = _KeyIndex(keys)
+        return cls(bool(flags & _DIRECTED), keys, index, blocks[0], blocks[1:5], blocks[5:9])
+
+
+def contraction_hierarchy(graph):
+    """Иерархия сжатия графа; строится один раз и переиспользуется до изменения графа."""
+    return graph.cached('ch', lambda: ContractionHierarchy.from_graph(graph))
@@ -0,0 +1,95 @@
+from array import array
+
+
+class CSR:
+    """
+    Сжатое построчное представление графа (compressed sparse row).
+    Соседи вершины u лежат в targets[offsets[u]:offsets[u + 1]];
+    в тех же позициях weights хранит вес дуги, а edge_ids – индекс ребра в исходном графе.
+    Для неориентированного графа (directed=False) каждое ребро записано в строках обоих концов.
+    """
+
+    __slots__ = ('offsets', 'targets', 'weights', 'edge_ids', 'directed')
+
+    def __init__(self, offsets, targets, weights, edge_ids, directed=False):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.edge_ids = edge_ids
+        self.directed = directed
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Строит CSR подсчётом степеней за два прохода по массивам рёбер.
+        Порядок соседей совпадает с порядком добавления рёбер; для неориентированного графа
+        каждое ребро попадает в строки обоих концов.
+        """
+        n = graph.num_vertices
+        tail, head, weight = graph.tail, graph.head, graph.weight
+        m = len(tail)
+        size = m if graph.directed else 2 * m
+
+        offsets = array('q', bytes(8 * (n + 1)))
+        for u in tail:
+            offsets[u + 1] += 1
+        if not graph.directed:
+            for v in head:
+                offsets[v + 1] += 1
+        for u in range(n):
+            offsets[u + 1] += offsets[u]
+
+        targets = array('q', bytes(8 * size))
+        weights = array(weight.typecode, bytes(weight.itemsize * size))
+        edge_ids = array('q', bytes(8 * size))
+        pos = offsets[:-1]
+        for e in range(m):
+            u, v, w = tail[e], head[e], weight[e]
+            i = pos[u]
+            targets[i] = v
+            weights[i] = w
+            edge_ids[i] = e
+            pos[u] = i + 1
+            if not graph.directed:
+                i = pos[v]
+                targets[i] = u
+                weights[i] = w
+                edge_ids[i] = e
+                pos[v] = i + 1
+        return cls(offsets, targets, weights, edge_ids, graph.directed)
+
+    def transpose(self):
+        """CSR с обращёнными дугами: строка v содержит всех u, для которых есть дуга u -> v."""
+        n = self.num_vertices
+        offsets, targets, weights, edge_ids = self.offsets, self.targets, self.weights, self.edge_ids
+        size = len(targets)
+        t_offsets = array('q', bytes(8 * (n + 1)))
+        for v in targets:
+            t_offsets[v + 1] += 1
+        for v in range(n):
+            t_offsets[v + 1] += t_offsets[v]
+        t_targets = array('q', bytes(8 * size))
+        typecode = weights.typecode if isinstance(weights, array) else weights.format
+        t_weights = array(typecode, bytes(weights.itemsize * size))
+        t_edge_ids = array('q', bytes(8 * size))
+        pos = t_offsets[:-1]
+        for u in range(n):
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                j = pos[v]
+                t_targets[j] = u
+                t_weights[j] = weights[i]
+                t_edge_ids[j] = edge_ids[i]
+                pos[v] = j + 1
+        return CSR(t_offsets, t_targets, t_weights, t_edge_ids, self.directed)
+
+    @property
+    def num_vertices(self):
+        return len(self.offsets) - 1
+
+    def degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def neighbors(self, u):
+        """Соседи вершины u (срез массива targets)."""
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
@@ -0,0 +1,161 @@
+"""
+Минимальные разрезы: s-t разрез по остаточной сети и дерево Гомори–Ху для всех пар вершин.
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .flow import ResidualNetwork, residual_solver
+
+
+def _cut_edges(graph, side):
+    """Рёбра разреза: из доли истока в долю стока (в неориентированном графе – в любую сторону)."""
+    tail, head = graph.tail, graph.head
+    if graph.directed:
+        return [graph.edge_keys[e] for e in range(graph.num_edges)
+                if side[tail[e]] and not side[head[e]]]
+    return [graph.edge_keys[e] for e in range(graph.num_edges) if side[tail[e]] != side[head[e]]]
+
+
+def _solve(graph, s, t, engine):
+    """Величина максимального потока из s в t (индексы) и маска доли истока минимального разреза."""
+    net = ResidualNetwork(graph)
+    value = residual_solver(engine)(net, s, t)
+    return value, net.source_side(s)
+
+
+def min_cut(graph, source, sink, engine='dinic'):
+    """
+    Минимальный s-t разрез по остаточной сети максимального потока: доля истока – вершины,
+    достижимые из истока по ненасыщенным дугам, а рёбра разреза из неё выходят и насыщены.
+    Возвращает (величина разреза, множество ключей вершин доли истока, список ключей рёбер разреза).
+    Для неориентированного графа ребро пропускает поток в обе стороны.
+    """
+    value, side = _solve(graph, graph.index[source], graph.index[sink], engine)
+    keys = graph.keys
+    return value, {keys[u] for u in range(graph.num_vertices) if side[u]}, _cut_edges(graph, side)
+
+
+def residual_min_cut(graph, net, source):
+    """
+    Минимальный разрез по уже построенному максимальному потоку в сети net
+    (например, после edmonds_karp_steps с тем же net), без повторного решения.
+    Возвращает то же, что min_cut.
+    """
+    s = graph.index[source]
+    side = net.source_side(s)
+    keys = graph.keys
+    return net.outflow(s), {keys[u] for u in range(graph.num_vertices) if side[u]}, _cut_edges(graph, side)
+
+
+class GomoryHuTree:
+    """
+    Дерево Гомори–Ху: минимальный разрез между любыми вершинами u и v равен наименьшему
+    весу ребра на пути между ними в дереве. parent[i] – родитель вершины i (у корня -1),
+    weight[i] – вес ребра i–parent[i].
+    """
+
+    __slots__ = ('keys', 'index', 'parent', 'weight', 'depth')
+
+    def __init__(self, keys, index, parent, weight):
+        self.keys = keys
+        self.index = index
+        self.parent = parent
+        self.weight = weight
+        self.depth = depth = array('q', [-1]) * len(parent)
+        for v in range(len(parent)):
+            chain = []
+            while v >= 0 and depth[v] < 0:
+                chain.append(v)
+                v = parent[v]
+            d = depth[v] if v >= 0 else -1
+            for u in reversed(chain):
+                d += 1
+                depth[u] = d
+
+    def min_cut(self, u, v):
+        """Величина минимального разреза между вершинами с ключами u и v; O(V)."""
+        u, v = self.index[u], self.index[v]
+        if u == v:
+            raise ValueError("min cut requires two distinct vertices")
+        parent, weight, depth = self.parent, self.weight, self.depth
+        best = None
+        while u != v:
+            if depth[u] < depth[v]:
+                u, v = v, u
+            if best is None or weight[u] < best:
+                best = weight[u]
+            u = parent[u]
+        return best
+
+    def edges(self):
+        """Рёбра дерева: (ключ вершины, ключ родителя, вес)."""
+        keys = self.keys
+        return [(keys[i], keys[p], self.weight[i]) for i, p in enumerate(self.parent) if p >= 0]
+
+
+_worker_graph = None
+
+
+def _init_worker(graph, engine):
+    global _worker_graph
+    _worker_graph = (graph, engine)
+
+
+def _run_cut(pair):
+    return _solve(_worker_graph[0], *pair, _worker_graph[1])
+
+
+def gomory_hu_tree(graph, processes=None, engine='dinic'):
+    """
+    Дерево Гомори–Ху неориентированного графа (вес ребра – пропускная способность)
+    алгоритмом Гасфилда: V - 1 вычислений максимального потока без стягивания вершин.
+    Поток для вершины s считается к её текущему родителю; пока s не обработана, родитель
+    может смениться, поэтому следующие processes пар считаются пулом процессов заранее,
+    а результат пары, родитель которой успел измениться, пересчитывается.
+    processes=None – по числу ядер, 1 – без пула.
+    На платформах без fork вызывать следует из-под if __name__ == '__main__'.
+    """
+    if graph.directed:
+        raise ValueError("Gomory-Hu tree requires an undirected graph")
+    residual_solver(engine)   # неизвестный алгоритм – ошибка до запуска пула
+    n = graph.num_vertices
+    parent = array('q', [0]) * n
+    weight = [0] * n
+    if n:
+        parent[0] = -1
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, max(n - 1, 1))
+    pool = None
+    if processes > 1:
+        pool = ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(graph, engine))
+    try:
+        pending = {}   # s -> (родитель на момент запуска, future)
+        for s in range(1, n):
+            if pool is not None:
+                for ahead in range(s, min(s + processes, n)):
+                    if ahead not in pending:
+                        pending[ahead] = (parent[ahead], pool.submit(_run_cut, (ahead, parent[ahead])))
+                t, future = pending.pop(s)
+                if t == parent[s]:
+                    value, side = future.result()
+                else:
+                    future.cancel()
+                    t = parent[s]
+                    value, side = _solve(graph, s, t, engine)
+            else:
+                t = parent[s]
+                value, side = _solve(graph, s, t, engine)
+            weight[s] = value
+            for i in range(n):
+                if i != s and side[i] and parent[i] == t:
+                    parent[i] = s
+            if parent[t] >= 0 and side[parent[t]]:
+                parent[s] = parent[t]
+                parent[t] = s
+                weight[s], weight[t] = weight[t], value
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return GomoryHuTree(graph.keys, graph.index, parent, weight)
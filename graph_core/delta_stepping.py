@@ -0,0 +1,135 @@
+"""
+Параллельный поиск кратчайших путей из одной вершины методом delta-stepping на массивах CSR.
+"""
+import heapq
+import math
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# Фронт меньше этого числа вершин релаксируется в основном процессе: пересылка дороже самой работы
+PARALLEL_FRONTIER = 1024
+
+
+def default_delta(csr):
+    """Ширина корзины по умолчанию: наибольший вес дуги, делённый на среднюю степень вершины."""
+    m = len(csr.weights)
+    if not m:
+        return 1.0
+    return max(csr.weights) / max(m / max(csr.num_vertices, 1), 1)
+
+
+def _relax(offsets, targets, weights, dist, delta, vertices, light):
+    """
+    Запросы на улучшение (вершины, расстояния) по лёгким (вес <= delta) или тяжёлым дугам
+    из вершин vertices. dist только читается – применяет запросы основной процесс.
+    """
+    out_v, out_d = array('q'), array('d')
+    for u in vertices:
+        du = dist[u]
+        for i in range(offsets[u], offsets[u + 1]):
+            w = weights[i]
+            if (w <= delta) == light:
+                v = targets[i]
+                alt = du + w
+                if alt < dist[v]:
+                    out_v.append(v)
+                    out_d.append(alt)
+    return out_v, out_d
+
+
+_worker_state = None
+
+
+def _init_worker(offsets, targets, weights, dist_name, delta):
+    global _worker_state
+    shm = shared_memory.SharedMemory(dist_name)
+    # Отображение держим, пока жив процесс
+    _worker_state = (offsets, targets, weights, shm.buf.cast('d'), delta, shm)
+
+
+def _run_relax(task):
+    vertices, light = task
+    return _relax(*_worker_state[:5], vertices, light)
+
+
+def delta_stepping(csr, source, delta=None, processes=None):
+    """
+    Расстояния от вершины source (индекс CSR) до всех вершин (array('d'), inf – недостижима).
+    Вершины раскладываются по корзинам ширины delta (None – default_delta); корзины
+    обрабатываются по возрастанию, лёгкие дуги корзины релаксируются до её опустошения,
+    затем один раз – тяжёлые. Крупные фронты делятся между processes процессами
+    (None – по числу ядер, 1 – без пула), которые читают расстояния из общей памяти
+    и возвращают запросы на улучшение, а записывает их только основной процесс.
+    Расстояния совпадают с Дейкстрой бит в бит: оба дают минимум тех же сумм вдоль путей.
+    Веса должны быть неотрицательны.
+    На платформах без fork вызывать следует из-под if __name__ == '__main__'.
+    """
+    n = csr.num_vertices
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    if len(weights) and min(weights) < 0:
+        raise ValueError("delta-stepping requires non-negative weights")
+    if delta is None:
+        delta = default_delta(csr)
+    if not delta > 0:
+        raise ValueError("delta must be positive")
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    shm = pool = dist = None
+    try:
+        if processes > 1:
+            shm = shared_memory.SharedMemory(create=True, size=8 * max(n, 1))
+            dist = shm.buf.cast('d')
+            dist[:n] = array('d', [math.inf]) * n
+            pool = ProcessPoolExecutor(processes, initializer=_init_worker,
+                                       initargs=(offsets, targets, weights, shm.name, delta))
+        else:
+            dist = array('d', [math.inf]) * n
+        dist[source] = 0.0
+
+        buckets = {0: {source}}
+        order = [0]   # куча номеров непустых корзин
+
+        def relax(frontier, light):
+            if pool is None or len(frontier) < PARALLEL_FRONTIER:
+                results = [_relax(offsets, targets, weights, dist, delta, frontier, light)]
+            else:
+                chunks = [frontier[k::processes] for k in range(processes)]
+                results = pool.map(_run_relax, [(chunk, light) for chunk in chunks])
+            for vs, ds in results:
+                for v, d in zip(vs, ds):
+                    if d < dist[v]:
+                        dist[v] = d
+                        b = int(d // delta)
+                        bucket = buckets.get(b)
+                        if bucket is None:
+                            bucket = buckets[b] = set()
+                            heapq.heappush(order, b)
+                        bucket.add(v)
+
+        while order:
+            b = heapq.heappop(order)
+            settled = set()
+            while True:
+                bucket = buckets.pop(b, None)
+                if not bucket:
+                    break
+                # Вершина могла перейти в меньшую корзину – тогда здесь её запись устарела
+                frontier = array('q', (v for v in bucket if int(dist[v] // delta) == b))
+                settled.update(frontier)
+                relax(frontier, True)
+            if settled:
+                relax(array('q', settled), False)
+        return array('d', bytes(dist[:n]))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if shm is not None:
+            try:
+                if isinstance(dist, memoryview):
+                    dist.release()
+                shm.close()
+            finally:
+                shm.unlink()   # блок общей памяти освобождается, даже если закрыть его не удалось
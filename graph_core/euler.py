@@ -0,0 +1,54 @@
+from array import array
+
+from .traversal import is_connected
+
+
+def all_degrees_even(graph):
+    degrees = [0] * graph.num_vertices
+    for e in range(graph.num_edges):
+        degrees[graph.tail[e]] += 1
+        degrees[graph.head[e]] += 1
+    return all(degree % 2 == 0 for degree in degrees)
+
+
+def find_eulerian_cycle_edges(graph):
+    """
+    Ищет Эйлеров цикл алгоритмом Хирхольцера.
+    Возвращает список ключей рёбер в порядке обхода или None, если цикла нет.
+    """
+    if not is_connected(graph) or not all_degrees_even(graph):
+        return None
+
+    csr = graph.csr()
+    offsets, targets, edge_ids = csr.offsets, csr.targets, csr.edge_ids
+    # ptr[u] – следующая непросмотренная позиция в строке u (копия: у CSR из снимка offsets
+    # только для чтения); used – пройденные рёбра
+    ptr = array('q', offsets[:-1])
+    used = bytearray(graph.num_edges)
+
+    # Рядом со стеком вершин храним ребро, по которому в неё пришли:
+    # при снятии вершины со стека ребро занимает своё место в цикле
+    stack = [0]
+    via = [-1]
+    edge_order = []
+
+    while stack:
+        current = stack[-1]
+        i, end = ptr[current], offsets[current + 1]
+        while i < end and used[edge_ids[i]]:
+            i += 1
+        ptr[current] = i
+        if i < end:
+            edge = edge_ids[i]
+            used[edge] = 1
+            stack.append(targets[i])
+            via.append(edge)
+        else:
+            stack.pop()
+            edge = via.pop()
+            if edge != -1:
+                edge_order.append(edge)
+
+    if len(edge_order) != graph.num_edges:
+        return None
+    return [graph.edge_keys[e] for e in reversed(edge_order)]
@@ -0,0 +1,549 @@
+from array import array
+from collections import deque
+
+
+class ResidualNetwork:
+    """
+    Остаточная сеть в плоских массивах. Ребро e графа даёт дугу 2e (tail -> head, ёмкость – вес)
+    и обратную ей дугу 2e + 1 (ёмкость 0, а в неориентированном графе – тот же вес),
+    так что парная дуга – a ^ 1, а кратные рёбра остаются отдельными дугами. head, cap и flow индексируются номером дуги,
+    flow[a ^ 1] == -flow[a]; arcs[offsets[u]:offsets[u + 1]] – дуги, выходящие из u.
+    """
+
+    __slots__ = ('num_vertices', 'offsets', 'arcs', 'head', 'cap', 'flow')
+
+    def __init__(self, graph):
+        n, m = graph.num_vertices, graph.num_edges
+        weight = graph.weight
+        typecode = weight.typecode if isinstance(weight, array) else weight.format
+        self.num_vertices = n
+        self.head = head = array('q', bytes(16 * m))
+        self.cap = cap = array(typecode, bytes(2 * m * weight.itemsize))
+        self.flow = array(typecode, bytes(2 * m * weight.itemsize))
+        for e in range(m):
+            head[2 * e], head[2 * e + 1] = graph.head[e], graph.tail[e]
+            cap[2 * e] = weight[e]
+            if not graph.directed:
+                cap[2 * e + 1] = weight[e]
+        self._index_arcs()
+
+    def _index_arcs(self):
+        """Строит offsets и arcs – дуги, сгруппированные по хвосту; O(V + E)."""
+        n, head = self.num_vertices, self.head
+        self.offsets = offsets = array('q', bytes(8 * (n + 1)))
+        for v in head:
+            offsets[v + 1] += 1   # head[a ^ 1] – хвост дуги a, и каждая вершина head – хвост парной дуги
+        for u in range(n):
+            offsets[u + 1] += offsets[u]
+        fill = array('q', offsets[:n])
+        self.arcs = arcs = array('q', bytes(8 * len(head)))
+        for a in range(len(head)):
+            u = head[a ^ 1]
+            arcs[fill[u]] = a
+            fill[u] += 1
+
+    def add_vertex(self):
+        """Добавляет изолированную вершину и возвращает её номер."""
+        self.num_vertices += 1
+        self.offsets.append(self.offsets[-1])
+        return self.num_vertices - 1
+
+    def add_edge(self, u, v, capacity, reverse_capacity=0):
+        """
+        Добавляет ребро u -> v с нулевым потоком (дуги 2e и 2e + 1) и возвращает его номер e.
+        Поток остальных рёбер сохраняется; arcs и offsets перестраиваются за O(V + E).
+        """
+        e = len(self.head) >> 1
+        self.head.extend((v, u))
+        self.cap.extend((capacity, reverse_capacity))
+        self.flow.extend((0, 0))
+        self._index_arcs()
+        return e
+
+    def tail(self, a):
+        return self.head[a ^ 1]
+
+    def residual(self, a):
+        return self.cap[a] - self.flow[a]
+
+    def push(self, a, f):
+        """Пропускает f единиц потока по дуге a (по обратной дуге – отменяет поток ребра)."""
+        self.flow[a] += f
+        self.flow[a ^ 1] -= f
+
+    def augment(self, path, f):
+        """Увеличивает поток на f вдоль пути – списка номеров дуг; O(длина пути)."""
+        flow = self.flow
+        for a in path:
+            flow[a] += f
+            flow[a ^ 1] -= f
+
+    def edge_flows(self):
+        """Поток по каждому ребру графа (массив, индекс – номер ребра)."""
+        return self.flow[0::2]
+
+    def source_side(self, s):
+        """Вершины, достижимые из s по дугам с остаточной ёмкостью (bytearray-маска)."""
+        offsets, arcs, head, cap, flow = self.offsets, self.arcs, self.head, self.cap, self.flow
+        side = bytearray(self.num_vertices)
+        side[s] = 1
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            for i in range(offsets[u], offsets[u + 1]):
+                a = arcs[i]
+                v = head[a]
+                if not side[v] and cap[a] > flow[a]:
+                    side[v] = 1
+                    queue.append(v)
+        return side
+
+    def outflow(self, u):
+        """Чистый поток, вытекающий из вершины u."""
+        flow, arcs = self.flow, self.arcs
+        return sum(flow[arcs[i]] for i in range(self.offsets[u], self.offsets[u + 1]))
+
+
+def edmonds_karp(graph, source, sink):
+    """
+    Алгоритм Форда-Фалкерсона с поиском увеличивающих путей в ширину (Эдмондс–Карп).
+    Рёбра графа ориентированы, вес ребра – его пропускная способность.
+    Возвращает список шагов для анимации:
+    ('path', [(u, v), ...], поток по пути), ('update', ключ ребра, новый поток), ('done', максимальный поток).
+    Вершины в шагах – ключи графа.
+    """
+    return list(edmonds_karp_steps(graph, source, sink))
+
+
+def edmonds_karp_steps(graph, source, sink, net=None):
+    """
+    Те же шаги, что у edmonds_karp, но генератором: следующий увеличивающий путь ищется,
+    только когда запрошен очередной шаг, и шаги не накапливаются в памяти.
+    Если передана сеть net (ResidualNetwork графа), поток достраивается в ней, начиная с уже
+    имеющегося, и 'done' сообщает итоговую величину; после него по net можно получить
+    минимальный разрез (cuts.residual_min_cut).
+    """
+    if net is None:
+        net = ResidualNetwork(graph)
+    return _edmonds_karp_steps(net, graph.index[source], graph.index[sink], graph.keys, graph.edge_keys)
+
+
+def _edmonds_karp_steps(net, s, t, keys, edge_keys):
+    """Шаги edmonds_karp_steps по сети net; вершины s, t – индексы, keys и edge_keys – их ключи."""
+    n = net.num_vertices
+    head, cap, flow = net.head, net.cap, net.flow
+    # Неизменные при поиске дуги по вершинам, концы и ёмкости – в списках: так обход быстрее
+    out_arcs = [net.arcs[net.offsets[u]:net.offsets[u + 1]].tolist() for u in range(n)]
+    head_of, cap_of = head.tolist(), cap.tolist()
+
+    max_flow = net.outflow(s) if s != t else 0
+    while s != t:
+        queue = deque()
+        queue.append(s)
+        parent = [-1] * n   # дуга, по которой вершина достигнута
+        parent[s] = -2
+
+        found = False
+        while queue and not found:
+            u = queue.popleft()
+            for a in out_arcs[u]:
+                v = head_of[a]
+                if parent[v] == -1 and cap_of[a] > flow[a]:
+                    parent[v] = a
+                    if v == t:
+                        found = True
+                        break
+                    queue.append(v)
+
+        if not found:
+            break
+
+        path = []
+        v = t
+        while v != s:
+            a = parent[v]
+            path.append(a)
+            v = head[a ^ 1]
+        path.reverse()
+        path_flow = min(cap[a] - flow[a] for a in path)
+
+        yield 'path', [(keys[head[a ^ 1]], keys[head[a]]) for a in path], path_flow
+
+        net.augment(path, path_flow)
+        for a in path:
+            e = a >> 1
+            yield 'update', edge_keys[e], flow[2 * e]
+
+        max_flow += path_flow
+
+    yield 'done', max_flow
+
+
+GLOBAL_RELABEL_FREQ = 1   # глобальная переразметка после стольких V операций relabel
+
+
+def dinic(graph, source, sink):
+    """
+    Алгоритм Диница: слоистая сеть поиском в ширину, затем блокирующий поток поиском в глубину
+    с указателями текущей дуги, чтобы тупиковые дуги не просматривались повторно.
+    Возвращает (максимальный поток, массив потоков по рёбрам графа).
+    """
+    net = ResidualNetwork(graph)
+    total = _dinic(net, graph.index[source], graph.index[sink])
+    return total, net.edge_flows()
+
+
+def _dinic(net, s, t):
+    """Дополняет текущий поток сети net до максимального; возвращает добавленную величину."""
+    n = net.num_vertices
+    offsets, arcs, head, cap, flow = net.offsets, net.arcs, net.head, net.cap, net.flow
+    total = 0
+    while s != t:
+        level = [-1] * n
+        level[s] = 0
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            for i in range(offsets[u], offsets[u + 1]):
+                a = arcs[i]
+                v = head[a]
+                if level[v] < 0 and cap[a] - flow[a] > 0:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        if level[t] < 0:
+            break
+        current = array('q', offsets)
+        path = []   # дуги от s до u
+        u = s
+        while True:
+            if u == t:
+                # Первая дуга с наименьшим остатком – узкое место; после проталкивания она насыщена.
+                # Её номер запоминаем сразу: с дробными ёмкостями cap == flow после сложения
+                # может не выполниться ни для одной дуги
+                k = 0
+                f = cap[path[0]] - flow[path[0]]
+                for j in range(1, len(path)):
+                    r = cap[path[j]] - flow[path[j]]
+                    if r < f:
+                        k, f = j, r
+                net.augment(path, f)
+                total += f
+                # Откатываемся к хвосту узкого места
+                del path[k:]
+                u = head[path[-1]] if path else s
+                continue
+            i, end = current[u], offsets[u + 1]
+            while i < end:
+                a = arcs[i]
+                if cap[a] - flow[a] > 0 and level[head[a]] == level[u] + 1:
+                    break
+                i += 1
+            current[u] = i
+            if i < end:
+                path.append(a)
+                u = head[a]
+            else:
+                level[u] = -1   # тупик в этой фазе
+                if not path:
+                    break
+                u = head[path.pop() ^ 1]
+                current[u] += 1
+    return total
+
+
+def push_relabel(graph, source, sink):
+    """
+    Алгоритм проталкивания предпотока с выбором активной вершины наибольшей высоты,
+    эвристикой разрыва (вершины выше опустевшего уровня < V не достигают стока и поднимаются до V)
+    и периодической глобальной переразметкой – поиском в ширину от стока (и от истока для остальных).
+    Возвращает (максимальный поток, массив потоков по рёбрам графа).
+    """
+    net = ResidualNetwork(graph)
+    total = _push_relabel(net, graph.index[source], graph.index[sink])
+    return total, net.edge_flows()
+
+
+def _push_relabel(net, s, t):
+    """Дополняет текущий поток сети net до максимального; возвращает добавленную величину."""
+    n = net.num_vertices
+    offsets, arcs, head, cap, flow = net.offsets, net.arcs, net.head, net.cap, net.flow
+    if s == t:
+        return 0
+    top_height = 2 * n
+    height = [0] * n
+    excess = [0] * n
+    count = [0] * (top_height + 1)
+    buckets = [[] for _ in range(top_height + 1)]
+    current = array('q', offsets[:n])
+    before = -net.outflow(t)
+
+    excess[t] = before
+    for i in range(offsets[s], offsets[s + 1]):
+        a = arcs[i]
+        c = cap[a] - flow[a]
+        if c > 0:
+            flow[a] += c
+            flow[a ^ 1] -= c
+            excess[head[a]] += c
+            excess[s] -= c
+
+    def global_relabel():
+        """Точные высоты: расстояние до стока в остаточной сети, иначе V + расстояние до истока."""
+        for h in range(top_height + 1):
+            count[h] = 0
+            buckets[h].clear()
+        for u in range(n):
+            height[u] = top_height
+        for root, base in ((t, 0), (s, n)):
+            height[root] = base
+            queue = deque([root])
+            while queue:
+                v = queue.popleft()
+                for i in range(offsets[v], offsets[v + 1]):
+                    b = arcs[i] ^ 1
+                    u = head[b ^ 1]
+                    if height[u] == top_height and cap[b] - flow[b] > 0 and u != s and u != t:
+                        height[u] = height[v] + 1
+                        queue.append(u)
+        top = 0
+        for u in range(n):
+            count[height[u]] += 1
+            current[u] = offsets[u]
+            if excess[u] > 0 and u != t and u != s:
+                buckets[height[u]].append(u)
+                top = max(top, height[u])
+        return top
+
+    top = global_relabel()
+    relabels = 0
+    while top >= 0:
+        bucket = buckets[top]
+        if not bucket:
+            top -= 1
+            continue
+        u = bucket.pop()
+        if height[u] != top or excess[u] <= 0:
+            continue   # устаревшая запись
+        end = offsets[u + 1]
+        while excess[u] > 0:
+            i = current[u]
+            if i == end:
+                relabels += 1
+                old = height[u]
+                new = top_height
+                for j in range(offsets[u], end):
+                    a = arcs[j]
+                    if cap[a] - flow[a] > 0 and height[head[a]] + 1 < new:
+                        new = height[head[a]] + 1
+                count[old] -= 1
+                if old < n and not count[old]:
+                    for v in range(n):
+                        if old < height[v] < n:
+                            count[height[v]] -= 1
+                            height[v] = n
+                            count[n] += 1
+                            if excess[v] > 0 and v != t:
+                                buckets[n].append(v)
+                    new = max(new, n)
+                    top = max(top, n)
+                height[u] = new
+                count[new] += 1
+                current[u] = offsets[u]
+                if new >= top_height:
+                    break
+                continue
+            a = arcs[i]
+            v = head[a]
+            r = cap[a] - flow[a]
+            if r > 0 and height[u] == height[v] + 1:
+                d = min(excess[u], r)
+                flow[a] += d
+                flow[a ^ 1] -= d
+                excess[u] -= d
+                if not excess[v] and v != s and v != t:
+                    buckets[height[v]].append(v)
+                excess[v] += d
+            else:
+                current[u] = i + 1
+        top = max(top, height[u])
+        if relabels >= GLOBAL_RELABEL_FREQ * n:
+            relabels = 0
+            top = global_relabel()
+    return excess[t] - before
+
+
+def _route(net, x, y, limit):
+    """
+    Пропускает до limit единиц потока из x в y по кратчайшим остаточным путям.
+    Возвращает, сколько удалось пропустить.
+    """
+    if x == y:
+        return limit   # петля: снятый с неё поток перенаправлять некуда и не нужно
+    n = net.num_vertices
+    offsets, arcs, head, cap, flow = net.offsets, net.arcs, net.head, net.cap, net.flow
+    routed = 0
+    while routed < limit:
+        parent = [-1] * n
+        parent[x] = -2
+        queue = deque([x])
+        while queue and parent[y] == -1:
+            u = queue.popleft()
+            for i in range(offsets[u], offsets[u + 1]):
+                a = arcs[i]
+                v = head[a]
+                if parent[v] == -1 and cap[a] > flow[a]:
+                    parent[v] = a
+                    queue.append(v)
+        if parent[y] == -1:
+            break
+        path = []
+        v = y
+        while v != x:
+            path.append(parent[v])
+            v = head[parent[v] ^ 1]
+        f = min(limit - routed, min(cap[a] - flow[a] for a in path))
+        net.augment(path, f)
+        routed += f
+    return routed
+
+
+class IncrementalMaxFlow:
+    """
+    Максимальный поток, который сохраняется между правками сети.
+    Увеличение ёмкости или новое ребро лишь дополняют текущий поток новыми увеличивающими путями.
+    При уменьшении ниже текущего потока (и при удалении ребра) лишний поток ребра сначала
+    перенаправляется в обход ребра, а остаток отменяется: возвращается от хвоста ребра к истоку
+    и от стока к его голове; после этого поток снова дополняется до максимального.
+    Вершины и рёбра задаются ключами графа (graph.keys, graph.edge_keys).
+    С solve=False правки только восстанавливают допустимый поток, а дополнить его можно
+    позже – solve() или по шагам анимации steps().
+    """
+
+    def __init__(self, graph, source, sink, engine='dinic', solve=True):
+        self.net = ResidualNetwork(graph)
+        self.directed = graph.directed
+        self.keys = list(graph.keys)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.source, self.sink = self.index[source], self.index[sink]
+        self.edge_keys = list(graph.edge_keys)
+        self.edge_index = {key: e for e, key in enumerate(self.edge_keys)}
+        self.solver = residual_solver(engine)
+        self.value = 0
+        if solve:
+            self.solve()
+
+    def solve(self):
+        """Дополняет текущий поток до максимального; возвращает величину потока."""
+        self.value += self.solver(self.net, self.source, self.sink)
+        return self.value
+
+    def steps(self):
+        """
+        Дополняет поток до максимального алгоритмом Эдмондса–Карпа, выдавая шаги анимации
+        в формате edmonds_karp_steps; величина в 'done' – итоговый поток.
+        """
+        for step in _edmonds_karp_steps(self.net, self.source, self.sink, self.keys, self.edge_keys):
+            if step[0] == 'done':
+                self.value = step[1]
+            yield step
+
+    def capacity(self, key):
+        return self.net.cap[2 * self.edge_index[key]]
+
+    def add_vertex(self, key):
+        """Добавляет изолированную вершину с ключом key."""
+        if key not in self.index:
+            self.index[key] = self.net.add_vertex()
+            self.keys.append(key)
+
+    def add_edge(self, key, u, v, capacity, solve=True):
+        """
+        Добавляет ребро u–v (ключи вершин) с ключом key; перестройка индекса дуг – O(V + E),
+        поток остальных рёбер сохраняется. Возвращает величину потока.
+        """
+        e = self.net.add_edge(self.index[u], self.index[v], capacity, 0 if self.directed else capacity)
+        self.edge_keys.append(key)
+        self.edge_index[key] = e
+        return self.solve() if solve else self.value
+
+    def remove_edge(self, key, solve=True):
+        """Удаляет ребро: его ёмкость становится нулевой, а поток перенаправляется или отменяется."""
+        return self.set_capacity(key, 0, solve)
+
+    def set_capacity(self, key, capacity, solve=True):
+        """
+        Меняет пропускную способность ребра и возвращает новую величину максимального потока
+        (с solve=False – величину допустимого потока после снятия лишнего).
+        В неориентированном графе ёмкость получают обе дуги ребра, и лишний поток
+        снимается с той из них, по которой он идёт.
+        """
+        e = self.edge_index[key]
+        net = self.net
+        a = 2 * e
+        net.cap[a] = capacity
+        if not self.directed:
+            net.cap[a ^ 1] = capacity
+        for b in (a, a ^ 1):
+            surplus = net.flow[b] - net.cap[b]
+            if surplus > 0:
+                net.push(b, -surplus)
+                u, v = net.head[b ^ 1], net.head[b]
+                surplus -= _route(net, u, v, surplus)
+                if surplus > 0:
+                    if u != self.source:
+                        _route(net, u, self.source, surplus)
+                    if v != self.sink:
+                        _route(net, self.sink, v, surplus)
+                    self.value -= surplus
+        return self.solve() if solve else self.value
+
+    def edge_flows(self):
+        return self.net.edge_flows()
+
+    def flow(self, key):
+        """Поток по ребру с ключом key."""
+        return self.net.flow[2 * self.edge_index[key]]
+
+    def source_side(self):
+        """Ключи вершин доли истока минимального разреза (после solve или завершения steps)."""
+        side = self.net.source_side(self.source)
+        return {key for i, key in enumerate(self.keys) if side[i]}
+
+
+MAX_FLOW_ENGINES = {
+    'dinic': dinic,
+    'push_relabel': push_relabel,
+}
+
+# Те же алгоритмы в виде, дополняющем поток уже построенной ResidualNetwork
+RESIDUAL_SOLVERS = {
+    'dinic': _dinic,
+    'push_relabel': _push_relabel,
+}
+
+
+def residual_solver(engine):
+    """Функция engine(net, s, t) из RESIDUAL_SOLVERS; неизвестное имя – ValueError."""
+    try:
+        return RESIDUAL_SOLVERS[engine]
+    except KeyError:
+        raise ValueError(f"unknown engine {engine!r}") from None
+
+
+def max_flow(graph, source, sink, engine='dinic'):
+    """
+    Максимальный поток из source в sink выбранным алгоритмом: 'dinic', 'push_relabel'
+    или 'edmonds_karp' (эталонная реализация, по которой строится анимация).
+    Возвращает (величина потока, список потоков по рёбрам графа).
+    """
+    if engine == 'edmonds_karp':
+        flows = [0] * graph.num_edges
+        edge_of = {key: e for e, key in enumerate(graph.edge_keys)}
+        for step in edmonds_karp_steps(graph, source, sink):
+            if step[0] == 'update':
+                flows[edge_of[step[1]]] = step[2]
+            elif step[0] == 'done':
+                return step[1], flows
+    if engine not in MAX_FLOW_ENGINES:
+        raise ValueError(f"unknown engine {engine!r}")
+    return MAX_FLOW_ENGINES[engine](graph, source, sink)
@@ -0,0 +1,169 @@
+from array import array
+
+from .csr import CSR
+
+
+class RangeIndex:
+    """Отображение ключ -> индекс для вершин с ключами first, first + 1, ... без словаря в памяти."""
+
+    __slots__ = ('first', 'n')
+
+    def __init__(self, first, n):
+        self.first = first
+        self.n = n
+
+    def __len__(self):
+        return self.n
+
+    def __contains__(self, key):
+        return type(key) is int and 0 <= key - self.first < self.n
+
+    def get(self, key, default=None):
+        return key - self.first if key in self else default
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return key - self.first
+
+
+class Graph:
+    """
+    Компактная модель графа, не зависящая от tkinter.
+    Вершины нумеруются подряд с нуля; исходный ключ вершины (например, id овала на холсте)
+    хранится в self.keys. Рёбра лежат в плоских массивах tail/head/weight,
+    ключ ребра (например, id линии) – в self.edge_keys.
+    Пока ключи совпадают с номерами (вершины first, first + 1, ...; рёбра 0, 1, ...),
+    вместо списков и словаря хранятся range и RangeIndex, что важно для графов из файлов.
+    У графа, открытого из снимка (graph_core.snapshot), массивы – memoryview поверх файла.
+    """
+
+    def __init__(self, directed=False, weight_type='d'):
+        self.directed = directed
+        self.keys = []        # индекс вершины -> ключ
+        self.index = {}       # ключ -> индекс вершины
+        self.tail = array('q')
+        self.head = array('q')
+        self.weight = array(weight_type)
+        self.edge_keys = range(0)   # индекс ребра -> ключ
+        # Номер версии растёт при каждом изменении; по нему инвалидируются производные структуры (CSR и т. п.)
+        self.version = 0
+        self._cache = {}
+        self._cache_version = 0
+
+    @classmethod
+    def from_edges(cls, vertices, edges, directed=False, weight_type='d'):
+        """
+        Строит граф по списку вершин и рёбер.
+        Каждое ребро – кортеж (ключ, u, v) или (ключ, u, v, вес).
+        """
+        graph = cls(directed, weight_type)
+        for key in vertices:
+            graph.add_vertex(key)
+        for edge in edges:
+            if len(edge) > 3:
+                graph.add_edge(edge[1], edge[2], edge[3], key=edge[0])
+            else:
+                graph.add_edge(edge[1], edge[2], key=edge[0])
+        return graph
+
+    @property
+    def num_vertices(self):
+        return len(self.keys)
+
+    @property
+    def num_edges(self):
+        return len(self.tail)
+
+    def add_vertex(self, key=None):
+        """Добавляет вершину и возвращает её индекс. Для уже известного ключа возвращает прежний индекс."""
+        if key is None:
+            key = len(self.keys)
+        i = self.index.get(key)
+        if i is None:
+            if not isinstance(self.keys, list):
+                self.keys = list(self.keys)
+                self.index = {k: j for j, k in enumerate(self.keys)}
+            i = len(self.keys)
+            self.keys.append(key)
+            self.index[key] = i
+            self.version += 1
+        return i
+
+    def add_edge(self, u, v, weight=1, key=None):
+        """Добавляет ребро между вершинами с ключами u и v и возвращает индекс ребра."""
+        self._make_writable()
+        e = len(self.tail)
+        self.tail.append(self.add_vertex(u))
+        self.head.append(self.add_vertex(v))
+        self.weight.append(weight)
+        if key is None and isinstance(self.edge_keys, range):
+            self.edge_keys = range(e + 1)
+        else:
+            if not isinstance(self.edge_keys, list):
+                self.edge_keys = list(self.edge_keys)
+            self.edge_keys.append(e if key is None else key)
+        self.version += 1
+        return e
+
+    def add_vertices(self, n, first=0):
+        """
+        Добавляет вершины с ключами first, ..., first + n - 1 (если в графе ещё нет вершин –
+        без построения словаря). Возвращает индекс первой из них.
+        """
+        start = len(self.keys)
+        if not start:
+            self.keys = range(first, first + n)
+            self.index = RangeIndex(first, n)
+            self.version += 1
+        else:
+            for key in range(first, first + n):
+                self.add_vertex(key)
+        return start
+
+    def extend_edges(self, tail, head, weight):
+        """
+        Массово добавляет рёбра, заданные индексами концов (а не ключами), например при чтении файла.
+        Ключами новых рёбер становятся их индексы.
+        """
+        self._make_writable()
+        e = len(self.tail)
+        self.tail.extend(tail)
+        self.head.extend(head)
+        self.weight.extend(weight)
+        if isinstance(self.edge_keys, range):
+            self.edge_keys = range(len(self.tail))
+        else:
+            if not isinstance(self.edge_keys, list):
+                self.edge_keys = list(self.edge_keys)
+            self.edge_keys.extend(range(e, len(self.tail)))
+        self.version += 1
+
+    def _make_writable(self):
+        """Копирует в память массивы рёбер, отображённые из файла снимка (memoryview), перед изменением."""
+        if isinstance(self.tail, memoryview):
+            self.tail, self.head, self.weight = (
+                array(a.format, a.tobytes()) for a in (self.tail, self.head, self.weight))
+
+    def cached(self, name, build):
+        """
+        Возвращает производную структуру name, построенную вызовом build(),
+        и переиспользует её до следующего изменения графа.
+        """
+        if self._cache_version != self.version:
+            self._cache.clear()
+            self._cache_version = self.version
+        value = self._cache.get(name)
+        if value is None:
+            value = self._cache[name] = build()
+        return value
+
+    def csr(self):
+        """Возвращает CSR-представление графа. Оно строится один раз и переиспользуется до изменения графа."""
+        return self.cached('csr', lambda: CSR.from_graph(self))
+
+    def reverse_csr(self):
+        """CSR входящих дуг. Для неориентированного графа совпадает с csr()."""
+        if not self.directed:
+            return self.csr()
+        return self.cached('reverse_csr', lambda: self.csr().transpose())
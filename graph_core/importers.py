@@ -0,0 +1,158 @@
+import mmap
+import os
+from array import array
+
+from .graph import Graph
+from .snapshot import SNAPSHOT_EXT, load_snapshot
+
+CHUNK_SIZE = 1 << 24   # размер порции файла, разбираемой за раз (байт)
+
+
+def iter_line_chunks(path, chunk_size=CHUNK_SIZE):
+    """
+    Читает файл через mmap порциями примерно по chunk_size байт, разрезая только по концам строк.
+    Выдаёт списки строк (bytes), поэтому в памяти одновременно находится лишь одна порция.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while pos < size:
+                end = mm.find(b'\n', min(pos + chunk_size, size) - 1)
+                end = size if end < 0 else end + 1
+                yield mm[pos:end].splitlines()
+                pos = end
+
+
+def _number(weight_type):
+    return float if weight_type in 'fd' else int
+
+
+def read_edge_list(path, directed=False, weight_type='d', chunk_size=CHUNK_SIZE):
+    """
+    Читает список рёбер: в каждой строке «u v [вес]», строки с # или % – комментарии.
+    Ключи вершин – числа из файла, ребро без веса получает вес 1.
+    """
+    graph = Graph(directed, weight_type)
+    number = _number(weight_type)
+    index = {}
+    keys = []
+    for lines in iter_line_chunks(path, chunk_size):
+        tail, head, weight = array('q'), array('q'), array(weight_type)
+        for line in lines:
+            parts = line.split()
+            if not parts or parts[0][:1] in (b'#', b'%'):
+                continue
+            for part, out in ((parts[0], tail), (parts[1], head)):
+                key = int(part)
+                i = index.get(key)
+                if i is None:
+                    i = index[key] = len(keys)
+                    keys.append(key)
+                out.append(i)
+            weight.append(number(parts[2]) if len(parts) > 2 else 1)
+        graph.extend_edges(tail, head, weight)
+    graph.keys = keys
+    graph.index = index
+    return graph
+
+
+def read_dimacs(path, weight_type='q', chunk_size=CHUNK_SIZE):
+    """
+    Читает граф в формате DIMACS: задачи кратчайших путей (.gr, «p sp n m») и максимального
+    потока (.max, «p max n m»). Дуги «a u v w» ориентированы, вершины нумеруются с 1.
+    Возвращает (graph, source, sink); для задачи кратчайших путей source и sink равны None.
+    Строки «a» и «n» до строки «p» и номера вершин вне 1..n дают ValueError с номером строки.
+    """
+    graph = Graph(directed=True, weight_type=weight_type)
+    number = _number(weight_type)
+    source = sink = None
+    n = None
+    lineno = 0
+
+    def vertex(part):
+        """Номер вершины с 1 из строки lineno; вне 1..n – ValueError."""
+        u = int(part)
+        if not 1 <= u <= n:
+            raise ValueError(f"line {lineno}: vertex {u} is outside 1..{n}")
+        return u
+
+    for lines in iter_line_chunks(path, chunk_size):
+        tail, head, weight = array('q'), array('q'), array(weight_type)
+        for line in lines:
+            lineno += 1
+            parts = line.split()
+            if not parts:
+                continue
+            tag = parts[0]
+            if tag in (b'a', b'n') and n is None:
+                raise ValueError(f"line {lineno}: '{tag.decode()}' line before the 'p' line")
+            if tag == b'a':
+                tail.append(vertex(parts[1]) - 1)
+                head.append(vertex(parts[2]) - 1)
+                weight.append(number(parts[3]) if len(parts) > 3 else 1)
+            elif tag == b'p':
+                if n is not None:
+                    raise ValueError(f"line {lineno}: duplicate 'p' line")
+                n = int(parts[2])
+                graph.add_vertices(n, first=1)
+            elif tag == b'n':
+                if parts[2] == b's':
+                    source = vertex(parts[1])
+                elif parts[2] == b't':
+                    sink = vertex(parts[1])
+        graph.extend_edges(tail, head, weight)
+    return graph, source, sink
+
+
+def read_matrix_market(path, weight_type='d', chunk_size=CHUNK_SIZE):
+    """
+    Читает разреженную матрицу смежности в формате MatrixMarket (coordinate).
+    Симметричная матрица даёт неориентированный граф, general – ориентированный;
+    для pattern все веса равны 1. Ключи вершин – номера строк/столбцов с 1.
+    """
+    number = _number(weight_type)
+    graph = None
+    for lines in iter_line_chunks(path, chunk_size):
+        tail, head, weight = array('q'), array('q'), array(weight_type)
+        for line in lines:
+            if line[:2] == b'%%':
+                header = line.lower().split()
+                if b'coordinate' not in header:
+                    raise ValueError("only coordinate MatrixMarket files are supported")
+                symmetric = b'symmetric' in header
+                graph = Graph(directed=not symmetric, weight_type=weight_type)
+                continue
+            parts = line.split()
+            if not parts or parts[0][:1] == b'%':
+                continue
+            if graph is None:
+                raise ValueError("missing %%MatrixMarket header")
+            if not graph.num_vertices:
+                graph.add_vertices(max(int(parts[0]), int(parts[1])), first=1)
+                continue
+            tail.append(int(parts[0]) - 1)
+            head.append(int(parts[1]) - 1)
+            weight.append(number(parts[2]) if len(parts) > 2 else 1)
+        if graph is not None:
+            graph.extend_edges(tail, head, weight)
+    if graph is None:
+        raise ValueError("missing %%MatrixMarket header")
+    return graph
+
+
+def read_graph(path, directed=False, weight_type=None, chunk_size=CHUNK_SIZE):
+    """
+    Читает граф, выбирая формат по расширению: .gr/.max/.dimacs – DIMACS, .mtx – MatrixMarket,
+    .gcs – двоичный снимок, остальное – список рёбер (directed относится только к нему).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == SNAPSHOT_EXT:
+        return load_snapshot(path)[0]
+    if ext in ('.gr', '.max', '.dimacs'):
+        return read_dimacs(path, weight_type or 'q', chunk_size)[0]
+    if ext == '.mtx':
+        return read_matrix_market(path, weight_type or 'd', chunk_size)
+    return read_edge_list(path, directed, weight_type or 'd', chunk_size)
@@ -0,0 +1,150 @@
+"""
+Таблица расстояний между набором источников и набором целей (many-to-many).
+"""
+import heapq
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from .ch import contraction_hierarchy
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - зависит от окружения
+    np = None
+
+
+def _dijkstra_row(offsets, targets, weights, target_pos, s, width):
+    """
+    Поиск Дейкстры из s, который останавливается, как только обработаны все цели.
+    target_pos – словарь вершина -> список столбцов (одна вершина может встречаться среди целей дважды).
+    """
+    row = [math.inf] * width
+    remaining = len(target_pos)
+    dist = {s: 0}
+    pq = [(0, s)]
+    while pq and remaining:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]:
+            continue
+        columns = target_pos.get(u)
+        if columns is not None:
+            for j in columns:
+                row[j] = d
+            remaining -= 1
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            alt = d + weights[i]
+            if alt < dist.get(v, math.inf):
+                dist[v] = alt
+                heapq.heappush(pq, (alt, v))
+    return row
+
+
+def _upward(offsets, targets, weights, s):
+    """Всё пространство поиска вверх по иерархии из s: словарь вершина -> расстояние."""
+    dist = {s: 0}
+    pq = [(0, s)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]:
+            continue
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            alt = d + weights[i]
+            if alt < dist.get(v, math.inf):
+                dist[v] = alt
+                heapq.heappush(pq, (alt, v))
+    return dist
+
+
+def _bucket_row(up, buckets, s, width):
+    """Строка таблицы по иерархии: поиск вверх из s и просмотр корзин встреченных вершин."""
+    row = [math.inf] * width
+    for v, d in _upward(*up, s).items():
+        for j, dt in buckets.get(v, ()):
+            if d + dt < row[j]:
+                row[j] = d + dt
+    return row
+
+
+def _rows(state, sources):
+    kind, data, width = state
+    if kind == 'ch':
+        up, buckets = data
+        return [_bucket_row(up, buckets, s, width) for s in sources]
+    offsets, targets, weights, target_pos = data
+    return [_dijkstra_row(offsets, targets, weights, target_pos, s, width) for s in sources]
+
+
+_worker_state = None
+
+
+def _init_worker(state):
+    global _worker_state
+    _worker_state = state
+
+
+def _run_rows(sources):
+    return _rows(_worker_state, sources)
+
+
+def distance_matrix(graph, sources, targets, hierarchy=None, executor=None, workers=None,
+                    batch_size=16):
+    """
+    Матрица кратчайших расстояний len(sources) x len(targets) (numpy float64, inf – пути нет);
+    sources и targets – ключи вершин.
+    Без иерархии выполняется по одному поиску Дейкстры на источник, и каждый поиск
+    останавливается, как только обработаны все цели.
+    С иерархией сжатия (hierarchy – ContractionHierarchy или True, чтобы построить и закэшировать
+    её в графе) используется поиск с корзинами: поиски вверх от всех целей раскладывают
+    расстояния по корзинам вершин, после чего поиск вверх от источника лишь просматривает корзины.
+    executor – None (в текущем потоке), 'thread' или 'process'; workers – размер пула
+    (None – по числу ядер). Источники раздаются пулу пачками по batch_size.
+    """
+    if np is None:
+        raise ImportError("distance_matrix requires NumPy")
+    width = len(targets)
+    if hierarchy is True:
+        hierarchy = contraction_hierarchy(graph)
+
+    if hierarchy is not None:
+        h_index = hierarchy.index
+        src = [h_index[key] for key in sources]
+        down = (hierarchy.down_offsets, hierarchy.down_targets, hierarchy.down_weights)
+        buckets = {}
+        for j, key in enumerate(targets):
+            for v, d in _upward(*down, h_index[key]).items():
+                buckets.setdefault(v, []).append((j, d))
+        up = (hierarchy.up_offsets, hierarchy.up_targets, hierarchy.up_weights)
+        state = ('ch', (up, buckets), width)
+    else:
+        index = graph.index
+        src = [index[key] for key in sources]
+        csr = graph.csr()
+        target_pos = {}
+        for j, key in enumerate(targets):
+            target_pos.setdefault(index[key], []).append(j)
+        state = ('dijkstra', (csr.offsets, csr.targets, csr.weights, target_pos), width)
+
+    batches = [src[i:i + batch_size] for i in range(0, len(src), batch_size)]
+    if executor is None or len(batches) <= 1:
+        results = [_rows(state, batch) for batch in batches]
+    elif executor == 'thread':
+        with ThreadPoolExecutor(workers) as pool:
+            results = list(pool.map(partial(_rows, state), batches))
+    elif executor == 'process':
+        with ProcessPoolExecutor(workers or os.cpu_count() or 1,
+                                 initializer=_init_worker, initargs=(state,)) as pool:
+            results = list(pool.map(_run_rows, batches))
+    else:
+        raise ValueError(f"unknown executor {executor!r}")
+
+    matrix = np.empty((len(src), width), dtype=np.float64)
+    i = 0
+    for rows in results:
+        for row in rows:
+            matrix[i] = row
+            i += 1
+    return matrix
@@ -0,0 +1,78 @@
+import heapq
+
+
+def prim(graph, start):
+    """
+    Реализует алгоритм Прима для построения минимального остовного дерева.
+    Возвращает список ключей рёбер, входящих в MST, или None, если MST построить не удалось.
+    """
+    csr = graph.csr()
+    offsets, targets, weights, edge_ids = csr.offsets, csr.targets, csr.weights, csr.edge_ids
+    n = graph.num_vertices
+    s = graph.index[start]
+    visited = [False] * n
+    visited[s] = True
+    count = 1
+    mst_edges = []
+    pq = []
+    # Добавляем все рёбра, исходящие из стартовой вершины
+    for i in range(offsets[s], offsets[s + 1]):
+        if not visited[targets[i]]:
+            heapq.heappush(pq, (weights[i], edge_ids[i], targets[i]))
+    while pq and count < n:
+        w, e, v = heapq.heappop(pq)
+        if visited[v]:
+            continue
+        mst_edges.append(graph.edge_keys[e])
+        visited[v] = True
+        count += 1
+        # Добавляем новые рёбра, выходящие из только что добавленной вершины
+        for i in range(offsets[v], offsets[v + 1]):
+            if not visited[targets[i]]:
+                heapq.heappush(pq, (weights[i], edge_ids[i], targets[i]))
+    if count == n:
+        return mst_edges
+    else:
+        return None
+
+
+def kruskal(graph):
+    """
+    Реализует алгоритм Краскала для построения минимального остовного дерева.
+    Возвращает список ключей рёбер, входящих в MST, или None, если MST построить не удалось.
+    """
+    n = graph.num_vertices
+    edges_list = sorted(range(graph.num_edges), key=graph.weight.__getitem__)
+    parent = list(range(n))
+    rank = [0] * n
+
+    def find(u):
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        return u
+
+    def union(u, v):
+        ru = find(u)
+        rv = find(v)
+        if ru == rv:
+            return False
+        if rank[ru] < rank[rv]:
+            parent[ru] = rv
+        elif rank[ru] > rank[rv]:
+            parent[rv] = ru
+        else:
+            parent[rv] = ru
+            rank[ru] += 1
+        return True
+
+    mst_edges = []
+    components = n
+    for e in edges_list:
+        if union(graph.tail[e], graph.head[e]):
+            mst_edges.append(graph.edge_keys[e])
+            components -= 1
+    if components == 1:
+        return mst_edges
+    else:
+        return None
@@ -0,0 +1,139 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .traversal import bfs_levels
+
+
+def multi_source_bfs(csr, sources, with_distances=False):
+    """
+    Бит-параллельный BFS сразу из нескольких источников (MS-BFS).
+    Каждой вершине сопоставлена битовая маска источников: бит k установлен, если вершину
+    уже достиг BFS из sources[k], поэтому один просмотр дуги продвигает все обходы сразу.
+    Возвращает (ecc, rows): эксцентриситет каждого источника в пределах его компоненты связности
+    и, при with_distances=True, для каждого источника array расстояний в рёбрах (-1 – недостижима).
+    """
+    offsets, targets = csr.offsets, csr.targets
+    n = csr.num_vertices
+    seen = [0] * n
+    visit = [0] * n
+    ecc = array('q', [0]) * len(sources)
+    rows = [array('q', [-1]) * n for _ in sources] if with_distances else None
+
+    active = []
+    for k, s in enumerate(sources):
+        bit = 1 << k
+        if not visit[s]:
+            active.append(s)
+        seen[s] |= bit
+        visit[s] |= bit
+        if rows is not None:
+            rows[k][s] = 0
+
+    depth = 0
+    while active:
+        depth += 1
+        visit_next = {}
+        for v in active:
+            mask = visit[v]
+            visit[v] = 0
+            for u in targets[offsets[v]:offsets[v + 1]]:
+                visit_next[u] = visit_next.get(u, 0) | mask
+        active = []
+        reached = 0
+        for u, mask in visit_next.items():
+            new = mask & ~seen[u]
+            if not new:
+                continue
+            seen[u] |= new
+            visit[u] = new
+            active.append(u)
+            reached |= new
+            if rows is not None:
+                while new:
+                    low = new & -new
+                    rows[low.bit_length() - 1][u] = depth
+                    new ^= low
+        while reached:
+            low = reached & -reached
+            ecc[low.bit_length() - 1] = depth
+            reached ^= low
+
+    return ecc, rows
+
+
+_worker_csr = None
+
+
+def _init_worker(csr):
+    global _worker_csr
+    _worker_csr = csr
+
+
+def _run_batch(task):
+    sources, with_distances = task
+    return multi_source_bfs(_worker_csr, sources, with_distances)
+
+
+def eccentricities(csr, sources=None, batch_size=64, processes=None, with_distances=False):
+    """
+    Эксцентриситеты вершин sources (по умолчанию – всех вершин графа).
+    Источники упаковываются по batch_size в один бит-параллельный обход, а пачки распределяются
+    по пулу процессов (processes=None – по числу ядер, 1 – без пула).
+    Возвращает (ecc, rows), rows – матрица расстояний в рёбрах, если with_distances=True.
+    На платформах без fork вызывать следует из-под if __name__ == '__main__'.
+    """
+    if sources is None:
+        sources = range(csr.num_vertices)
+    sources = array('q', sources)
+    tasks = [(sources[i:i + batch_size], with_distances)
+             for i in range(0, len(sources), batch_size)]
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(tasks))
+
+    if processes <= 1:
+        results = [multi_source_bfs(csr, batch, flag) for batch, flag in tasks]
+    else:
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(csr,)) as pool:
+            results = list(pool.map(_run_batch, tasks))
+
+    ecc = array('q')
+    rows = [] if with_distances else None
+    for batch_ecc, batch_rows in results:
+        ecc.extend(batch_ecc)
+        if rows is not None:
+            rows.extend(batch_rows)
+    return ecc, rows
+
+
+def diameter(csr, exact=True, processes=None, sweeps=4):
+    """
+    Диаметр графа в рёбрах (наибольший эксцентриситет; для несвязного графа – по компонентам).
+    exact=True – точное значение по эксцентриситетам всех вершин.
+    exact=False – нижняя оценка повторными «двойными проходами»: BFS из самой удалённой вершины
+    предыдущего обхода; на практике обычно совпадает с точным значением и стоит sweeps обходов
+    в каждой компоненте (первый проход – из её вершины с наименьшим номером).
+    """
+    n = csr.num_vertices
+    if not n:
+        return 0
+    if exact:
+        return max(eccentricities(csr, processes=processes)[0])
+    best = 0
+    seen = bytearray(n)
+    for root in range(n):
+        if seen[root]:
+            continue
+        start = root
+        for sweep in range(sweeps):
+            order, level, _ = bfs_levels(csr, start)
+            if not sweep:
+                for u in order:
+                    seen[u] = 1
+            far = order[-1]
+            best = max(best, level[far])
+            if far == start:
+                break
+            start = far
+    return best
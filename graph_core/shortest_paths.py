@@ -0,0 +1,350 @@
+import heapq
+import math
+from array import array
+from collections import OrderedDict
+
+from . import apsp
+
+SSSP_CACHE_SIZE = 8   # сколько деревьев кратчайших путей хранится для одной версии графа
+DIAL_MAX_WEIGHT = 1 << 16   # при большем весе ребра массив корзин Дейкстры–Дайала слишком велик
+INTEGER_TYPECODES = 'bBhHiIlLqQ'
+
+
+def dial_width(weights):
+    """
+    Число корзин кольцевой очереди Дайала для весов weights: наибольший вес + 1.
+    0, если веса не целые, отрицательные или больше DIAL_MAX_WEIGHT (тогда используется heapq).
+    """
+    typecode = weights.typecode if isinstance(weights, array) else weights.format
+    if typecode not in INTEGER_TYPECODES:
+        return 0
+    if not len(weights):
+        return 1
+    if min(weights) < 0 or max(weights) > DIAL_MAX_WEIGHT:
+        return 0
+    return max(weights) + 1
+
+
+class ShortestPathTree:
+    """
+    Частично построенное дерево кратчайших путей Дейкстры из вершины source (по индексам CSR).
+    Поиск останавливается, как только нужная вершина окончательно обработана, но очередь
+    сохраняется, поэтому следующий запрос из того же источника продолжает с того же места.
+    При целых неотрицательных весах очередь – кольцевой массив корзин Дайала (width корзин,
+    см. dial_width; None – определить по весам, 0 – всегда heapq), иначе – куча heapq.
+    """
+
+    __slots__ = ('csr', 'source', 'dist', 'prev', 'settled', 'heap', 'buckets', 'cursor', 'pending')
+
+    def __init__(self, csr, source, width=None):
+        n = csr.num_vertices
+        self.csr = csr
+        self.source = source
+        self.dist = array('d', [math.inf]) * n
+        self.prev = array('q', [-1]) * n
+        self.settled = bytearray(n)
+        self.dist[source] = 0
+        if width is None:
+            width = dial_width(csr.weights)
+        if width:
+            self.heap = None
+            self.buckets = [[] for _ in range(width)]
+            self.buckets[0].append(source)
+            self.cursor = 0    # текущее расстояние; все ключи в очереди лежат в [cursor, cursor + width)
+            self.pending = 1   # число записей в корзинах
+        else:
+            self.heap = [(0, source)]
+            self.buckets = None
+
+    def settle(self, target=None):
+        """
+        Продолжает поиск, пока вершина target не будет обработана (None – до исчерпания очереди).
+        Возвращает расстояние до target (math.inf, если она недостижима).
+        """
+        settled = self.settled
+        if target is not None and settled[target]:
+            return self.dist[target]
+        if self.buckets is not None:
+            self._settle_buckets(target)
+            return self.dist[target] if target is not None else None
+        offsets, targets, weights = self.csr.offsets, self.csr.targets, self.csr.weights
+        dist, prev, heap = self.dist, self.prev, self.heap
+        heappop, heappush = heapq.heappop, heapq.heappush
+        while heap:
+            d, current = heappop(heap)
+            if settled[current]:
+                continue
+            settled[current] = 1
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                alt = d + weights[i]
+                if alt < dist[neighbor]:
+                    dist[neighbor] = alt
+                    prev[neighbor] = current
+                    heappush(heap, (alt, neighbor))
+            if current == target:
+                break
+        return dist[target] if target is not None else None
+
+    def _settle_buckets(self, target):
+        """Алгоритм Дайала: корзины просматриваются по кругу, в корзине cursor % width лежат вершины с ключом cursor."""
+        offsets, targets, weights = self.csr.offsets, self.csr.targets, self.csr.weights
+        dist, prev, settled, buckets = self.dist, self.prev, self.settled, self.buckets
+        width = len(buckets)
+        d, pending = self.cursor, self.pending
+        bucket = buckets[d % width]
+        while pending:
+            while not bucket:
+                d += 1
+                bucket = buckets[d % width]
+            current = bucket.pop()
+            pending -= 1
+            if settled[current]:
+                continue   # устаревшая запись: вершина уже обработана с меньшим ключом
+            settled[current] = 1
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                alt = d + weights[i]
+                if alt < dist[neighbor]:
+                    dist[neighbor] = alt
+                    prev[neighbor] = current
+                    buckets[alt % width].append(neighbor)
+                    pending += 1
+            if current == target:
+                break
+        self.cursor, self.pending = d, pending
+
+    def path(self, target):
+        """Путь от источника до target в виде списка индексов вершин или None, если пути нет."""
+        if self.settle(target) == math.inf:
+            return None
+        path = []
+        cur = target
+        while cur != -1:
+            path.append(cur)
+            cur = self.prev[cur]
+        path.reverse()
+        return path
+
+
+class SSSPCache:
+    """LRU-кэш деревьев кратчайших путей по источнику для одного CSR."""
+
+    def __init__(self, csr, capacity=SSSP_CACHE_SIZE):
+        self.csr = csr
+        self.capacity = capacity
+        self.trees = OrderedDict()
+        self.width = dial_width(csr.weights)
+
+    def tree(self, source):
+        tree = self.trees.get(source)
+        if tree is None:
+            if len(self.trees) >= self.capacity:
+                self.trees.popitem(last=False)
+            tree = self.trees[source] = ShortestPathTree(self.csr, source, self.width)
+        else:
+            self.trees.move_to_end(source)
+        return tree
+
+
+def sssp_tree(graph, start):
+    """
+    Дерево кратчайших путей из вершины с ключом start.
+    Деревья кэшируются в графе по источнику и версии графа: любое изменение графа сбрасывает кэш.
+    """
+    cache = graph.cached('sssp', lambda: SSSPCache(graph.csr()))
+    return cache.tree(graph.index[start])
+
+
+def dijkstra(graph, start, end):
+    """
+    Выполняет алгоритм Дейкстры для поиска кратчайшего пути.
+    Возвращает список ключей вершин в порядке прохождения или None, если путь не найден.
+    Повторные запросы из того же источника продолжают сохранённый поиск (см. sssp_tree).
+    """
+    path = sssp_tree(graph, start).path(graph.index[end])
+    if path is None:
+        return None  # путь не найден
+    keys = graph.keys
+    return [keys[u] for u in path]
+
+
+def _key_path(graph, prev, t):
+    path = []
+    cur = t
+    while cur != -1:
+        path.append(graph.keys[cur])
+        cur = prev[cur]
+    path.reverse()
+    return path
+
+
+def heuristic_scale(graph, coords):
+    """
+    Наибольший множитель c, при котором c * (евклидово расстояние) не превышает вес ни одного ребра.
+    С ним эвристика A* допустима и монотонна при любых неотрицательных весах.
+    coords – пары (x, y) по индексам вершин.
+    """
+    scale = math.inf
+    tail, head, weight = graph.tail, graph.head, graph.weight
+    for e in range(graph.num_edges):
+        (x1, y1), (x2, y2) = coords[tail[e]], coords[head[e]]
+        length = math.hypot(x2 - x1, y2 - y1)
+        if length > 0:
+            scale = min(scale, weight[e] / length)
+    return 0 if scale == math.inf else max(scale, 0)
+
+
+def astar(graph, start, end, coords, scale=None):
+    """
+    Поиск A* с эвристикой – масштабированным евклидовым расстоянием до end (см. heuristic_scale).
+    coords – пары (x, y) по индексам вершин (например, центры вершин на холсте).
+    scale – заранее посчитанный heuristic_scale(graph, coords); без него множитель считается
+    проходом по всем рёбрам при каждом вызове, поэтому серию запросов лучше вести с ним.
+    Возвращает (path, settled): список ключей вершин или None и число обработанных вершин.
+    """
+    csr = graph.csr()
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    n = graph.num_vertices
+    s, t = graph.index[start], graph.index[end]
+    if scale is None:
+        scale = heuristic_scale(graph, coords)
+    tx, ty = coords[t]
+    h = [-1.0] * n
+    dist = [math.inf] * n
+    prev = [-1] * n
+    done = bytearray(n)
+    settled = 0
+    dist[s] = 0
+    pq = [(0, s)]
+    while pq:
+        _, current = heapq.heappop(pq)
+        if done[current]:
+            continue
+        done[current] = 1
+        settled += 1
+        if current == t:
+            break
+        d = dist[current]
+        for i in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[i]
+            alt = d + weights[i]
+            if alt < dist[neighbor]:
+                dist[neighbor] = alt
+                prev[neighbor] = current
+                if h[neighbor] < 0:
+                    x, y = coords[neighbor]
+                    h[neighbor] = scale * math.hypot(x - tx, y - ty)
+                heapq.heappush(pq, (alt + h[neighbor], neighbor))
+    if dist[t] == math.inf:
+        return None, settled
+    return _key_path(graph, prev, t), settled
+
+
+def bidirectional_dijkstra(graph, start, end):
+    """
+    Двунаправленный алгоритм Дейкстры: поиски от start по дугам и от end по обратным дугам
+    ведутся по очереди (шаг делает тот, у кого меньше минимум кучи) и останавливаются,
+    когда сумма минимумов куч не меньше лучшего найденного пути через общую вершину.
+    Возвращает (path, settled): список ключей вершин или None и число обработанных вершин.
+    """
+    n = graph.num_vertices
+    s, t = graph.index[start], graph.index[end]
+    csrs = (graph.csr(), graph.reverse_csr())
+    dist = ([math.inf] * n, [math.inf] * n)
+    prev = ([-1] * n, [-1] * n)
+    done = (bytearray(n), bytearray(n))
+    heaps = ([(0, s)], [(0, t)])
+    dist[0][s] = dist[1][t] = 0
+    best, meet = (0, s) if s == t else (math.inf, -1)
+    settled = 0
+    while heaps[0] and heaps[1] and heaps[0][0][0] + heaps[1][0][0] < best:
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, current = heapq.heappop(heaps[side])
+        if done[side][current]:
+            continue
+        done[side][current] = 1
+        settled += 1
+        csr, my_dist, other_dist, my_prev = csrs[side], dist[side], dist[1 - side], prev[side]
+        offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+        for i in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[i]
+            alt = d + weights[i]
+            if alt < my_dist[neighbor]:
+                my_dist[neighbor] = alt
+                my_prev[neighbor] = current
+                heapq.heappush(heaps[side], (alt, neighbor))
+            if alt + other_dist[neighbor] < best:
+                best = alt + other_dist[neighbor]
+                meet = neighbor
+    if meet == -1:
+        return None, settled
+    path = _key_path(graph, prev[0], meet)
+    cur = prev[1][meet]
+    while cur != -1:
+        path.append(graph.keys[cur])
+        cur = prev[1][cur]
+    return path, settled
+
+
+def _floyd_lists(graph):
+    """Алгоритм Флойда–Уоршелла на списках Python (если NumPy не установлен)."""
+    n = graph.num_vertices
+    # Инициализируем матрицу расстояний и матрицу next для восстановления пути
+    dist = [[math.inf] * n for _ in range(n)]
+    nxt = [[-1] * n for _ in range(n)]
+    for u in range(n):
+        dist[u][u] = 0
+        nxt[u][u] = u
+    # Для каждого ребра задаём расстояние и следующий узел
+    for e in range(graph.num_edges):
+        u, v, weight = graph.tail[e], graph.head[e], graph.weight[e]
+        # Если несколько ребер между парой вершин, оставляем минимальное
+        if weight < dist[u][v]:
+            dist[u][v] = weight
+            nxt[u][v] = v
+            if not graph.directed:
+                dist[v][u] = weight
+                nxt[v][u] = u
+
+    # Алгоритм Флойда-Уоршелла
+    for k in range(n):
+        dist_k = dist[k]
+        for i in range(n):
+            dist_i = dist[i]
+            d_ik = dist_i[k]
+            if d_ik == math.inf:
+                continue
+            nxt_i = nxt[i]
+            for j in range(n):
+                if dist_i[j] > d_ik + dist_k[j]:
+                    dist_i[j] = d_ik + dist_k[j]
+                    nxt_i[j] = nxt_i[k]
+    return dist, nxt
+
+
+def floyd_matrices(graph):
+    """
+    Матрицы (dist, nxt) алгоритма Флойда для всех пар вершин: на NumPy, если он установлен
+    (для больших графов – блочным алгоритмом на всех ядрах), иначе на списках.
+    Результат кэшируется в графе до его изменения.
+    """
+    if apsp.np is not None:
+        if graph.num_vertices >= 4 * apsp.BLOCK_SIZE:
+            return graph.cached('floyd', lambda: apsp.blocked_floyd_warshall(graph))
+        return graph.cached('floyd', lambda: apsp.floyd_warshall(graph))
+    return graph.cached('floyd', lambda: _floyd_lists(graph))
+
+
+def floyd(graph, start, end):
+    """
+    Выполняет алгоритм Флойда для поиска кратчайшего пути между всеми парами.
+    Затем восстанавливает путь от start до end.
+    Возвращает список ключей вершин в порядке прохождения или None, если путь не найден.
+    """
+    dist, nxt = floyd_matrices(graph)
+    path = apsp.successor_path(nxt, graph.index[start], graph.index[end])
+    if path is None:
+        return None  # путь не найден
+    keys = graph.keys
+    return [keys[u] for u in path]
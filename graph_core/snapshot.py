@@ -0,0 +1,223 @@
+"""
+Двоичный снимок графа: CSR, массивы рёбер, ключи и (необязательно) координаты вершин.
+
+Файл состоит из заголовка, таблицы блоков и самих блоков. Все числа записаны
+в порядке little-endian, каждый блок выровнен на 8 байт, поэтому при загрузке массивы
+не копируются: это memoryview прямо поверх mmap файла. Несколько процессов, открывших
+один снимок, разделяют одни и те же страницы кэша ОС.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from .csr import CSR
+from .graph import Graph, RangeIndex
+
+MAGIC = b'GCSNAP\x00\x00'
+FORMAT_VERSION = 1
+SNAPSHOT_EXT = '.gcs'
+
+# magic, версия формата, тип весов, флаги, число вершин, число рёбер, первый ключ вершины
+_HEADER = struct.Struct('<8sHcBqqq')
+_BLOCK = struct.Struct('<qq')   # смещение и длина блока в байтах
+
+# Порядок блоков в таблице; отсутствующий блок имеет длину 0
+_BLOCKS = ('offsets', 'targets', 'weights', 'edge_ids',
+           'tail', 'head', 'weight', 'keys', 'edge_keys', 'coords')
+
+DIRECTED = 1
+RANGE_KEYS = 2        # ключи вершин – first, first + 1, ...; блок keys пуст
+RANGE_EDGE_KEYS = 4   # ключи рёбер совпадают с их индексами; блок edge_keys пуст
+HAS_COORDS = 8
+
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def _as_bytes(values, typecode):
+    """Байтовое представление массива в little-endian."""
+    if isinstance(values, memoryview) and _LITTLE_ENDIAN:
+        return values
+    values = values if isinstance(values, array) else array(typecode, values)
+    if not _LITTLE_ENDIAN:
+        values = array(typecode, values)
+        values.byteswap()
+    return values
+
+
+def _typecode(values):
+    return values.typecode if isinstance(values, array) else values.format
+
+
+def save_snapshot(graph, path, coords=None):
+    """
+    Сохраняет граф вместе с его CSR в файл снимка.
+    coords – необязательная последовательность пар (x, y) по индексам вершин.
+    Ключи вершин и рёбер должны быть целыми числами (например, id элементов холста).
+    """
+    csr = graph.csr()
+    n, m = graph.num_vertices, graph.num_edges
+    typecode = _typecode(graph.weight)
+    flags = DIRECTED if graph.directed else 0
+    first = 0
+
+    blocks = {
+        'offsets': _as_bytes(csr.offsets, 'q'),
+        'targets': _as_bytes(csr.targets, 'q'),
+        'weights': _as_bytes(csr.weights, typecode),
+        'edge_ids': _as_bytes(csr.edge_ids, 'q'),
+        'tail': _as_bytes(graph.tail, 'q'),
+        'head': _as_bytes(graph.head, 'q'),
+        'weight': _as_bytes(graph.weight, typecode),
+    }
+    if isinstance(graph.keys, range) and graph.keys.step == 1:
+        flags |= RANGE_KEYS
+        first = graph.keys.start
+    else:
+        blocks['keys'] = _as_bytes(graph.keys, 'q')
+    if isinstance(graph.edge_keys, range) and graph.edge_keys.start == 0:
+        flags |= RANGE_EDGE_KEYS
+    else:
+        blocks['edge_keys'] = _as_bytes(graph.edge_keys, 'q')
+    if coords is not None:
+        flags |= HAS_COORDS
+        blocks['coords'] = _as_bytes([c for xy in coords for c in xy], 'd')
+
+    write_blocks(path, _HEADER.pack(MAGIC, FORMAT_VERSION, typecode.encode(), flags, n, m, first),
+                 [blocks.get(name) for name in _BLOCKS])
+
+
+def write_blocks(path, header, blocks):
+    """
+    Записывает файл из заголовка header (bytes), таблицы блоков (смещение и длина каждого)
+    и самих блоков, выровненных на 8 байт. None в blocks – пустой блок.
+    """
+    table = []
+    pos = len(header) + _BLOCK.size * len(blocks)
+    for block in blocks:
+        pos += -pos % 8
+        size = memoryview(block).nbytes if block is not None else 0
+        table.append((pos, size))
+        pos += size
+
+    with open(path, 'wb') as f:
+        f.write(header)
+        for entry in table:
+            f.write(_BLOCK.pack(*entry))
+        for block, (offset, size) in zip(blocks, table):
+            if size:
+                f.write(bytes(offset - f.tell()))
+                f.write(block)
+
+
+def map_blocks(path, header, typecodes):
+    """
+    Отображает файл, записанный write_blocks, в память.
+    header – struct.Struct заголовка, typecodes – тип элементов каждого блока.
+    Возвращает (поля заголовка, список memoryview по блокам).
+    """
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mm)
+    fields = header.unpack_from(view)
+    blocks = []
+    for i, item in enumerate(typecodes):
+        offset, size = _BLOCK.unpack_from(view, header.size + i * _BLOCK.size)
+        block = view[offset:offset + size].cast(item)
+        if not _LITTLE_ENDIAN:
+            block = array(item, block)
+            block.byteswap()
+        blocks.append(block)
+    return fields, blocks
+
+
+class _KeyIndex:
+    """Отображение ключ -> индекс вершины; словарь строится лишь при первом обращении."""
+
+    __slots__ = ('keys', '_index')
+
+    def __init__(self, keys):
+        self.keys = keys
+        self._index = None
+
+    def _dict(self):
+        if self._index is None:
+            self._index = {k: i for i, k in enumerate(self.keys)}
+        return self._index
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self._dict()
+
+    def get(self, key, default=None):
+        return self._dict().get(key, default)
+
+    def __getitem__(self, key):
+        return self._dict()[key]
+
+
+class MappedCSR(CSR):
+    """
+    CSR, массивы которого отображены из файла снимка.
+    При передаче в другой процесс (пул процессов) пересылается только путь к файлу,
+    а процесс-получатель отображает тот же файл заново.
+    """
+
+    __slots__ = ('path',)
+
+    def __reduce__(self):
+        return load_csr, (self.path,)
+
+
+def _open(path):
+    with open(path, 'rb') as f:
+        magic, version, typecode = _HEADER.unpack(f.read(_HEADER.size).ljust(_HEADER.size, b'\0'))[:3]
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a graph snapshot")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported snapshot version {version}")
+    typecode = typecode.decode()
+    fields, views = map_blocks(path, _HEADER, [
+        typecode if name in ('weights', 'weight') else 'd' if name == 'coords' else 'q'
+        for name in _BLOCKS])
+    flags, n, m, first = fields[3:]
+    return typecode, flags, n, m, first, dict(zip(_BLOCKS, views))
+
+
+def _csr(path, flags, blocks):
+    csr = MappedCSR(blocks['offsets'], blocks['targets'], blocks['weights'], blocks['edge_ids'],
+                    bool(flags & DIRECTED))
+    csr.path = os.path.abspath(path)
+    return csr
+
+
+def load_csr(path):
+    """Отображает из снимка только CSR (например, в процессах-обработчиках)."""
+    typecode, flags, n, m, first, blocks = _open(path)
+    return _csr(path, flags, blocks)
+
+
+def load_snapshot(path):
+    """
+    Открывает снимок через mmap без копирования данных.
+    Возвращает (graph, coords); coords – плоский массив x0, y0, x1, y1, ... или None.
+    CSR графа уже лежит в его кэше. Массивы рёбер доступны только для чтения
+    и копируются в память при первом изменении графа.
+    """
+    typecode, flags, n, m, first, blocks = _open(path)
+    graph = Graph(bool(flags & DIRECTED), typecode)
+    graph.tail, graph.head, graph.weight = blocks['tail'], blocks['head'], blocks['weight']
+    if flags & RANGE_KEYS:
+        graph.keys = range(first, first + n)
+        graph.index = RangeIndex(first, n)
+    else:
+        graph.keys = blocks['keys']
+        graph.index = _KeyIndex(graph.keys)
+    graph.edge_keys = range(m) if flags & RANGE_EDGE_KEYS else blocks['edge_keys']
+    graph.version = 1
+    graph.cached('csr', lambda: _csr(path, flags, blocks))
+    coords = blocks['coords'] if flags & HAS_COORDS else None
+    return graph, coords
@@ -0,0 +1,70 @@
+import math
+
+
+class SpatialIndex:
+    """
+    Равномерная сетка по центрам вершин: поиск вершины по точке просматривает
+    лишь несколько соседних ячеек, а не все вершины.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}    # (столбец, строка) -> {ключ: (x, y)}
+        self.points = {}   # ключ -> (x, y)
+
+    def _cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def __len__(self):
+        return len(self.points)
+
+    def __contains__(self, key):
+        return key in self.points
+
+    def insert(self, key, x, y):
+        self.points[key] = (x, y)
+        self.cells.setdefault(self._cell(x, y), {})[key] = (x, y)
+
+    def remove(self, key):
+        x, y = self.points.pop(key)
+        cell = self._cell(x, y)
+        bucket = self.cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self.cells[cell]
+
+    def move(self, key, x, y):
+        self.remove(key)
+        self.insert(key, x, y)
+
+    def clear(self):
+        self.cells.clear()
+        self.points.clear()
+
+    def find(self, x, y, radius):
+        """Возвращает ключ ближайшей точки не дальше radius от (x, y) или None."""
+        c0, r0 = self._cell(x - radius, y - radius)
+        c1, r1 = self._cell(x + radius, y + radius)
+        best = None
+        best_dist = radius * radius
+        for c in range(c0, c1 + 1):
+            for r in range(r0, r1 + 1):
+                bucket = self.cells.get((c, r))
+                if not bucket:
+                    continue
+                for key, (px, py) in bucket.items():
+                    dist = (px - x) ** 2 + (py - y) ** 2
+                    if dist <= best_dist:
+                        best, best_dist = key, dist
+        return best
+
+
+def grid_layout(n, width, height, margin):
+    """Раскладывает n вершин равномерной сеткой в прямоугольнике width x height с отступом margin."""
+    if not n:
+        return []
+    cols = max(1, math.ceil(math.sqrt(n * width / height)))
+    rows = math.ceil(n / cols)
+    dx = (width - 2 * margin) / max(cols - 1, 1)
+    dy = (height - 2 * margin) / max(rows - 1, 1)
+    return [(margin + (i % cols) * dx, margin + (i // cols) * dy) for i in range(n)]
@@ -0,0 +1,243 @@
+from array import array
+from collections import namedtuple
+
+
+def bfs_frontiers(csr, source, level=None, parent=None):
+    """
+    Синхронный по уровням BFS по CSR: генератор, выдающий фронты (array индексов вершин)
+    по одному на уровень, поэтому вызывающий код может остановиться в любой момент.
+    Если переданы массивы level и parent (длины n, заполненные -1), они дозаполняются по ходу обхода.
+    """
+    offsets, targets = csr.offsets, csr.targets
+    if level is None:
+        level = array('q', [-1]) * csr.num_vertices
+    level[source] = 0
+    frontier = array('q', [source])
+    depth = 0
+    while frontier:
+        yield frontier
+        depth += 1
+        next_frontier = array('q')
+        append = next_frontier.append
+        for u in frontier:
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                if level[v] < 0:
+                    level[v] = depth
+                    if parent is not None:
+                        parent[v] = u
+                    append(v)
+        frontier = next_frontier
+
+
+def bfs_levels(csr, source):
+    """
+    Полный BFS из вершины source (индекс) за один проход.
+    Возвращает (order, level, parent): порядок обхода и для каждой вершины уровень и родителя
+    в дереве обхода (-1 для недостижимых вершин и родителя корня).
+    """
+    n = csr.num_vertices
+    level = array('q', [-1]) * n
+    parent = array('q', [-1]) * n
+    order = array('q')
+    for frontier in bfs_frontiers(csr, source, level, parent):
+        order.extend(frontier)
+    return order, level, parent
+
+
+TOP_DOWN = 'top-down'
+BOTTOM_UP = 'bottom-up'
+
+
+def bfs_direction_optimizing(csr, source, in_csr=None, alpha=14, beta=24, mode='auto'):
+    """
+    BFS с переключением направления (Beamer et al.) для графов малого диаметра.
+    Шаг «сверху вниз» просматривает дуги фронта; шаг «снизу вверх» перебирает непосещённые
+    вершины и ищет среди их входящих соседей (in_csr, по умолчанию csr для неориентированного графа)
+    вершину фронта, которая хранится в битовом множестве, и прекращает просмотр при первом совпадении.
+    В режиме mode='auto' переход вниз-вверх происходит, когда число дуг фронта превышает
+    (число дуг непосещённых вершин) / alpha, обратный переход – когда фронт меньше n / beta.
+    mode='top-down' или 'bottom-up' фиксирует направление (для сравнения).
+    Возвращает (level, parent, stats), где stats – список (уровень, направление, размер фронта,
+    число просмотренных дуг) по каждому шагу.
+    """
+    if in_csr is None:
+        in_csr = csr
+    offsets, targets = csr.offsets, csr.targets
+    in_offsets, in_targets = in_csr.offsets, in_csr.targets
+    n = csr.num_vertices
+    level = array('q', [-1]) * n
+    parent = array('q', [-1]) * n
+    level[source] = 0
+    frontier = array('q', [source])
+    unexplored_edges = len(targets) - (offsets[source + 1] - offsets[source])
+    unvisited = None
+    bottom_up = mode == BOTTOM_UP
+    stats = []
+    depth = 0
+
+    while frontier:
+        depth += 1
+        frontier_edges = 0
+        for u in frontier:
+            frontier_edges += offsets[u + 1] - offsets[u]
+        if mode == 'auto':
+            if not bottom_up and frontier_edges > unexplored_edges / alpha:
+                bottom_up = True
+            elif bottom_up and len(frontier) < n / beta:
+                bottom_up = False
+
+        examined = 0
+        next_frontier = array('q')
+        append = next_frontier.append
+        if bottom_up:
+            bits = bytearray((n + 7) >> 3)
+            for u in frontier:
+                bits[u >> 3] |= 1 << (u & 7)
+            if unvisited is None:
+                unvisited = array('q', (v for v in range(n) if level[v] < 0))
+            still_unvisited = array('q')
+            for v in unvisited:
+                if level[v] >= 0:
+                    continue
+                for i in range(in_offsets[v], in_offsets[v + 1]):
+                    examined += 1
+                    u = in_targets[i]
+                    if bits[u >> 3] >> (u & 7) & 1:
+                        level[v] = depth
+                        parent[v] = u
+                        append(v)
+                        break
+                else:
+                    still_unvisited.append(v)
+            unvisited = still_unvisited
+        else:
+            examined = frontier_edges
+            for u in frontier:
+                for v in targets[offsets[u]:offsets[u + 1]]:
+                    if level[v] < 0:
+                        level[v] = depth
+                        parent[v] = u
+                        append(v)
+
+        stats.append((depth - 1, BOTTOM_UP if bottom_up else TOP_DOWN, len(frontier), examined))
+        for v in next_frontier:
+            unexplored_edges -= offsets[v + 1] - offsets[v]
+        frontier = next_frontier
+
+    return level, parent, stats
+
+
+def bfs(graph, start):
+    """Обход графа в ширину (BFS). Возвращает список ключей вершин в порядке обхода."""
+    order, _, _ = bfs_levels(graph.csr(), graph.index[start])
+    keys = graph.keys
+    return [keys[u] for u in order]
+
+
+# Типы рёбер, которые размечает dfs_order
+TREE_EDGE = 1
+BACK_EDGE = 2
+FORWARD_EDGE = 3
+CROSS_EDGE = 4
+
+DFSResult = namedtuple('DFSResult', 'preorder postorder discovery finish edge_kind')
+
+
+def dfs_order(csr, source=None):
+    """
+    Итеративный DFS по CSR с явным стеком, без рекурсии.
+    Если source не задан, обходит лес из всех вершин по порядку.
+    За один проход возвращает DFSResult: прямой и обратный порядок, времена входа и выхода
+    (-1 для непосещённых вершин) и тип каждого ребра в edge_kind (TREE_EDGE, BACK_EDGE,
+    FORWARD_EDGE, CROSS_EDGE; 0 – ребро не просматривалось).
+    В неориентированном графе встречаются только рёбра дерева и обратные рёбра.
+    """
+    offsets, targets, edge_ids = csr.offsets, csr.targets, csr.edge_ids
+    directed = csr.directed
+    n = csr.num_vertices
+    discovery = array('q', [-1]) * n
+    finish = array('q', [-1]) * n
+    parent_edge = array('q', [-1]) * n
+    edge_kind = bytearray(max(edge_ids, default=-1) + 1)
+    ptr = array('q', offsets[:-1])   # копия: у CSR из снимка offsets только для чтения
+    preorder = array('q')
+    postorder = array('q')
+    stack = array('q')
+    time = 0
+
+    for root in (range(n) if source is None else (source,)):
+        if discovery[root] >= 0:
+            continue
+        discovery[root] = time
+        time += 1
+        preorder.append(root)
+        stack.append(root)
+        while stack:
+            u = stack[-1]
+            i = ptr[u]
+            if i < offsets[u + 1]:
+                ptr[u] = i + 1
+                v, e = targets[i], edge_ids[i]
+                if discovery[v] < 0:
+                    edge_kind[e] = TREE_EDGE
+                    parent_edge[v] = e
+                    discovery[v] = time
+                    time += 1
+                    preorder.append(v)
+                    stack.append(v)
+                elif directed:
+                    if finish[v] < 0:
+                        edge_kind[e] = BACK_EDGE
+                    elif discovery[v] > discovery[u]:
+                        edge_kind[e] = FORWARD_EDGE
+                    else:
+                        edge_kind[e] = CROSS_EDGE
+                elif not edge_kind[e] and e != parent_edge[u]:
+                    # Неориентированное ребро впервые видно со стороны потомка – это обратное ребро
+                    edge_kind[e] = BACK_EDGE
+            else:
+                stack.pop()
+                finish[u] = time
+                time += 1
+                postorder.append(u)
+
+    return DFSResult(preorder, postorder, discovery, finish, edge_kind)
+
+
+def dfs(graph, start):
+    """Обход графа в глубину (DFS). Возвращает список ключей вершин в порядке обхода."""
+    result = dfs_order(graph.csr(), graph.index[start])
+    keys = graph.keys
+    return [keys[u] for u in result.preorder]
+
+
+def topological_sort(graph):
+    """
+    Топологическая сортировка ориентированного графа.
+    Возвращает список ключей вершин или None, если в графе есть цикл.
+    """
+    result = dfs_order(graph.csr())
+    if BACK_EDGE in result.edge_kind:
+        return None
+    keys = graph.keys
+    return [keys[u] for u in reversed(result.postorder)]
+
+
+def is_connected(graph):
+    """Проверяет связность (неориентированного) графа."""
+    if not graph.num_vertices:
+        return False
+    csr = graph.csr()
+    offsets, targets = csr.offsets, csr.targets
+    visited = bytearray(graph.num_vertices)
+    count = 0
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        if not visited[node]:
+            visited[node] = 1
+            count += 1
+            for i in range(offsets[node], offsets[node + 1]):
+                if not visited[targets[i]]:
+                    stack.append(targets[i])
+    return count == graph.num_vertices
@@ -0,0 +1,31 @@
+import math
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph_core import Graph, apsp  # noqa: E402
+
+
+@unittest.skipIf(apsp.np is None, "NumPy is not installed")
+class IncrementalAPSPNegativeWeightTest(unittest.TestCase):
+    def test_undirected_negative_weight_is_rejected(self):
+        graph = Graph.from_edges([1, 2, 3], [(0, 1, 2, 5.0), (1, 2, 3, 1.0)])
+        paths = apsp.IncrementalAPSP(graph)
+        before = paths.dist.copy()
+        # Старое расстояние 2 -> 1 равно 5, но само ребро 1–2 веса -1 – цикл веса -2
+        with self.assertRaises(ValueError):
+            paths.set_weight(1, 2, -1.0)
+        self.assertTrue((paths.dist == before).all())
+        self.assertEqual(paths.weights[0, 1], 5.0)
+
+    def test_directed_negative_weight_without_cycle_is_applied(self):
+        graph = Graph.from_edges([1, 2, 3], [(0, 1, 2, 5.0), (1, 2, 3, 1.0)], directed=True)
+        paths = apsp.IncrementalAPSP(graph)
+        paths.set_weight(1, 2, -1.0)
+        self.assertEqual(paths.dist[0, 2], 0.0)
+        self.assertEqual(paths.dist[1, 0], math.inf)
+
+
+if __name__ == '__main__':
+    unittest.main()